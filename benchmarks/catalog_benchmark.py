@@ -0,0 +1,125 @@
+"""Compare loading the problem catalog from JSON and from the mmap binary format.
+
+Builds a synthetic catalog the size of the real one, writes it in both
+formats and reports the median time of each operation the app performs:
+opening the snapshot, reading the first problem, filtering by rating and
+iterating every problem.
+
+    python benchmarks/catalog_benchmark.py --problems 10000 --runs 20
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.catalog_file import MappedCatalog, problem_url, write_catalog
+
+TAGS = ['implementation', 'math', 'greedy', 'dp', 'data structures', 'brute force',
+        'constructive algorithms', 'graphs', 'sortings', 'binary search', 'dfs and similar',
+        'trees', 'strings', 'number theory', 'combinatorics', 'two pointers', 'bitmasks']
+
+
+def make_problems(count, seed=0):
+    rng = random.Random(seed)
+    problems = []
+    for i in range(count):
+        contest_id, index = 2000 - i // 6, 'ABCDEF'[i % 6]
+        problems.append({
+            'name': ' '.join(rng.choice(TAGS).title() for _ in range(3)),
+            'rating': rng.randrange(800, 3600, 100),
+            'contestId': contest_id,
+            'index': index,
+            'tags': rng.sample(TAGS, rng.randint(0, 4)),
+            'url': problem_url(contest_id, index),
+        })
+    return problems
+
+
+def load_json(path):
+    with open(path, 'r') as file:
+        return json.load(file)['problems']
+
+
+def time_ms(fn):
+    begin = time.perf_counter()
+    fn()
+    return (time.perf_counter() - begin) * 1000
+
+
+def json_rating_filter(catalog):
+    return [p for p in catalog if 1200 <= p['rating'] <= 1600]
+
+
+def mmap_rating_filter(catalog):
+    # The way DataFetcher filters a mapped catalog: rating column first
+    return list(catalog.rows(catalog.indices_in_rating_range(1200, 1600)))
+
+
+def measure(open_catalog, close_catalog, rating_filter):
+    results = {}
+    catalog = None
+
+    def do_open():
+        nonlocal catalog
+        catalog = open_catalog()
+
+    results['open'] = time_ms(do_open)
+    results['first_problem'] = time_ms(lambda: catalog[0])
+    results['rating_filter'] = time_ms(lambda: rating_filter(catalog))
+    results['iterate_all'] = time_ms(lambda: sum(1 for _ in catalog))
+    close_catalog(catalog)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--problems', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    problems = make_problems(args.problems)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'catalog.json')
+        binary_path = os.path.join(directory, 'catalog.bin')
+        with open(json_path, 'w') as file:
+            json.dump({'fetched_at': 0, 'problems': problems}, file)
+        write_catalog(binary_path, problems)
+
+        formats = {
+            'json': (lambda: load_json(json_path), lambda catalog: None, json_rating_filter),
+            # Opened as the snapshot opens a generation it already verified
+            'mmap': (lambda: MappedCatalog(binary_path, verify=False), lambda catalog: catalog.close(),
+                     mmap_rating_filter),
+        }
+        runs = {name: [] for name in formats}
+        for _ in range(args.runs):
+            for name, steps in formats.items():
+                runs[name].append(measure(*steps))
+
+        summary = {
+            name: {metric: statistics.median(run[metric] for run in results) for metric in results[0]}
+            for name, results in runs.items()
+        }
+        sizes = {'json': os.path.getsize(json_path), 'mmap': os.path.getsize(binary_path)}
+
+    if args.json:
+        print(json.dumps({'problems': args.problems, 'sizes': sizes, 'median_ms': summary}, indent=2))
+        return
+
+    print(f"{args.problems} problems, median of {args.runs} runs")
+    print(f"{'metric':<16}{'json ms':>12}{'mmap ms':>12}")
+    for metric in summary['json']:
+        print(f"{metric:<16}{summary['json'][metric]:>12.3f}{summary['mmap'][metric]:>12.3f}")
+    print(f"{'file size KiB':<16}{sizes['json'] / 1024:>12.0f}{sizes['mmap'] / 1024:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
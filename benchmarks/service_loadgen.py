@@ -0,0 +1,210 @@
+"""Load generator for the HTTP service (python cli.py serve).
+
+Starts a stand-in Codeforces API that serves a synthetic catalog and
+submissions with a configurable delay, runs the service against it with a
+throwaway snapshot directory, then drives it with concurrent keep-alive
+clients. Reports throughput, client-side latency percentiles and the
+service's own /metrics.
+
+    python benchmarks/service_loadgen.py --clients 50 --duration 10 --handles 200
+
+Everything runs in one process (API, service and clients on separate event
+loops and threads), so absolute numbers are pessimistic; use it to compare
+changes. Pass --url to load an already running service instead.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.codeforces_api import CodeforcesClient
+from src.service import FinderService, read_request, start_server, write_response
+from src.snapshot import Snapshot
+from catalog_benchmark import make_problems
+
+
+class StandInApi:
+    """Serves problemset.problems and user.status like the Codeforces API"""
+    def __init__(self, problems, delay):
+        self.problems = problems
+        self.delay = delay
+        self.requests = 0
+
+    def submissions(self, handle):
+        rng = random.Random(handle)
+        return [{
+            'verdict': rng.choice(['OK', 'OK', 'WRONG_ANSWER', 'TIME_LIMIT_EXCEEDED']),
+            'problem': problem,
+        } for problem in rng.sample(self.problems, 60)]
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                _, target, _ = request
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                url = urlsplit(target)
+                if url.path.endswith('/problemset.problems'):
+                    body = {'status': 'OK', 'result': {'problems': self.problems}}
+                elif url.path.endswith('/user.status'):
+                    handle = parse_qs(url.query)['handle'][0]
+                    body = {'status': 'OK', 'result': self.submissions(handle)}
+                elif url.path.endswith('/contest.list'):
+                    body = {'status': 'OK', 'result': []}
+                else:
+                    await write_response(writer, 404, {'status': 'FAILED'})
+                    continue
+                await write_response(writer, 200, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_in_thread(make_server):
+    """Start an asyncio server on its own loop in a daemon thread; returns its port"""
+    ready = threading.Event()
+    port = []
+
+    def run():
+        async def main():
+            server = await make_server()
+            port.append(server.sockets[0].getsockname()[1])
+            ready.set()
+            async with server:
+                await server.serve_forever()
+        asyncio.run(main())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+async def get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return int(status_line.split()[1]), body
+
+
+def request_path(rng, handles):
+    handle = rng.choice(handles)
+    kind = rng.random()
+    if kind < 0.6:
+        low = rng.randrange(800, 2400, 100)
+        return '/pick', f"/pick?handle={handle}&min_rating={low}&max_rating={low + 400}&count=3"
+    if kind < 0.9:
+        return '/recommend', f"/recommend?handle={handle}&type={rng.choice(['practice', 'warmup'])}"
+    return '/stats', f"/stats?handle={handle}"
+
+
+async def client(host, port, handles, deadline, seed, latencies, statuses):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            endpoint, path = request_path(rng, handles)
+            begin = time.perf_counter()
+            status, _ = await get(reader, writer, path)
+            latencies.setdefault(endpoint, []).append(time.perf_counter() - begin)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def generate_load(host, port, clients, duration, handles):
+    latencies, statuses = {}, {}
+    deadline = time.perf_counter() + duration
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(host, port, handles, deadline, seed, latencies, statuses)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - begin
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await get(reader, writer, '/metrics')
+    writer.close()
+    return latencies, statuses, elapsed, json.loads(metrics)
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=50, help='concurrent keep-alive connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load')
+    parser.add_argument('--handles', type=int, default=200, help='distinct handles in the request mix')
+    parser.add_argument('--problems', type=int, default=10000, help='size of the stand-in catalog')
+    parser.add_argument('--api-delay', type=float, default=0.2, help='stand-in API response delay in seconds')
+    parser.add_argument('--url', help='load this running service instead of starting one')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    handles = [f'user{i}' for i in range(args.handles)]
+    with tempfile.TemporaryDirectory() as directory:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port
+        else:
+            api = StandInApi(make_problems(args.problems), args.api_delay)
+            api_port = run_in_thread(lambda: asyncio.start_server(api.handle_connection, '127.0.0.1', 0))
+            service_client = CodeforcesClient(api_url=f'http://127.0.0.1:{api_port}', snapshot=Snapshot(directory))
+            host = '127.0.0.1'
+            port = run_in_thread(lambda: start_server(FinderService(service_client), host, 0))
+
+        latencies, statuses, elapsed, metrics = asyncio.run(
+            generate_load(host, port, args.clients, args.duration, handles))
+
+    total = sum(len(samples) for samples in latencies.values())
+    summary = {
+        'requests': total,
+        'requests_per_second': total / elapsed,
+        'statuses': statuses,
+        'client_latency_ms': {
+            endpoint: {
+                'p50': percentile(sorted(samples), 50),
+                'p90': percentile(sorted(samples), 90),
+                'p99': percentile(sorted(samples), 99),
+                'mean': statistics.mean(samples) * 1000,
+            } for endpoint, samples in latencies.items()
+        },
+        'service_metrics': metrics,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{total} requests in {elapsed:.1f} s from {args.clients} clients: "
+          f"{summary['requests_per_second']:.0f} req/s, statuses {statuses}")
+    print(f"{'endpoint':<12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for endpoint, values in sorted(summary['client_latency_ms'].items()):
+        print(f"{endpoint:<12}{values['p50']:>10.1f}{values['p90']:>10.1f}{values['p99']:>10.1f}")
+    upstream = metrics['upstream']
+    print(f"upstream calls {upstream['calls']}, coalesced {upstream['coalesced']}")
+
+
+if __name__ == '__main__':
+    main()
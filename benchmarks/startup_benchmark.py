@@ -0,0 +1,106 @@
+"""Cold-start benchmark for the desktop app.
+
+Launches the app headless (offscreen Qt platform) repeatedly with startup
+profiling enabled and the app set to quit after its first paint. Reports
+median and p90 of each startup metric and compares the medians against the
+budgets in startup_budgets.json. Exits non-zero when a budget is exceeded.
+
+    python benchmarks/startup_benchmark.py --runs 20
+    python benchmarks/startup_benchmark.py --executable dist/CodeforcesApp
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(__file__), 'startup_budgets.json')
+
+
+def run_once(command, report_path, timeout):
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['CF_FINDER_PROFILE_STARTUP'] = report_path
+    env['CF_FINDER_EXIT_AFTER_PAINT'] = '1'
+
+    begin = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, env=env, timeout=timeout,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    wall_ms = (time.perf_counter() - begin) * 1000
+
+    with open(report_path) as file:
+        report = json.load(file)
+    metrics = {'process_wall_ms': wall_ms, 'total_import_ms': report['total_import_ms']}
+    for name, value in report['marks_ms'].items():
+        metrics[f'{name}_ms'] = value
+    for name, value in report['phases_ms'].items():
+        metrics[f'phase_{name}_ms'] = value
+    return metrics
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    summary = {}
+    for name in samples[0]:
+        values = [sample[name] for sample in samples if name in sample]
+        summary[name] = {'median': statistics.median(values), 'p90': percentile(values, 0.9)}
+    return summary
+
+
+def compare(summary, budgets):
+    failures = []
+    print(f"{'metric':32} {'median':>10} {'p90':>10} {'budget':>10}")
+    for name, stats in summary.items():
+        budget = budgets.get(name)
+        over = budget is not None and stats['median'] > budget
+        if over:
+            failures.append(name)
+        budget_text = f"{budget:10.1f}" if budget is not None else f"{'-':>10}"
+        print(f"{name:32} {stats['median']:10.1f} {stats['p90']:10.1f} {budget_text}{'  OVER' if over else ''}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=1, help='runs discarded to warm the OS file cache')
+    parser.add_argument('--executable', help='frozen build to launch instead of main.py')
+    parser.add_argument('--budgets', default=DEFAULT_BUDGETS)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--json', help='also write the summary to this file')
+    args = parser.parse_args()
+
+    command = [args.executable] if args.executable else [sys.executable, os.path.join(ROOT, 'main.py')]
+    samples = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = os.path.join(temp_dir, 'startup-profile.json')
+        for i in range(args.warmup + args.runs):
+            metrics = run_once(command, report_path, args.timeout)
+            if i >= args.warmup:
+                samples.append(metrics)
+
+    summary = summarize(samples)
+    with open(args.budgets) as file:
+        budgets = json.load(file)
+    failures = compare(summary, budgets)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'runs': args.runs, 'summary': summary, 'failures': failures}, file, indent=4)
+
+    if failures:
+        print(f"\nOver budget: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nAll {len(summary)} metrics within budget over {args.runs} runs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Measure the per-test cost of setting up files for a run.
+
+Compares the file handling a test used to need, a fresh directory with the
+source and a temporary file for each standard stream, removed afterwards,
+with resetting a reused Workspace, in both the temporary directory and
+/dev/shm. Then times a whole trivial Python test started the old way
+(mkdtemp, write, subprocess, rmtree) and through run_program with the build
+cache and the workspace pool. Reports median milliseconds per test.
+
+    python benchmarks/workspace_benchmark.py --runs 200 --input-kb 64
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.editor.build_cache import BuildCache
+from src.editor.run_code import run_program
+from src.editor.workspace import SHM_DIR, Workspace
+
+CODE = "import sys\nprint(len(sys.stdin.read()))\n"
+
+
+def time_ms(fn):
+    begin = time.perf_counter()
+    fn()
+    return (time.perf_counter() - begin) * 1000
+
+
+def fresh_files(root, input_data):
+    """What each test did before: a new directory, source and stream files, then cleanup"""
+    directory = tempfile.mkdtemp(dir=root)
+    try:
+        with open(os.path.join(directory, 'script.py'), 'w') as f:
+            f.write(CODE)
+        with tempfile.TemporaryFile(dir=root) as stdin, tempfile.TemporaryFile(dir=root) as stdout, \
+                tempfile.TemporaryFile(dir=root) as stderr:
+            stdin.write(input_data.encode('utf-8'))
+            stdin.seek(0)
+            stdout.write(b'0\n')
+            stdout.flush()
+            stdout.seek(0)
+            stdout.read()
+            stderr.read()
+    finally:
+        shutil.rmtree(directory)
+
+
+def reused_workspace(workspace, input_data):
+    workspace.reset()
+    workspace.write_input(input_data)
+    os.write(workspace.stdout.fileno(), b'0\n')
+    workspace.read_outputs()
+
+
+def legacy_run(input_data):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'script.py')
+        with open(path, 'w') as f:
+            f.write(CODE)
+        subprocess.run([sys.executable, path], input=input_data, capture_output=True, text=True)
+    finally:
+        shutil.rmtree(directory)
+
+
+def median_ms(fn, runs):
+    fn()
+    return statistics.median(time_ms(fn) for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--input-kb', type=int, default=64)
+    args = parser.parse_args()
+    input_data = ('1 ' * (args.input_kb * 512))
+
+    roots = [tempfile.gettempdir()]
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK) and SHM_DIR not in roots:
+        roots.append(SHM_DIR)
+
+    print(f"File setup per test ({args.runs} runs, {args.input_kb} KB input), median ms")
+    for root in roots:
+        workspace = Workspace(root)
+        try:
+            fresh = median_ms(lambda: fresh_files(root, input_data), args.runs)
+            reused = median_ms(lambda: reused_workspace(workspace, input_data), args.runs)
+        finally:
+            workspace.close()
+        print(f"  {root:<12} fresh files {fresh:7.3f}   reused workspace {reused:7.3f}   "
+              f"({fresh / reused:.1f}x)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        command = BuildCache(cache_dir).get('python', CODE)
+        runs = max(1, args.runs // 4)
+        legacy = median_ms(lambda: legacy_run(input_data), runs)
+        current = median_ms(lambda: run_program(command, input_data), runs)
+    print(f"Whole Python test ({runs} runs), median ms")
+    print(f"  mkdtemp + subprocess {legacy:7.3f}   fork server + workspace {current:7.3f}   "
+          f"({legacy / current:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
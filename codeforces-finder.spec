@@ -10,7 +10,9 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('icon.ico', '.')],
+    datas=[('icon.ico', '.'), ('src/theme_data', 'src/theme_data'),
+           # Launched as a script by the solution's interpreter, not imported
+           ('src/editor/python_worker.py', 'src/editor')],
     hiddenimports=collect_submodules('src'),
     hookspath=[],
     runtime_hooks=[],
@@ -1,11 +1,34 @@
+import os
 import sys
+from src import startup_profile
+
+# Must run before anything else is imported so every import gets timed
+startup_profile.start_from_argv(sys.argv)
+
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QCoreApplication
 from src.app import CodeforcesApp
 
+# Quit as soon as the window has painted; used by the startup benchmark
+EXIT_AFTER_PAINT_FLAG = '--exit-after-first-paint'
+EXIT_AFTER_PAINT_ENV = 'CF_FINDER_EXIT_AFTER_PAINT'
+
 def main():
+    exit_after_paint = EXIT_AFTER_PAINT_FLAG in sys.argv or bool(os.environ.get(EXIT_AFTER_PAINT_ENV))
+    if EXIT_AFTER_PAINT_FLAG in sys.argv:
+        sys.argv.remove(EXIT_AFTER_PAINT_FLAG)
+
+    startup_profile.mark('imports_done')
+    # QtWebEngine is imported lazily with the code editor tab, which Qt only
+    # allows when context sharing is enabled before the application exists
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
-    ex = CodeforcesApp()
+    startup_profile.mark('application_created')
+    with startup_profile.profile_phase('window_init'):
+        ex = CodeforcesApp()
     ex.show()
+    startup_profile.mark('first_window_shown')
+    startup_profile.watch_first_paint(ex, on_painted=app.quit if exit_after_paint else None)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
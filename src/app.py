@@ -1,26 +1,47 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                            QSpinBox, QTableWidget, QTableWidgetItem, QComboBox,
-                           QHeaderView, QMessageBox, QTabWidget)
+                           QHeaderView, QMessageBox, QTabWidget, QCheckBox)
+from PyQt5.QtCore import QTimer
 from src.data_fetcher import DataFetcher
-from src.stats_page import StatsPage
-from src.editor.code_editor import CodeEditor
-from src.utils import (get_available_browsers, load_preferences, save_preferences, 
-                       load_bookmarks, save_bookmarks, get_default_browser_name)
+from src.utils import load_cached_browsers, get_browsers_cached
+from src.preferences import PreferencesStore
 from src.themes import ThemeManager
+from src.lazy_tab import LazyTab
+from src.startup_profile import profile_phase
+from src.task_pool import FunctionTask, get_task_pool
+from src.snapshot import get_snapshot, format_age
 import random
+import time
 import webbrowser
 
 class CodeforcesApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.problems = []
-        self.user_preferences = load_preferences()
-        self.available_browsers = get_available_browsers()
-        self.current_browser = self.user_preferences.get('browser', get_default_browser_name())
-        self.theme_manager = ThemeManager('Dark (Default)')
-        self.initUI()
-        self.setup_tabs()
+        self.stats_username = ''
+        self.bookmark_store = None
+        self.browser_detection_started = False
+        # Fetch time of the snapshot the last query fell back to, if any
+        self.snapshot_fallback_at = None
+        # The snapshot's own fetch time, read off the GUI thread; the timer
+        # only re-formats it
+        self.snapshot_fetched_at = None
+        self.snapshot_age_task = None
+        with profile_phase('preferences'):
+            self.user_preferences = PreferencesStore()
+        with profile_phase('browser_detection'):
+            # Only the on-disk cache is read here; a full detection spawns
+            # processes and runs in the background after the first paint
+            self.detected_browsers = load_cached_browsers()
+            self.available_browsers = self.browser_choices(self.detected_browsers)
+            self.current_browser = self.user_preferences.get('browser')
+        with profile_phase('theme'):
+            self.theme_manager = ThemeManager(self.user_preferences.get('theme', 'Dark (Default)'))
+        with profile_phase('init_ui'):
+            self.initUI()
+        with profile_phase('tab_setup'):
+            self.setup_tabs()
 
     def initUI(self):
         self.setWindowTitle('Codeforces Problem Finder')
@@ -84,6 +105,7 @@ class CodeforcesApp(QMainWindow):
         # Theme selection
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(self.theme_manager.get_theme_names())
+        self.theme_combo.setCurrentText(self.theme_manager.current_theme)
         self.theme_combo.currentTextChanged.connect(self.change_theme)
         controls_layout.addWidget(QLabel("Theme:"))
         controls_layout.addWidget(self.theme_combo)
@@ -91,15 +113,14 @@ class CodeforcesApp(QMainWindow):
         # Browser selection
         controls_layout.addWidget(QLabel("Open in Browser:"))
         self.browser_combo = QComboBox()
-        self.browser_combo.addItems(self.available_browsers.keys())
-        
-        # Set the previously selected browser if it exists
-        if self.current_browser:
-            index = self.browser_combo.findText(self.current_browser)
-            if index >= 0:
-                self.browser_combo.setCurrentIndex(index)
-        
+        self.fill_browser_combo()
         controls_layout.addWidget(self.browser_combo)
+
+        # Offline mode: answer every query from the local snapshot
+        self.offline_checkbox = QCheckBox("Offline Mode")
+        self.offline_checkbox.setChecked(self.user_preferences.get('offline', False))
+        self.offline_checkbox.toggled.connect(self.toggle_offline_mode)
+        controls_layout.addWidget(self.offline_checkbox)
         self.browser_combo.currentTextChanged.connect(self.save_browser_preference)
 
         layout.addWidget(controls_widget)
@@ -149,8 +170,14 @@ class CodeforcesApp(QMainWindow):
         # Status bar
         self.statusBar().showMessage('Ready')
 
-        # Load bookmarks
-        self.bookmarks = load_bookmarks()
+        # Snapshot age indicator, refreshed every minute
+        self.snapshot_label = QLabel()
+        self.statusBar().addPermanentWidget(self.snapshot_label)
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self.update_snapshot_indicator)
+        self.snapshot_timer.start(60 * 1000)
+        self.username_input.editingFinished.connect(self.refresh_snapshot_age)
+        self.refresh_snapshot_age()
     
     def setup_tabs(self):
         # Create tab widget
@@ -160,49 +187,103 @@ class CodeforcesApp(QMainWindow):
         self.problem_finder_page = QWidget()
         self.problem_finder_page.setLayout(self.centralWidget().layout())
         
-        # Create stats page
-        self.stats_page = StatsPage()
-        
-        # Create code editor page
-        self.code_editor = CodeEditor()
+        # Stats and code editor pages are heavy (matplotlib, QtWebEngine),
+        # so they are only built when first shown
+        self.stats_tab = LazyTab(self.create_stats_page)
+        self.stats_tab.created.connect(self.on_stats_page_created)
+        self.code_editor_tab = LazyTab(self.create_code_editor)
+        self.bookmarks_tab = LazyTab(self.create_bookmarks_page)
         
         # Add tabs
         self.tab_widget.addTab(self.problem_finder_page, "Problem Finder")
-        self.tab_widget.addTab(self.stats_page, "User Stats")
-        self.tab_widget.addTab(self.code_editor, "Code Editor")
+        self.tab_widget.addTab(self.stats_tab, "User Stats")
+        self.tab_widget.addTab(self.code_editor_tab, "Code Editor")
+        self.tab_widget.addTab(self.bookmarks_tab, "Bookmarks")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # Set tab widget as central widget
         self.setCentralWidget(self.tab_widget)
 
+    def create_stats_page(self):
+        # Imported on first use: pulls in matplotlib, numpy and requests
+        from src.stats_page import StatsPage
+        return StatsPage()
+
+    def create_code_editor(self):
+        # Imported on first use: pulls in QtWebEngine
+        from src.editor.code_editor import CodeEditor
+        return CodeEditor()
+
+    def create_bookmarks_page(self):
+        from src.bookmarks_page import BookmarksPage
+        page = BookmarksPage(self.get_bookmark_store())
+        page.open_problem.connect(self.open_in_browser)
+        return page
+
+    def get_bookmark_store(self):
+        if self.bookmark_store is None:
+            from src.bookmarks import BookmarkStore
+            self.bookmark_store = BookmarkStore()
+        return self.bookmark_store
+
+    def on_tab_changed(self, index):
+        tab = self.tab_widget.widget(index)
+        if isinstance(tab, LazyTab):
+            tab.widget()
+
+    def on_stats_page_created(self, stats_page):
+        stats_page.set_offline(self.offline_checkbox.isChecked())
+        stats_page.used_snapshot.connect(self.on_snapshot_used)
+        stats_page.set_chart_colors(self.theme_manager.chart_colors())
+        if self.stats_username:
+            stats_page.update_username(self.stats_username)
+
     def fetch_problems(self):
         username = self.username_input.text()
-        self.stats_page.update_username(username)
+        self.user_preferences.update({
+            'username': username,
+            'min_rating': self.min_rating.value(),
+            'max_rating': self.max_rating.value(),
+            'contest_limit': self.contest_limit.value(),
+        })
+        self.stats_username = username
+        if self.stats_tab.is_loaded():
+            self.stats_tab.widget().update_username(username)
         self.statusBar().showMessage('Fetching problems...')
         self.fetch_button.setEnabled(False)
         self.table.setRowCount(0)
+        self.start_query()
         
         self.fetcher = DataFetcher(
             username,
             self.min_rating.value(),
             self.max_rating.value(),
-            self.contest_limit.value()
+            self.contest_limit.value(),
+            offline=self.offline_checkbox.isChecked()
         )
+        self.fetcher.used_snapshot.connect(self.on_snapshot_used)
         self.fetcher.finished.connect(self.update_problems)
         self.fetcher.error.connect(self.show_error)
         self.fetcher.start()
 
+    def start_query(self):
+        self.snapshot_fallback_at = None
+
     def fetch_practice_recommendations(self):
         username = self.username_input.text()
         self.statusBar().showMessage('Fetching practice recommendations...')
         self.practice_recommendation_button.setEnabled(False)
+        self.start_query()
         
         self.fetcher = DataFetcher(
             username,
             0,
             3500,
             1000,
-            recommendation_type='practice'
+            recommendation_type='practice',
+            offline=self.offline_checkbox.isChecked()
         )
+        self.fetcher.used_snapshot.connect(self.on_snapshot_used)
         self.fetcher.finished.connect(self.update_recommendations)
         self.fetcher.error.connect(self.show_error)
         self.fetcher.start()
@@ -211,14 +292,17 @@ class CodeforcesApp(QMainWindow):
         username = self.username_input.text()
         self.statusBar().showMessage('Fetching warm-up recommendations...')
         self.warmup_recommendation_button.setEnabled(False)
+        self.start_query()
         
         self.fetcher = DataFetcher(
             username,
             0,
             3500,
             1000,
-            recommendation_type='warmup'
+            recommendation_type='warmup',
+            offline=self.offline_checkbox.isChecked()
         )
+        self.fetcher.used_snapshot.connect(self.on_snapshot_used)
         self.fetcher.finished.connect(self.update_recommendations)
         self.fetcher.error.connect(self.show_error)
         self.fetcher.start()
@@ -228,6 +312,7 @@ class CodeforcesApp(QMainWindow):
         self.display_problems()
         self.fetch_button.setEnabled(True)
         self.statusBar().showMessage(f'Found {len(problems)} problems')
+        self.refresh_snapshot_age()
 
     def update_recommendations(self, problems):
         self.problems = problems
@@ -235,6 +320,7 @@ class CodeforcesApp(QMainWindow):
         self.practice_recommendation_button.setEnabled(True)
         self.warmup_recommendation_button.setEnabled(True)
         self.statusBar().showMessage(f'Recommended {len(problems)} problems')
+        self.refresh_snapshot_age()
 
     def show_error(self, error_message):
         self.statusBar().showMessage(f'Error: {error_message}')
@@ -242,6 +328,40 @@ class CodeforcesApp(QMainWindow):
         self.practice_recommendation_button.setEnabled(True)
         self.warmup_recommendation_button.setEnabled(True)
 
+    def toggle_offline_mode(self, offline):
+        self.user_preferences.set('offline', offline)
+        if self.stats_tab.is_loaded():
+            self.stats_tab.widget().set_offline(offline)
+        self.update_snapshot_indicator()
+
+    def on_snapshot_used(self, fetched_at):
+        self.snapshot_fallback_at = fetched_at
+        self.update_snapshot_indicator()
+
+    def refresh_snapshot_age(self):
+        """Re-read the snapshot's fetch time for the current username in the background"""
+        username = self.username_input.text()
+        task = FunctionTask(lambda: get_snapshot().fetched_at(username or None))
+        task.finished.connect(lambda fetched_at: self.on_snapshot_age(task, fetched_at))
+        self.snapshot_age_task = task
+        get_task_pool().submit(task)
+
+    def on_snapshot_age(self, task, fetched_at):
+        if task is self.snapshot_age_task:
+            self.snapshot_fetched_at = fetched_at
+            self.update_snapshot_indicator()
+
+    def update_snapshot_indicator(self):
+        if self.snapshot_fetched_at is None:
+            text = "No offline snapshot yet"
+        else:
+            text = f"Snapshot updated {format_age(time.time() - self.snapshot_fetched_at)}"
+        if self.offline_checkbox.isChecked():
+            text = f"Offline mode — {text}"
+        elif self.snapshot_fallback_at is not None:
+            text = f"API unreachable, using snapshot from {format_age(time.time() - self.snapshot_fallback_at)}"
+        self.snapshot_label.setText(text)
+
     def display_problems(self):
         self.table.setRowCount(len(self.problems))
         for i, problem in enumerate(self.problems):
@@ -268,10 +388,46 @@ class CodeforcesApp(QMainWindow):
         
         self.display_problems()
 
+    def browser_choices(self, detected):
+        if detected is None:
+            return {'System Browser (Default)': ''}
+        return detected['available']
+
+    def fill_browser_combo(self):
+        self.browser_combo.blockSignals(True)
+        self.browser_combo.clear()
+        self.browser_combo.addItems(self.available_browsers.keys())
+        
+        # Set the previously selected browser, or the detected default
+        selected = self.current_browser
+        if not selected and self.detected_browsers:
+            selected = self.detected_browsers['default']
+        if selected:
+            index = self.browser_combo.findText(selected)
+            if index >= 0:
+                self.browser_combo.setCurrentIndex(index)
+        self.browser_combo.blockSignals(False)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.detected_browsers is None and not self.browser_detection_started:
+            self.browser_detection_started = True
+            # Runs once the event loop is idle, i.e. after the first paint
+            QTimer.singleShot(0, self.start_browser_detection)
+
+    def start_browser_detection(self):
+        task = FunctionTask(get_browsers_cached)
+        task.finished.connect(self.on_browsers_detected)
+        get_task_pool().submit(task)
+
+    def on_browsers_detected(self, detected):
+        self.detected_browsers = detected
+        self.available_browsers = self.browser_choices(detected)
+        self.fill_browser_combo()
+
     def save_browser_preference(self):
         self.current_browser = self.browser_combo.currentText()
-        self.user_preferences['browser'] = self.current_browser
-        save_preferences(self.user_preferences)
+        self.user_preferences.set('browser', self.current_browser)
 
     def open_problem(self, index):
         row = index.row()
@@ -294,10 +450,12 @@ class CodeforcesApp(QMainWindow):
         row = self.table.currentRow()
         if row != -1:
             problem = self.problems[row]
-            self.tab_widget.setCurrentWidget(self.code_editor)
-            self.code_editor.web_view.page().runJavaScript(
-                f"editor.setValue(`// Problem: {problem['name']}\n// Contest ID: {problem['contestId']}\n// Index: {problem['index']}\n\n`);"
+            self.tab_widget.setCurrentWidget(self.code_editor_tab)
+            editor = self.code_editor_tab.widget()
+            editor.set_code(
+                f"// Problem: {problem['name']}\n// Contest ID: {problem['contestId']}\n// Index: {problem['index']}\n\n"
             )
+            editor.set_problem(problem['contestId'], problem['index'])
             
     def open_in_browser(self, url):
         browser_name = self.browser_combo.currentText()
@@ -324,13 +482,21 @@ class CodeforcesApp(QMainWindow):
     
     def change_theme(self, theme):
         self.theme_manager.apply_theme(theme)
-        self.user_preferences['theme'] = theme
-        save_preferences(self.user_preferences)
+        if self.stats_tab.is_loaded():
+            self.stats_tab.widget().set_chart_colors(self.theme_manager.chart_colors())
+        self.user_preferences.set('theme', theme)
+
+    def closeEvent(self, event):
+        self.user_preferences.flush()
+        super().closeEvent(event)
 
     def bookmark_problem(self):
         row = self.table.currentRow()
         if row != -1:
             problem = self.problems[row]
-            self.bookmarks.append(problem)
-            save_bookmarks(self.bookmarks)
+            if not self.get_bookmark_store().add(problem):
+                QMessageBox.information(self, "Bookmarked", f"Problem {problem['name']} is already bookmarked")
+                return
+            if self.bookmarks_tab.is_loaded():
+                self.bookmarks_tab.widget().refresh()
             QMessageBox.information(self, "Bookmarked", f"Problem {problem['name']} bookmarked")
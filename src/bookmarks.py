@@ -0,0 +1,198 @@
+import os
+import json
+import sqlite3
+import time
+from src.utils import get_config_dir
+
+BOOKMARKS_DB = 'bookmarks.db'
+LEGACY_BOOKMARKS_FILE = 'bookmarks.json'
+
+# (column, descending) per sort; the rowid makes every order total, which
+# keyset paging needs
+SORT_KEYS = {
+    'newest': [('created_at', True), ('rowid', True)],
+    'oldest': [('created_at', False), ('rowid', False)],
+    'rating_asc': [('rating', False), ('created_at', True), ('rowid', True)],
+    'rating_desc': [('rating', True), ('created_at', True), ('rowid', True)],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookmarks (
+    problem_key TEXT PRIMARY KEY,
+    contest_id INTEGER,
+    problem_index TEXT,
+    name TEXT NOT NULL,
+    rating INTEGER NOT NULL DEFAULT 0,
+    tags TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bookmarks_rating ON bookmarks (rating);
+CREATE INDEX IF NOT EXISTS idx_bookmarks_created_at ON bookmarks (created_at);
+CREATE TABLE IF NOT EXISTS bookmark_tags (
+    tag TEXT NOT NULL,
+    problem_key TEXT NOT NULL REFERENCES bookmarks (problem_key) ON DELETE CASCADE,
+    PRIMARY KEY (tag, problem_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_bookmark_tags_problem ON bookmark_tags (problem_key);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _seek_clause(keys, values):
+    """WHERE clause for the rows after values in the order given by keys"""
+    if len({descending for _, descending in keys}) == 1:
+        # One direction: a row value comparison, which SQLite seeks an index with
+        columns = ', '.join(column for column, _ in keys)
+        marks = ', '.join('?' * len(keys))
+        return f"({columns}) {'<' if keys[0][1] else '>'} ({marks})", list(values)
+    clauses, params = [], []
+    for i, (column, descending) in enumerate(keys):
+        parts = [f"{previous} = ?" for previous, _ in keys[:i]]
+        parts.append(f"{column} {'<' if descending else '>'} ?")
+        clauses.append(f"({' AND '.join(parts)})")
+        params.extend(values[:i + 1])
+    return f"({' OR '.join(clauses)})", params
+
+
+def get_problem_key(problem):
+    return f"{problem.get('contestId')}_{problem.get('index')}"
+
+
+class BookmarkStore:
+    """Bookmarked problems in an embedded SQLite database.
+
+    Each problem is stored once under its contestId_index key. Tags live in a
+    separate indexed table so tag filters don't scan every bookmark.
+    revision goes up whenever bookmarks are added or removed, so views can
+    tell when their cached counts and tag lists are stale.
+    """
+    def __init__(self, path=None, legacy_path=None):
+        self.path = path or os.path.join(get_config_dir(), BOOKMARKS_DB)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.executescript(SCHEMA)
+        self.revision = 0
+        self._import_legacy(legacy_path or LEGACY_BOOKMARKS_FILE)
+
+    def _import_legacy(self, legacy_path):
+        """One-time import of the bookmarks.json list used by older versions"""
+        imported = self.connection.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if imported or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r') as file:
+                problems = json.load(file)
+        except ValueError:
+            problems = []
+        with self.connection:
+            for problem in problems:
+                if isinstance(problem, dict):
+                    self._insert(problem)
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', '1')")
+        self.revision += 1
+
+    def _insert(self, problem, created_at=None):
+        key = get_problem_key(problem)
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO bookmarks "
+            "(problem_key, contest_id, problem_index, name, rating, tags, url, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, problem.get('contestId'), problem.get('index'), problem.get('name', ''),
+             problem.get('rating') or 0, ', '.join(problem.get('tags', [])),
+             problem.get('url', ''), created_at or time.time())
+        )
+        if cursor.rowcount == 0:
+            return False
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO bookmark_tags (tag, problem_key) VALUES (?, ?)",
+            [(tag, key) for tag in problem.get('tags', [])]
+        )
+        return True
+
+    def add(self, problem):
+        """Bookmark a problem; returns False if it was already bookmarked"""
+        with self.connection:
+            added = self._insert(problem)
+        if added:
+            self.revision += 1
+        return added
+
+    def remove(self, problem_key):
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM bookmarks WHERE problem_key = ?", (problem_key,))
+        if cursor.rowcount > 0:
+            self.revision += 1
+        return cursor.rowcount > 0
+
+    def contains(self, problem_key):
+        row = self.connection.execute("SELECT 1 FROM bookmarks WHERE problem_key = ?", (problem_key,)).fetchone()
+        return row is not None
+
+    def _where(self, tag, min_rating, max_rating):
+        clauses = []
+        params = []
+        if tag:
+            clauses.append("problem_key IN (SELECT problem_key FROM bookmark_tags WHERE tag = ?)")
+            params.append(tag)
+        if min_rating is not None:
+            clauses.append("rating >= ?")
+            params.append(min_rating)
+        if max_rating is not None:
+            clauses.append("rating <= ?")
+            params.append(max_rating)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def count(self, tag=None, min_rating=None, max_rating=None):
+        where, params = self._where(tag, min_rating, max_rating)
+        return self.connection.execute(f"SELECT COUNT(*) FROM bookmarks{where}", params).fetchone()[0]
+
+    def page(self, offset=0, limit=50, order='newest', tag=None, min_rating=None, max_rating=None, after=None):
+        """Return one page of bookmarks as problem dicts.
+
+        Each problem has a 'cursor'; passing the last one as after returns the
+        next page by seeking the sort index, which unlike offset doesn't get
+        slower the further the page is.
+        """
+        keys = SORT_KEYS[order]
+        where, params = self._where(tag, min_rating, max_rating)
+        if after is not None:
+            seek, seek_params = _seek_clause(keys, after)
+            where = f"{where} AND {seek}" if where else f" WHERE {seek}"
+            params = params + seek_params
+        order_by = ', '.join(f"{column} {'DESC' if descending else 'ASC'}" for column, descending in keys)
+        rows = self.connection.execute(
+            f"SELECT rowid, * FROM bookmarks{where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        problems = []
+        for row in rows:
+            problem = self._row_to_problem(row)
+            problem['cursor'] = tuple(row[column] for column, _ in keys)
+            problems.append(problem)
+        return problems
+
+    def tags(self):
+        rows = self.connection.execute("SELECT DISTINCT tag FROM bookmark_tags ORDER BY tag").fetchall()
+        return [row[0] for row in rows]
+
+    def _row_to_problem(self, row):
+        return {
+            'key': row['problem_key'],
+            'name': row['name'],
+            'rating': row['rating'],
+            'contestId': row['contest_id'],
+            'index': row['problem_index'],
+            'tags': row['tags'].split(', ') if row['tags'] else [],
+            'url': row['url'],
+            'created_at': row['created_at'],
+        }
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,177 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                           QComboBox, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt5.QtCore import pyqtSignal
+
+PAGE_SIZE = 50
+
+SORT_OPTIONS = {
+    "Newest": 'newest',
+    "Oldest": 'oldest',
+    "Rating ↑": 'rating_asc',
+    "Rating ↓": 'rating_desc',
+}
+
+class BookmarksPage(QWidget):
+    open_problem = pyqtSignal(str)
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        # For keyset paging, the cursor each page up to the current one
+        # starts after; None starts at the top
+        self.page_starts = [None]
+        self.page_problems = []
+        # Counts and the tag list only change with the bookmarks, not per page
+        self.loaded_revision = None
+        self.counts = {}
+        self.initUI()
+        self.refresh()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        # Filter and sort controls
+        controls_layout = QHBoxLayout()
+        self.tag_combo = QComboBox()
+        self.tag_combo.currentIndexChanged.connect(self.reset_and_refresh)
+        controls_layout.addWidget(QLabel("Tag:"))
+        controls_layout.addWidget(self.tag_combo)
+
+        self.min_rating = QSpinBox()
+        self.min_rating.setRange(0, 3500)
+        self.min_rating.setSingleStep(100)
+        self.min_rating.valueChanged.connect(self.reset_and_refresh)
+        self.max_rating = QSpinBox()
+        self.max_rating.setRange(0, 3500)
+        self.max_rating.setSingleStep(100)
+        self.max_rating.setValue(3500)
+        self.max_rating.valueChanged.connect(self.reset_and_refresh)
+        controls_layout.addWidget(QLabel("Rating Range:"))
+        controls_layout.addWidget(self.min_rating)
+        controls_layout.addWidget(QLabel("to"))
+        controls_layout.addWidget(self.max_rating)
+
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_OPTIONS.keys())
+        self.sort_combo.currentIndexChanged.connect(self.reset_and_refresh)
+        controls_layout.addWidget(QLabel("Sort by:"))
+        controls_layout.addWidget(self.sort_combo)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+
+        # Bookmarks table
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Name", "Rating", "Contest ID", "Index", "Tags"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        # Paging and actions
+        paging_layout = QHBoxLayout()
+        self.prev_button = QPushButton("Previous")
+        self.prev_button.clicked.connect(self.previous_page)
+        self.next_button = QPushButton("Next")
+        self.next_button.clicked.connect(self.next_page)
+        self.page_label = QLabel()
+        self.remove_button = QPushButton("Remove Bookmark")
+        self.remove_button.clicked.connect(self.remove_selected)
+        paging_layout.addWidget(self.prev_button)
+        paging_layout.addWidget(self.page_label)
+        paging_layout.addWidget(self.next_button)
+        paging_layout.addStretch()
+        paging_layout.addWidget(self.remove_button)
+        layout.addLayout(paging_layout)
+
+    def filters(self):
+        # Bounds at the ends of the range filter nothing, but would still make
+        # SQLite plan the query around the rating index and sort every row
+        min_rating, max_rating = self.min_rating.value(), self.max_rating.value()
+        return {
+            'tag': self.tag_combo.currentData(),
+            'min_rating': min_rating if min_rating > self.min_rating.minimum() else None,
+            'max_rating': max_rating if max_rating < self.max_rating.maximum() else None,
+        }
+
+    def reload_tags(self):
+        current = self.tag_combo.currentData()
+        self.tag_combo.blockSignals(True)
+        self.tag_combo.clear()
+        self.tag_combo.addItem("All", None)
+        for tag in self.store.tags():
+            self.tag_combo.addItem(tag, tag)
+        index = self.tag_combo.findData(current)
+        self.tag_combo.setCurrentIndex(max(index, 0))
+        self.tag_combo.blockSignals(False)
+
+    @property
+    def page_index(self):
+        return len(self.page_starts) - 1
+
+    def reset_and_refresh(self):
+        self.page_starts = [None]
+        self.refresh()
+
+    def count(self, filters):
+        key = tuple(sorted(filters.items()))
+        if key not in self.counts:
+            self.counts[key] = self.store.count(**filters)
+        return self.counts[key]
+
+    def refresh(self):
+        if self.loaded_revision != self.store.revision:
+            self.loaded_revision = self.store.revision
+            self.counts = {}
+            self.reload_tags()
+        filters = self.filters()
+        total = self.count(filters)
+        page_count = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+
+        # One extra row tells whether there is a next page
+        problems = self.store.page(
+            limit=PAGE_SIZE + 1,
+            order=SORT_OPTIONS[self.sort_combo.currentText()],
+            after=self.page_starts[-1],
+            **filters
+        )
+        if not problems and len(self.page_starts) > 1:
+            # The last page emptied, e.g. its only bookmark was removed
+            self.page_starts.pop()
+            self.refresh()
+            return
+        has_next = len(problems) > PAGE_SIZE
+        self.page_problems = problems[:PAGE_SIZE]
+        self.table.setRowCount(len(self.page_problems))
+        for i, problem in enumerate(self.page_problems):
+            self.table.setItem(i, 0, QTableWidgetItem(problem['name']))
+            self.table.setItem(i, 1, QTableWidgetItem(str(problem['rating'])))
+            self.table.setItem(i, 2, QTableWidgetItem(str(problem['contestId'])))
+            self.table.setItem(i, 3, QTableWidgetItem(problem['index']))
+            self.table.setItem(i, 4, QTableWidgetItem(', '.join(problem['tags'])))
+
+        self.page_label.setText(f"Page {self.page_index + 1} of {page_count} ({total} bookmarks)")
+        self.prev_button.setEnabled(self.page_index > 0)
+        self.next_button.setEnabled(has_next)
+
+    def previous_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.refresh()
+
+    def next_page(self):
+        if self.page_problems:
+            self.page_starts.append(self.page_problems[-1]['cursor'])
+            self.refresh()
+
+    def open_selected(self, index):
+        problem = self.page_problems[index.row()]
+        self.open_problem.emit(problem['url'])
+
+    def remove_selected(self):
+        row = self.table.currentRow()
+        if row != -1:
+            self.store.remove(self.page_problems[row]['key'])
+            self.refresh()
@@ -0,0 +1,214 @@
+"""Compact binary format for the problem catalog.
+
+Layout (little endian):
+
+    header      magic, version, problem count, string count, checksum, fetched_at
+    columns     contest_id  int32[N]
+                rating      int32[N]
+                name        uint32[N]    string id
+                index       uint32[N]    string id
+                tag_start   uint32[N+1]  range into tag_ids
+                tag_ids     uint32[T]    string id
+    strings     offsets     uint32[S+1]  range into the UTF-8 blob
+                blob        bytes
+
+All columns are fixed width, so the file is used in place through mmap:
+opening it parses nothing, and pages are only read when a row is touched.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+MAGIC = b'CFCATLG\0'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIId')
+MISSING_CONTEST_ID = -1
+
+
+class CatalogFormatError(Exception):
+    pass
+
+
+def problem_url(contest_id, index):
+    return f"https://codeforces.com/problemset/problem/{contest_id}/{index}"
+
+
+def _array_bytes(typecode, values):
+    from array import array
+    data = array(typecode, values)
+    if data.itemsize != struct.calcsize(typecode):
+        raise CatalogFormatError(f"Unexpected item size for {typecode}")
+    if struct.pack('=I', 1) != struct.pack('<I', 1):
+        data.byteswap()
+    return data.tobytes()
+
+
+def encode_catalog(problems, fetched_at=0.0):
+    """Serialize a list of problem dicts to the binary catalog format"""
+    strings = {}
+
+    def string_id(value):
+        value = value or ''
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    contest_ids, ratings, names, indexes, tag_start, tag_ids = [], [], [], [], [0], []
+    for problem in problems:
+        contest_id = problem.get('contestId')
+        contest_ids.append(MISSING_CONTEST_ID if contest_id is None else contest_id)
+        ratings.append(problem.get('rating') or 0)
+        names.append(string_id(problem.get('name')))
+        indexes.append(string_id(problem.get('index')))
+        tag_ids.extend(string_id(tag) for tag in problem.get('tags', []))
+        tag_start.append(len(tag_ids))
+
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    body = b''.join([
+        _array_bytes('i', contest_ids),
+        _array_bytes('i', ratings),
+        _array_bytes('I', names),
+        _array_bytes('I', indexes),
+        _array_bytes('I', tag_start),
+        _array_bytes('I', tag_ids),
+        _array_bytes('I', offsets),
+        b''.join(encoded),
+    ])
+    header = HEADER.pack(MAGIC, VERSION, len(problems), len(strings), zlib.crc32(body), fetched_at)
+    return header + body
+
+
+def write_catalog(path, problems, fetched_at=0.0):
+    """Atomically write problems to path in the binary catalog format"""
+    data = encode_catalog(problems, fetched_at)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class MappedCatalog:
+    """Read-only sequence of problem dicts backed by a memory-mapped catalog file"""
+    def __init__(self, path, verify=True):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(verify)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, verify):
+        # Columns are read in place with native byte order
+        if sys.byteorder != 'little':
+            raise CatalogFormatError("Mapped catalogs need a little-endian host")
+        if len(self._mmap) < HEADER.size:
+            raise CatalogFormatError("Catalog file is truncated")
+        magic, version, count, string_count, checksum, fetched_at = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise CatalogFormatError("Not a catalog file")
+        if version != VERSION:
+            raise CatalogFormatError(f"Unsupported catalog version {version}")
+        view = memoryview(self._mmap)
+        if verify and zlib.crc32(view[HEADER.size:]) != checksum:
+            view.release()
+            raise CatalogFormatError("Catalog checksum mismatch")
+
+        self.fetched_at = fetched_at
+        self._count = count
+        self._views = [view]
+        position = HEADER.size
+
+        def column(typecode, length):
+            nonlocal position
+            size = length * 4
+            if position + size > len(self._mmap):
+                raise CatalogFormatError("Catalog file is truncated")
+            values = view[position:position + size].cast(typecode)
+            self._views.append(values)
+            position += size
+            return values
+
+        self.contest_ids = column('i', count)
+        self.ratings = column('i', count)
+        self._names = column('I', count)
+        self._indexes = column('I', count)
+        self._tag_start = column('I', count + 1)
+        self._tag_ids = column('I', self._tag_start[count])
+        self._string_offsets = column('I', string_count + 1)
+        self._blob_start = position
+        self._strings = {}
+
+    def string(self, string_id):
+        value = self._strings.get(string_id)
+        if value is None:
+            start = self._blob_start + self._string_offsets[string_id]
+            end = self._blob_start + self._string_offsets[string_id + 1]
+            value = self._mmap[start:end].decode('utf-8')
+            self._strings[string_id] = value
+        return value
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        contest_id = self.contest_ids[i]
+        contest_id = None if contest_id == MISSING_CONTEST_ID else contest_id
+        index = self.string(self._indexes[i])
+        return {
+            'name': self.string(self._names[i]),
+            'rating': self.ratings[i],
+            'contestId': contest_id,
+            'index': index,
+            'tags': [self.string(tag_id) for tag_id in self._tag_ids[self._tag_start[i]:self._tag_start[i + 1]]],
+            'url': problem_url(contest_id, index),
+        }
+
+    def __iter__(self):
+        return self.rows(range(self._count))
+
+    def rows(self, indices):
+        """Yield the problems at the given row numbers"""
+        # Walk the columns as plain lists; one tolist() per column is far
+        # cheaper than indexing the memoryviews row by row
+        string = self.string
+        contest_ids, ratings = self.contest_ids.tolist(), self.ratings.tolist()
+        names, indexes = self._names.tolist(), self._indexes.tolist()
+        tag_start, tag_ids = self._tag_start.tolist(), self._tag_ids.tolist()
+        for i in indices:
+            contest_id, rating = contest_ids[i], ratings[i]
+            contest_id = None if contest_id == MISSING_CONTEST_ID else contest_id
+            index = string(indexes[i])
+            yield {
+                'name': string(names[i]),
+                'rating': rating,
+                'contestId': contest_id,
+                'index': index,
+                'tags': [string(tag_id) for tag_id in tag_ids[tag_start[i]:tag_start[i + 1]]],
+                'url': problem_url(contest_id, index),
+            }
+
+    def indices_in_rating_range(self, min_rating, max_rating):
+        """Row numbers whose rating is in range, reading only the rating column"""
+        return [i for i, rating in enumerate(self.ratings.tolist()) if min_rating <= rating <= max_rating]
+
+    def close(self):
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        self._mmap.close()
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+# Rasters are a few MB each, so only keep the most recent sizes around
+MAX_CACHED_RASTERS = 8
+
+
+def data_key(*parts):
+    """Build a hashable cache key from aggregated chart data (dicts, tuples, scalars)."""
+    normalized = []
+    for part in parts:
+        if isinstance(part, dict):
+            part = tuple(sorted(part.items()))
+        normalized.append(part)
+    return hash(tuple(normalized))
+
+
+class CachedFigureCanvas(FigureCanvasQTAgg):
+    """FigureCanvas that skips redundant rebuilds and reuses rendered rasters.
+
+    Callers tag the figure contents with a key through needs_update() and
+    set_content_key(). Renders are cached per (content key, pixel size), so a
+    resize back to a size that was already drawn restores the raster instead
+    of rendering the figure again.
+    """
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.content_key = None
+        self._rasters = OrderedDict()
+
+    def needs_update(self, key):
+        """Return False when the figure already shows the data identified by key."""
+        return key != self.content_key
+
+    def set_content_key(self, key):
+        self.content_key = key
+
+    def _raster_key(self):
+        width, height = self.get_width_height(physical=True)
+        return (self.content_key, width, height, self.figure.dpi)
+
+    def draw(self):
+        if self.content_key is None:
+            super().draw()
+            return
+
+        raster_key = self._raster_key()
+        region = self._rasters.get(raster_key)
+        if region is not None:
+            self._rasters.move_to_end(raster_key)
+            self.get_renderer().restore_region(region)
+            self.update()
+            return
+
+        super().draw()
+        self._rasters[raster_key] = self.copy_from_bbox(self.figure.bbox)
+        while len(self._rasters) > MAX_CACHED_RASTERS:
+            self._rasters.popitem(last=False)
+
+    def clear_cache(self):
+        self._rasters.clear()
+        self.content_key = None
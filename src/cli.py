@@ -0,0 +1,87 @@
+"""Command line interface to the problem finder.
+
+Prints JSON keyed by handle, so daily picks for many users can be scripted:
+
+    python cli.py pick tourist petr --min-rating 1500 --max-rating 1900 --count 3
+    python cli.py recommend tourist --type warmup
+    python cli.py stats tourist --offline
+    python cli.py serve --port 8080
+
+A handle that fails gets an "error" entry instead of results and the exit
+status is 1. Qt is never imported. `serve` starts the HTTP service in
+src/service.py instead.
+"""
+import argparse
+import json
+import random
+import sys
+from src.codeforces_api import CodeforcesClient, CODEFORCES_API_URL
+from src.finder import (ProblemFinder, RECOMMENDATION_TYPES, DEFAULT_MIN_RATING, DEFAULT_MAX_RATING,
+                        DEFAULT_CONTEST_LIMIT)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('handles', nargs='+', metavar='HANDLE')
+    common.add_argument('--offline', action='store_true', help='use only the local snapshot')
+    common.add_argument('--indent', type=int, default=None, help='pretty-print the JSON output')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pick = subparsers.add_parser('pick', parents=[common], help='random unsolved problems matching filters')
+    pick.add_argument('--min-rating', type=int, default=DEFAULT_MIN_RATING)
+    pick.add_argument('--max-rating', type=int, default=DEFAULT_MAX_RATING)
+    pick.add_argument('--contest-limit', type=int, default=DEFAULT_CONTEST_LIMIT)
+    pick.add_argument('--tags', nargs='+', default=None, help='match problems with any of these tags')
+    pick.add_argument('--count', type=int, default=1)
+    pick.add_argument('--seed', type=int, default=None, help='make the picks reproducible')
+
+    recommend = subparsers.add_parser('recommend', parents=[common], help='practice or warm-up recommendations')
+    recommend.add_argument('--type', choices=RECOMMENDATION_TYPES, default='practice')
+
+    subparsers.add_parser('stats', parents=[common], help='solved counts by tag and rating')
+
+    serve = subparsers.add_parser('serve', help='serve picks and recommendations over HTTP')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--offline', action='store_true', help='use only the local snapshot')
+    serve.add_argument('--api-url', default=None, help='Codeforces API base URL, e.g. a stand-in for load tests')
+    return parser
+
+
+def run_command(args, finder):
+    """Return ({handle: result}, ok)"""
+    rng = random.Random(args.seed) if args.command == 'pick' else None
+    results, ok = {}, True
+    for handle in args.handles:
+        try:
+            if args.command == 'pick':
+                results[handle] = {'problems': finder.pick(handle, args.count, rng)}
+            elif args.command == 'recommend':
+                results[handle] = {'problems': finder.find(handle, args.type)}
+            else:
+                results[handle] = finder.get_stats(handle)
+        except Exception as e:
+            results[handle] = {'error': str(e)}
+            ok = False
+    return results, ok
+
+
+def main(argv=None, stdout=None):
+    args = build_parser().parse_args(argv)
+    stdout = stdout or sys.stdout
+    if args.command == 'serve':
+        from src.service import serve
+        client = CodeforcesClient(offline=args.offline, api_url=args.api_url or CODEFORCES_API_URL)
+        serve(args.host, args.port, client)
+        return 0
+    client = CodeforcesClient(offline=args.offline)
+    if args.command == 'pick':
+        finder = ProblemFinder(args.min_rating, args.max_rating, args.contest_limit, args.tags, client=client)
+    else:
+        finder = ProblemFinder(0, DEFAULT_MAX_RATING, 1000, client=client)
+    results, ok = run_command(args, finder)
+    json.dump(results, stdout, indent=args.indent, ensure_ascii=False)
+    stdout.write('\n')
+    return 0 if ok else 1
@@ -0,0 +1,131 @@
+import re
+import time
+from src.snapshot import get_snapshot
+from src.errors import FinderError
+
+CODEFORCES_URL = 'https://codeforces.com'
+CODEFORCES_API_URL = f'{CODEFORCES_URL}/api'
+REQUEST_TIMEOUT = 30
+# The contest list changes rarely, so it is refreshed at most once a day
+CONTESTS_MAX_AGE = 24 * 60 * 60
+
+
+class NetworkError(Exception):
+    """The Codeforces API could not be reached or is failing."""
+
+
+def parse_problems(problems_data):
+    return [{
+        'name': problem.get('name'),
+        'rating': problem.get('rating', 0),
+        'contestId': problem.get('contestId'),
+        'index': problem.get('index'),
+        'tags': problem.get('tags', []),
+        'url': f"https://codeforces.com/problemset/problem/{problem.get('contestId')}/{problem.get('index')}"
+    } for problem in problems_data]
+
+
+def parse_problem_limits(html):
+    """(time limit in seconds, memory limit in bytes) stated on a problem page.
+
+    The API doesn't expose limits, so they are read from the statement.
+    """
+    time_match = re.search(r'time limit per test</div>\s*([\d.]+)\s*seconds?', html)
+    memory_match = re.search(r'memory limit per test</div>\s*(\d+)\s*megabytes?', html)
+    if not time_match or not memory_match:
+        raise FinderError("Problem limits not found on the problem page")
+    return float(time_match.group(1)), int(memory_match.group(1)) << 20
+
+
+class CodeforcesClient:
+    """Codeforces API access backed by the offline snapshot.
+
+    Every successful download refreshes the snapshot. In offline mode, or
+    when the API is unreachable, data is served from the snapshot instead and
+    on_snapshot_used is called with the time the snapshot was taken.
+    """
+    def __init__(self, offline=False, snapshot=None, api_url=CODEFORCES_API_URL, on_snapshot_used=None,
+                 site_url=CODEFORCES_URL):
+        self.offline = offline
+        self.snapshot = snapshot or get_snapshot()
+        self.api_url = api_url
+        self.site_url = site_url
+        self.on_snapshot_used = on_snapshot_used
+
+    def _get(self, url, params=None):
+        # requests is slow to import, so keep it off the startup path
+        import requests
+        try:
+            response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise NetworkError(str(e))
+        if response.status_code >= 500:
+            raise NetworkError(f"Codeforces API returned {response.status_code}")
+        return response
+
+    def _fetch_or_load(self, fetch, load):
+        """Fetch from the API, or fall back to the snapshot when offline or the API is down"""
+        if not self.offline:
+            try:
+                return fetch()
+            except NetworkError:
+                pass
+        data, fetched_at = load()
+        if self.on_snapshot_used is not None:
+            self.on_snapshot_used(fetched_at)
+        return data
+
+    def get_user_submissions(self, handle):
+        return self._fetch_or_load(
+            lambda: self.fetch_user_submissions(handle),
+            lambda: self.snapshot.load_submissions(handle)
+        )
+
+    def get_problems(self):
+        return self._fetch_or_load(self.fetch_catalog, self.snapshot.load_catalog)
+
+    def fetch_user_submissions(self, handle):
+        # The handle comes from users (and the service's query string), so
+        # let requests encode it rather than splicing it into the URL
+        response = self._get(f"{self.api_url}/user.status", params={'handle': handle})
+        if response.status_code != 200:
+            raise FinderError("Failed to fetch user submissions")
+        submissions = response.json()['result']
+        self.snapshot.save_submissions(handle, submissions)
+        return submissions
+
+    def fetch_problem_limits(self, contest_id, index):
+        """The problem's (time limit, memory limit), see parse_problem_limits"""
+        response = self._get(f"{self.site_url}/problemset/problem/{contest_id}/{index}")
+        if response.status_code != 200:
+            raise FinderError("Failed to fetch the problem page")
+        return parse_problem_limits(response.text)
+
+    def fetch_contests(self):
+        response = self._get(f"{self.api_url}/contest.list")
+        if response.status_code != 200:
+            raise FinderError("Failed to fetch contests")
+        return response.json()['result']
+
+    def fetch_catalog(self):
+        """Download the problem catalog and store it in the snapshot with the contest list"""
+        response = self._get(f"{self.api_url}/problemset.problems")
+        if response.status_code != 200:
+            raise FinderError("Failed to fetch unsolved problems")
+        problems = parse_problems(response.json()['result']['problems'])
+
+        contests = None
+        contests_fetched_at = self.snapshot.manifest().get('contests')
+        if contests_fetched_at is None or time.time() - contests_fetched_at > CONTESTS_MAX_AGE:
+            try:
+                contests, contests_fetched_at = self.fetch_contests(), None
+            except Exception:
+                pass
+        if contests is None:
+            # Keep whatever contest list the snapshot already had
+            try:
+                contests, contests_fetched_at = self.snapshot.load_contests()
+            except Exception:
+                contests, contests_fetched_at = [], None
+        self.snapshot.save_catalog(problems, contests, contests_fetched_at)
+        return problems
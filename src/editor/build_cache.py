@@ -0,0 +1,128 @@
+"""Compile once, run many.
+
+Built programs are kept in the cache directory, keyed by a hash of the
+language, the toolchain, the compiler flags and the source code. Running
+every test case, or running again after an edit that was undone, reuses the
+same binary or class files instead of invoking the compiler again.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+from src.utils import get_cache_dir, write_json_atomic
+from src.editor.run_code import COMPILE_FLAGS, build_program
+
+BUILD_DIR_NAME = 'builds'
+COMMAND_FILE = 'command.json'
+MAX_BUILDS = 32
+
+TOOLCHAINS = {
+    "python": "python",
+    "cpp": "g++",
+    "java": "javac",
+    "javascript": "node",
+}
+
+
+def toolchain_id(language):
+    """Identity of the compiler or interpreter, so upgrading it invalidates old builds"""
+    tool = TOOLCHAINS.get(language, language)
+    path = shutil.which(tool)
+    if path is None:
+        return tool
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def build_key(language, code, flags):
+    digest = hashlib.sha256()
+    for part in (language, toolchain_id(language), '\0'.join(flags), code):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0\0')
+    return digest.hexdigest()[:32]
+
+
+class BuildCache:
+    """Directory of built programs, one per build key, evicted least recently used first.
+
+    A build directory is complete once its command file exists; the command
+    file is written last and atomically, so a crash mid-build only leaves a
+    directory that is rebuilt on next use.
+    """
+    def __init__(self, directory=None, max_builds=MAX_BUILDS):
+        self.directory = directory or os.path.join(get_cache_dir(), BUILD_DIR_NAME)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_builds = max_builds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, language, code, flags=None):
+        """Return the command that runs code, building it first if it isn't cached"""
+        flags = list(COMPILE_FLAGS.get(language, []) if flags is None else flags)
+        key = build_key(language, code, flags)
+        build_dir = os.path.join(self.directory, key)
+        command_path = os.path.join(build_dir, COMMAND_FILE)
+
+        # Concurrent requests for the same build wait for a single compile
+        with self._key_lock(key):
+            try:
+                with open(command_path, 'r') as file:
+                    command = json.load(file)
+            except (OSError, ValueError):
+                command = None
+            if command is not None:
+                self.hits += 1
+                os.utime(build_dir)
+                return command
+
+            self.misses += 1
+            shutil.rmtree(build_dir, ignore_errors=True)
+            os.makedirs(build_dir)
+            try:
+                command = build_program(language, code, build_dir, flags)
+            except Exception:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                raise
+            write_json_atomic(command_path, command)
+        self._evict(keep=key)
+        return command
+
+    def _evict(self, keep):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    if name != keep and os.path.isdir(path):
+                        entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+            entries.sort()
+            for _, path in entries[:max(0, len(entries) + 1 - self.max_builds)]:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.directory):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+_build_cache = None
+_build_cache_lock = threading.Lock()
+
+
+def get_build_cache():
+    """Return the process-wide BuildCache"""
+    global _build_cache
+    with _build_cache_lock:
+        if _build_cache is None:
+            _build_cache = BuildCache()
+        return _build_cache
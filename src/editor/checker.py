@@ -0,0 +1,226 @@
+"""Compare a program's output with the expected answer.
+
+Outputs are scanned in one linear pass, a chunk at a time, so checking a
+multi-megabyte answer never builds a list of all its tokens or a stripped
+copy of the whole text. Both str and bytes-like inputs (bytes, mmap)
+work; the two sides must be of the same kind.
+"""
+import re
+from itertools import zip_longest
+
+MODE_EXACT = 'exact'
+MODE_LINES = 'lines'
+MODE_TOKENS = 'tokens'
+MODE_FLOAT = 'float'
+MODES = (MODE_TOKENS, MODE_LINES, MODE_EXACT, MODE_FLOAT)
+
+# Codeforces problems with real answers usually accept an error of 1e-6
+DEFAULT_EPS = 1e-6
+# Tokens longer than this are shortened in messages
+SHOWN_TOKEN_LENGTH = 40
+EXACT_CHUNK = 65536
+TOKEN_CHUNK = 65536
+
+_SPACE = re.compile(r'\s')
+_SPACE_BYTES = re.compile(rb'\s')
+_TOKEN = re.compile(r'\S+')
+_TOKEN_BYTES = re.compile(rb'\S+')
+_LINE = re.compile(r'[^\n]*\n|[^\n]+')
+_LINE_BYTES = re.compile(rb'[^\n]*\n|[^\n]+')
+_NUMBER = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+_NUMBER_BYTES = re.compile(rb'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+
+
+class CheckResult:
+    """passed, and where and how the output first differs when it didn't.
+
+    line is 1-based and refers to the program's output, or to the expected
+    output when the program's output ended too early.
+    """
+    def __init__(self, passed, message='', line=None):
+        self.passed = passed
+        self.message = message
+        self.line = line
+
+    def __bool__(self):
+        return self.passed
+
+    def __repr__(self):
+        return f"CheckResult({self.passed!r}, {self.message!r}, line={self.line!r})"
+
+
+def _is_bytes(data):
+    return not isinstance(data, str)
+
+
+def _show(token):
+    if not isinstance(token, str):
+        token = bytes(token).decode('utf-8', 'replace')
+    if len(token) > SHOWN_TOKEN_LENGTH:
+        token = token[:SHOWN_TOKEN_LENGTH] + '…'
+    return repr(token)
+
+
+def _line_at(data, position):
+    if isinstance(data, (str, bytes, bytearray)):
+        newline = b'\n' if _is_bytes(data) else '\n'
+        return data.count(newline, 0, position) + 1
+    # mmap has find() but no count()
+    line = 1
+    index = data.find(b'\n', 0, position)
+    while index != -1:
+        line += 1
+        index = data.find(b'\n', index + 1, position)
+    return line
+
+
+def _chunks(data):
+    """(start, end) of consecutive chunks of about TOKEN_CHUNK characters, cut between tokens"""
+    space = _SPACE_BYTES if _is_bytes(data) else _SPACE
+    position, length = 0, len(data)
+    while position < length:
+        end = position + TOKEN_CHUNK
+        if end < length:
+            match = space.search(data, end)
+            end = match.start() if match else length
+        yield position, end
+        position = end
+
+
+def _token_batches(data):
+    """Lists of consecutive tokens, one per chunk.
+
+    Splitting in chunks keeps the tokenizing in C while never holding more
+    than one chunk's tokens per side.
+    """
+    for start, end in _chunks(data):
+        batch = data[start:end].split()
+        if batch:
+            yield batch
+
+
+def _token_start(data, index):
+    """Offset of the index-th (0-based) token, only needed to report a failure"""
+    for start, end in _chunks(data):
+        count = len(data[start:end].split())
+        if index < count:
+            pattern = _TOKEN_BYTES if _is_bytes(data) else _TOKEN
+            for match in pattern.finditer(data, start, end):
+                if index == 0:
+                    return match.start()
+                index -= 1
+        index -= count
+    return len(data)
+
+
+def _numbers_match(actual, expected, abs_eps, rel_eps):
+    if actual == expected:
+        return True
+    number = _NUMBER_BYTES if _is_bytes(expected) else _NUMBER
+    if not number.fullmatch(expected) or not number.fullmatch(actual):
+        return False
+    a, b = float(actual), float(expected)
+    difference = abs(a - b)
+    return difference <= abs_eps or difference <= rel_eps * abs(b)
+
+
+def _check_tokens(actual, expected, same=None):
+    """Token by token comparison; same(actual, expected) decides equality when given"""
+    actual_batches, expected_batches = _token_batches(actual), _token_batches(expected)
+    found, wanted = [], []
+    i = j = 0
+    count = 0
+    while True:
+        if i == len(found):
+            found, i = next(actual_batches, None), 0
+        if j == len(wanted):
+            wanted, j = next(expected_batches, None), 0
+        if found is None or wanted is None:
+            break
+        n = min(len(found) - i, len(wanted) - j)
+        if found[i:i + n] != wanted[j:j + n]:
+            for k in range(n):
+                if found[i + k] != wanted[j + k] and (same is None or not same(found[i + k], wanted[j + k])):
+                    index = count + k
+                    line = _line_at(actual, _token_start(actual, index))
+                    return CheckResult(False, f"Line {line}, token {index + 1}: expected "
+                                              f"{_show(wanted[j + k])}, found {_show(found[i + k])}", line)
+        count += n
+        i += n
+        j += n
+    if found is None and wanted is None:
+        return CheckResult(True)
+    if found is None:
+        return CheckResult(False, f"Output ended early: expected {_show(wanted[j])} as token {count + 1}",
+                           _line_at(expected, _token_start(expected, count)))
+    return CheckResult(False, f"Extra output at token {count + 1}: {_show(found[i])}",
+                       _line_at(actual, _token_start(actual, count)))
+
+
+def _check_lines(actual, expected):
+    """Lines must match up to trailing whitespace; trailing blank lines are ignored"""
+    pattern = _LINE_BYTES if _is_bytes(actual) else _LINE
+    actual_lines = pattern.finditer(actual)
+    expected_lines = pattern.finditer(expected)
+    line = 0
+    for line, (found, wanted) in enumerate(zip_longest(actual_lines, expected_lines), 1):
+        found_text = found.group().rstrip() if found is not None else None
+        wanted_text = wanted.group().rstrip() if wanted is not None else None
+        if found_text == wanted_text:
+            continue
+        if wanted_text is None or found_text is None:
+            # Past the end of one side only blank lines may follow on the other
+            rest = found if wanted_text is None else wanted
+            remaining = actual if wanted_text is None else expected
+            if not remaining[rest.start():].strip():
+                return CheckResult(True)
+            if wanted_text is None:
+                return CheckResult(False, f"Extra output at line {line}: {_show(found_text)}", line)
+            return CheckResult(False, f"Output ended early: expected line {line}: {_show(wanted_text)}", line)
+        return CheckResult(False, f"Line {line}: expected {_show(wanted_text)}, found {_show(found_text)}", line)
+    return CheckResult(True)
+
+
+def _check_exact(actual, expected):
+    # Compare a chunk at a time (an mmap never equals bytes as a whole), then
+    # find the character inside the first differing chunk
+    length = min(len(actual), len(expected))
+    position = None
+    for start in range(0, length, EXACT_CHUNK):
+        end = min(start + EXACT_CHUNK, length)
+        if actual[start:end] != expected[start:end]:
+            position = next(i for i in range(start, end) if actual[i] != expected[i])
+            break
+    if position is None:
+        if len(actual) == len(expected):
+            return CheckResult(True)
+        line = _line_at(actual, length)
+        if len(actual) < len(expected):
+            return CheckResult(False, f"Output ended early at character {length + 1}", line)
+        return CheckResult(False, f"Extra output at character {length + 1}", line)
+    line = _line_at(actual, position)
+    return CheckResult(False, f"Line {line}, character {position + 1}: expected "
+                              f"{_show(expected[position:position + 1])}, "
+                              f"found {_show(actual[position:position + 1])}", line)
+
+
+def check(actual, expected, mode=MODE_TOKENS, abs_eps=DEFAULT_EPS, rel_eps=DEFAULT_EPS):
+    """Compare actual with expected output in the given mode.
+
+    tokens: whitespace-separated tokens must be equal.
+    lines: lines must be equal up to trailing whitespace.
+    exact: the outputs must be identical.
+    float: like tokens, but a numeric expected token accepts any number
+    within abs_eps or rel_eps (relative to the expected value).
+    """
+    if _is_bytes(actual) != _is_bytes(expected):
+        raise TypeError("actual and expected output must both be str or both be bytes")
+    if mode == MODE_TOKENS:
+        return _check_tokens(actual, expected)
+    if mode == MODE_FLOAT:
+        return _check_tokens(actual, expected, lambda a, b: _numbers_match(a, b, abs_eps, rel_eps))
+    if mode == MODE_LINES:
+        return _check_lines(actual, expected)
+    if mode == MODE_EXACT:
+        return _check_exact(actual, expected)
+    raise ValueError(f"Unknown checker mode {mode}")
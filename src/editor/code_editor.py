@@ -1,104 +1,41 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QPushButton, QPlainTextEdit, QComboBox, 
-                           QScrollArea, QFrame, QSplitter)
+                           QPushButton, QComboBox, QSpinBox, QDoubleSpinBox,
+                           QScrollArea, QSplitter, QCheckBox)
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl, Qt
 from PyQt5.QtWebChannel import QWebChannel
 import os
-import tempfile
-import shutil
-from src.editor.run_code import (run_cpp, run_java, run_javascript, run_python)
+import json
+from functools import partial
+from src.editor.checker import check, MODE_TOKENS, MODE_LINES, MODE_EXACT, MODE_FLOAT
+from src.codeforces_api import CodeforcesClient
+from src.editor.run_code import Limits, DEFAULT_OUTPUT_LIMIT
+from src.editor.run_task import RunTestsTask
+from src.editor.testcase_widget import TestCaseWidget, format_duration, format_memory
+from src.task_pool import FunctionTask, get_task_pool
 
-class TestCaseWidget(QWidget):
-    def __init__(self, input_data, expected_output, index, parent=None):
-        super().__init__(parent)
-        self.index = index
-        self.initUI(input_data, expected_output)
-        
-    def initUI(self, input_data, expected_output):
-        layout = QVBoxLayout()
-        
-        # Header with test case number
-        header = QLabel(f"Test Case #{self.index + 1}")
-        header.setStyleSheet("font-weight: bold; font-size: 14px;")
-        layout.addWidget(header)
-        
-        # Input section
-        input_label = QLabel("Input:")
-        input_label.setStyleSheet("font-weight: bold;")
-        self.input_text = QPlainTextEdit()
-        self.input_text.setPlainText(input_data)
-        self.input_text.setMaximumHeight(80)
-        layout.addWidget(input_label)
-        layout.addWidget(self.input_text)
-        
-        # Expected output section
-        expected_label = QLabel("Expected Output:")
-        expected_label.setStyleSheet("font-weight: bold;")
-        self.expected_text = QPlainTextEdit()
-        self.expected_text.setPlainText(expected_output)
-        self.expected_text.setMaximumHeight(80)
-        layout.addWidget(expected_label)
-        layout.addWidget(self.expected_text)
-        
-        # Actual output section
-        actual_label = QLabel("Actual Output:")
-        actual_label.setStyleSheet("font-weight: bold;")
-        self.actual_text = QPlainTextEdit()
-        self.actual_text.setReadOnly(True)
-        self.actual_text.setMaximumHeight(80)
-        layout.addWidget(actual_label)
-        layout.addWidget(self.actual_text)
-        
-        # Result label
-        self.result_label = QLabel()
-        self.result_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.result_label)
-        
-        # Add some spacing and a separator line
-        line = QFrame()
-        line.setFrameShape(QFrame.HLine)
-        line.setFrameShadow(QFrame.Sunken)
-        layout.addWidget(line)
-        
-        self.setLayout(layout)
-    
-    def update_result(self, actual_output, passed):
-        self.actual_text.setPlainText(actual_output)
-        if passed:
-            self.result_label.setText("✓ PASSED")
-            self.result_label.setStyleSheet("""
-                QLabel {
-                    color: #4CAF50;
-                    font-weight: bold;
-                    font-size: 14px;
-                    padding: 5px;
-                }
-            """)
-        else:
-            self.result_label.setText("✗ FAILED")
-            self.result_label.setStyleSheet("""
-                QLabel {
-                    color: #f44336;
-                    font-weight: bold;
-                    font-size: 14px;
-                    padding: 5px;
-                }
-            """)
+# How outputs are compared with the expected ones: (label, mode, float tolerance)
+CHECKERS = [
+    ("Tokens", MODE_TOKENS, None),
+    ("Lines", MODE_LINES, None),
+    ("Exact", MODE_EXACT, None),
+    ("Floats (1e-6)", MODE_FLOAT, 1e-6),
+    ("Floats (1e-9)", MODE_FLOAT, 1e-9),
+]
 
 class CodeEditor(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_code = ""
         self.current_language = "python"
-        self.language_commands = {
-            "python": ["python", []],
-            "cpp": ["g++", ["-o"]],
-            "java": ["javac", []],
-            "javascript": ["node", []]
-        }
-        self.test_cases = []
         self.test_case_widgets = []
+        self.page_loaded = False
+        self.pending_scripts = []
+        self.run_task = None
+        self.running_widgets = []
+        # (contest id, index) of the problem whose limits are being looked up
+        self.problem = None
+        self.stress_dialog = None
         self.initUI()
         
     def initUI(self):
@@ -117,8 +54,41 @@ class CodeEditor(QWidget):
         lang_layout.addWidget(self.lang_label)
         lang_layout.addWidget(self.lang_selector)
         lang_layout.addStretch()
+        # Keeps each running test on a core of its own for steadier timings
+        self.pin_cpus_checkbox = QCheckBox("Pin tests to CPU cores")
+        lang_layout.addWidget(self.pin_cpus_checkbox)
         editor_layout.addLayout(lang_layout)
         
+        # Per-test limits, set from the problem's statement when it is known
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("Time limit:"))
+        self.time_limit_input = QDoubleSpinBox()
+        self.time_limit_input.setRange(0.5, 30)
+        self.time_limit_input.setSingleStep(0.5)
+        self.time_limit_input.setSuffix(" s")
+        limits_layout.addWidget(self.time_limit_input)
+        limits_layout.addWidget(QLabel("Memory limit:"))
+        self.memory_limit_input = QSpinBox()
+        self.memory_limit_input.setRange(16, 4096)
+        self.memory_limit_input.setSuffix(" MB")
+        limits_layout.addWidget(self.memory_limit_input)
+        limits_layout.addWidget(QLabel("Output limit:"))
+        self.output_limit_input = QSpinBox()
+        self.output_limit_input.setRange(1, 1024)
+        self.output_limit_input.setSuffix(" MB")
+        self.output_limit_input.setValue(DEFAULT_OUTPUT_LIMIT >> 20)
+        limits_layout.addWidget(self.output_limit_input)
+        limits_layout.addWidget(QLabel("Checker:"))
+        self.checker_selector = QComboBox()
+        self.checker_selector.addItems([label for label, _, _ in CHECKERS])
+        limits_layout.addWidget(self.checker_selector)
+        self.limits_source_label = QLabel()
+        self.limits_source_label.setStyleSheet("color: gray;")
+        limits_layout.addWidget(self.limits_source_label)
+        limits_layout.addStretch()
+        editor_layout.addLayout(limits_layout)
+        self.set_limits(Limits(), "Default limits")
+        
         # Monaco Editor
         self.web_view = QWebEngineView()
         self.channel = QWebChannel(self)
@@ -126,6 +96,7 @@ class CodeEditor(QWidget):
         self.web_view.page().setWebChannel(self.channel)
         
         html_path = os.path.join(os.path.dirname(__file__), 'editor.html')
+        self.web_view.loadFinished.connect(self.on_page_loaded)
         self.web_view.setUrl(QUrl.fromLocalFile(html_path))
         editor_layout.addWidget(self.web_view)
         
@@ -147,11 +118,22 @@ class CodeEditor(QWidget):
         """)
         editor_layout.addWidget(self.run_button)
         
+        # Stop Button, shown while tests run
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.clicked.connect(self.stop_run)
+        self.stop_button.setVisible(False)
+        editor_layout.addWidget(self.stop_button)
+        
         # Add Test Case Button
         self.add_test_case_button = QPushButton("Add Test Case")
-        self.add_test_case_button.clicked.connect(self.add_test_case)
+        self.add_test_case_button.clicked.connect(lambda: self.add_test_case())
         editor_layout.addWidget(self.add_test_case_button)
         
+        # Stress Test Button
+        self.stress_test_button = QPushButton("Stress Test...")
+        self.stress_test_button.clicked.connect(self.open_stress_dialog)
+        editor_layout.addWidget(self.stress_test_button)
+        
         editor_widget.setLayout(editor_layout)
         
         # Right side: Test cases section
@@ -167,6 +149,11 @@ class CodeEditor(QWidget):
         """)
         test_cases_layout.addWidget(test_cases_header)
         
+        # Totals over the tests of the last run
+        self.totals_label = QLabel()
+        self.totals_label.setStyleSheet("color: gray; padding: 0 10px;")
+        test_cases_layout.addWidget(self.totals_label)
+        
         # Scrollable area for test cases
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -193,13 +180,10 @@ class CodeEditor(QWidget):
         layout.addWidget(splitter)
         self.setLayout(layout)
 
-    def add_test_case(self):
-        input_data = ""
-        expected_output = ""
-        self.test_cases.append((input_data, expected_output))
-        
+    def add_test_case(self, input_data="", expected_output="", input_path=None):
         # Create a new test case widget
-        test_case_widget = TestCaseWidget(input_data, expected_output, len(self.test_cases) - 1)
+        test_case_widget = TestCaseWidget(input_data, expected_output, len(self.test_case_widgets),
+                                          input_path=input_path)
         self.test_case_widgets.append(test_case_widget)
         self.test_cases_container_layout.insertWidget(
             self.test_cases_container_layout.count() - 1,  # Insert before stretch
@@ -207,37 +191,169 @@ class CodeEditor(QWidget):
         )
     
     def _handle_code_and_run(self, code):
-        try:
-            results = []
-            for i, (input_data, expected_output) in enumerate(self.test_cases):
-                output = self.run_code_with_language(code, input_data)
-                passed = output.strip() == expected_output.strip()
-                self.test_case_widgets[i].update_result(output, passed)
-        except Exception as e:
-            # Show error in all test cases
-            for widget in self.test_case_widgets:
-                widget.update_result(f"Error: {str(e)}", False)
+        if self.run_task is not None or not self.test_case_widgets:
+            return
+        # Widgets are captured now so results land in the right place even if
+        # test cases are added while the run is in progress
+        self.running_widgets = list(self.test_case_widgets)
+        for widget in self.running_widgets:
+            widget.set_status("Compiling...")
+        self.totals_label.setText("")
+        self.set_running(True)
+
+        task = RunTestsTask(
+            self.current_language,
+            code,
+            [widget.input_source() for widget in self.running_widgets],
+            pin_cpus=self.pin_cpus_checkbox.isChecked(),
+            limits=self.limits(),
+            expected=[widget.expected_text.toPlainText() for widget in self.running_widgets],
+            checker=self.checker()
+        )
+        task.compiled.connect(lambda: self.on_compiled(task))
+        task.test_started.connect(lambda index: self.on_test_started(task, index))
+        task.test_finished.connect(lambda index, result: self.on_test_finished(task, index, result))
+        task.finished.connect(lambda outputs: self.on_run_finished(task))
+        task.error.connect(lambda message: self.on_run_error(task, message))
+        self.run_task = task
+        get_task_pool().submit(task)
+    
+    def limits(self):
+        return Limits(self.time_limit_input.value(), self.memory_limit_input.value() << 20,
+                      self.output_limit_input.value() << 20)
+    
+    def checker(self):
+        _, mode, eps = CHECKERS[self.checker_selector.currentIndex()]
+        if eps is None:
+            return partial(check, mode=mode)
+        return partial(check, mode=mode, abs_eps=eps, rel_eps=eps)
+    
+    def set_limits(self, limits, source):
+        self.time_limit_input.setValue(limits.time_limit)
+        self.memory_limit_input.setValue(limits.memory_limit >> 20)
+        self.limits_source_label.setText(source)
+    
+    def set_problem(self, contest_id, index):
+        """Use the problem's stated limits, looked up in the background; defaults until then"""
+        self.problem = (contest_id, index)
+        self.set_limits(Limits(), "Default limits")
+        if contest_id is None:
+            return
+        self.limits_source_label.setText("Looking up limits...")
+        task = FunctionTask(CodeforcesClient().fetch_problem_limits, contest_id, index)
+        task.finished.connect(lambda limits: self.on_problem_limits((contest_id, index), limits))
+        task.error.connect(lambda message: self.on_problem_limits((contest_id, index), None))
+        get_task_pool().submit(task)
+    
+    def on_problem_limits(self, problem, limits):
+        # Ignore lookups for a problem that is no longer open
+        if problem != self.problem:
+            return
+        if limits is None:
+            self.limits_source_label.setText("Default limits (problem page unavailable)")
+        else:
+            self.set_limits(Limits(*limits), f"Limits of problem {problem[0]}{problem[1]}")
+    
+    def set_running(self, running):
+        self.run_button.setEnabled(not running)
+        self.stop_button.setVisible(running)
+    
+    def stop_run(self):
+        if self.run_task is None:
+            return
+        self.run_task.cancel()
+        self.run_task = None
+        self.set_running(False)
+        for widget in self.running_widgets:
+            if not widget.has_result:
+                widget.set_status("Stopped")
+    
+    def on_compiled(self, task):
+        if task is self.run_task:
+            for widget in self.running_widgets:
+                widget.set_status("Queued")
+    
+    def on_test_started(self, task, index):
+        if task is self.run_task:
+            self.running_widgets[index].set_status("Running...")
+    
+    def on_test_finished(self, task, index, result):
+        # Signals may already be queued when the run gets stopped
+        if task is not self.run_task:
+            return
+        widget = self.running_widgets[index]
+        # RunTestsTask checked the output against the expected one captured at start
+        widget.update_result(result.stdout, result.check is not None and result.check.passed, result)
+        self.update_totals()
+    
+    def update_totals(self):
+        """Sum the finished tests' metrics and highlight the slowest one"""
+        finished = [widget for widget in self.running_widgets if widget.result is not None]
+        if not finished:
+            self.totals_label.setText("")
+            return
+        slowest = max(finished, key=lambda widget: widget.result.wall_time)
+        for widget in finished:
+            widget.set_slowest(widget is slowest and len(finished) > 1)
+        cpu_times = [widget.result.cpu_time for widget in finished]
+        total_cpu = None if None in cpu_times else sum(cpu_times)
+        self.totals_label.setText(
+            f"{len(finished)} tests · Time {format_duration(sum(w.result.wall_time for w in finished))}"
+            f" · CPU {format_duration(total_cpu)}"
+            f" · Peak memory {format_memory(max(finished, key=lambda w: w.result.peak_rss or 0).result)}"
+            f" · Slowest #{slowest.index + 1}"
+        )
+    
+    def on_run_finished(self, task):
+        if task is self.run_task:
+            self.run_task = None
+            self.set_running(False)
+    
+    def on_run_error(self, task, message):
+        if task is not self.run_task:
+            return
+        self.run_task = None
+        self.set_running(False)
+        # Compilation errors are shown as they are, anything else as an error
+        if not message.startswith(("Compilation Error", "Error:")):
+            message = f"Error: {message}"
+        for widget in self.running_widgets:
+            widget.update_result(message, False)
+    
+    def on_page_loaded(self, ok):
+        self.page_loaded = True
+        for script in self.pending_scripts:
+            self.web_view.page().runJavaScript(script)
+        self.pending_scripts = []
+    
+    def run_editor_script(self, script):
+        """Run script against Monaco, waiting for the page and the editor to exist."""
+        script = f"""(function apply() {{
+            if (window.editor) {{ {script} }} else {{ setTimeout(apply, 100); }}
+        }})();"""
+        if self.page_loaded:
+            self.web_view.page().runJavaScript(script)
+        else:
+            self.pending_scripts.append(script)
+    
+    def set_code(self, code):
+        self.run_editor_script(f"editor.setValue({json.dumps(code)});")
     
     def change_language(self, language):
         self.current_language = language
         self.web_view.page().runJavaScript(f"window.changeLanguage('{language}');")
     
+    def with_code(self, callback):
+        """Call callback with the editor's current code"""
+        self.web_view.page().runJavaScript("editor.getValue();", callback)
+    
     def run_code(self):
-        self.web_view.page().runJavaScript(
-            "editor.getValue();",
-            self._handle_code_and_run
-        )
+        self.with_code(self._handle_code_and_run)
     
-    def run_code_with_language(self, code, input_data):
-        temp_dir = tempfile.mkdtemp()
-        try:
-            if self.current_language == "python":
-                return run_python(code, input_data, temp_dir)
-            elif self.current_language == "cpp":
-                return run_cpp(code, input_data, temp_dir)
-            elif self.current_language == "java":
-                return run_java(code, input_data, temp_dir)
-            elif self.current_language == "javascript":
-                return run_javascript(code, input_data, temp_dir)
-        finally:
-            shutil.rmtree(temp_dir)
+    def open_stress_dialog(self):
+        if self.stress_dialog is None:
+            # Imported on first use, like the editor tab itself
+            from src.editor.stress_dialog import StressDialog
+            self.stress_dialog = StressDialog(self, self)
+        self.stress_dialog.show()
+        self.stress_dialog.raise_()
@@ -0,0 +1,226 @@
+"""Pool of warm workers that run each test in a freshly forked child.
+
+Starting an interpreter for every test costs tens of milliseconds; forking
+an already running one costs about one. Each worker (python_worker.py) is
+started once with the interpreter that runs solutions and handles one test
+at a time, so the pool is sized like the test runner. Other languages are
+exec'd from a forked child of the same small worker, which keeps their
+rusage free of the app's own memory. Each worker keeps a Workspace (on
+tmpfs where there is one) that its tests run in and write their output to.
+
+Only available where fork() and file descriptor passing exist; elsewhere
+run_program falls back to starting processes directly.
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import select
+import signal
+import socket
+import threading
+import subprocess
+from src.editor.workspace import Workspace, remove_stale_workspaces
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python_worker.py')
+PYTHON_COMMAND = 'python'
+
+
+class WorkerError(Exception):
+    """The worker died or broke protocol; the test can be retried without it."""
+
+
+def fork_server_supported():
+    return hasattr(os, 'fork') and hasattr(socket, 'send_fds') and sys.platform != 'win32'
+
+
+class ForkedProcess:
+    """Handle to a test running in a forked child, for ParallelRunner.stop().
+
+    Once the worker has reaped the child its pid may belong to another
+    process, so kill() does nothing after mark_reaped().
+    """
+    def __init__(self, pid):
+        self.pid = pid
+        self.reaped = False
+        self._lock = threading.Lock()
+
+    def mark_reaped(self):
+        with self._lock:
+            self.reaped = True
+
+    def kill(self):
+        with self._lock:
+            if not self.reaped:
+                self._kill()
+
+    def _kill(self):
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except OSError:
+            # The child hasn't called setsid() yet, so its group doesn't exist
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+class PythonWorker:
+    def __init__(self, python=PYTHON_COMMAND):
+        self.sock, child_sock = socket.socketpair()
+        try:
+            self.process = subprocess.Popen(
+                [python, WORKER_PATH, str(child_sock.fileno())],
+                pass_fds=[child_sock.fileno()],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        finally:
+            child_sock.close()
+        try:
+            self.workspace = Workspace()
+        except BaseException:
+            self.process.kill()
+            self.process.wait()
+            self.sock.close()
+            raise
+        self.buffer = b''
+
+    def _read_message(self, timeout=None):
+        while b'\n' not in self.buffer:
+            if timeout is not None:
+                ready, _, _ = select.select([self.sock], [], [], timeout)
+                if not ready:
+                    return None
+            data = self.sock.recv(65536)
+            if not data:
+                raise WorkerError("Worker exited")
+            self.buffer += data
+        line, self.buffer = self.buffer.split(b'\n', 1)
+        return json.loads(line)
+
+    def run(self, request, stdin, stdout, stderr, timeout, cpu=None, on_start=None):
+        """Run request with the given open files as its standard streams.
+
+        request is {'script': path, 'args': [...]} to run a Python script in
+        the forked child or {'argv': command} to exec a command. The child
+        runs in the worker's workspace directory. Returns (exit message,
+        timed_out); the exit message carries the wait status, wall time and
+        the child's rusage.
+        """
+        request = json.dumps(dict(request, cpu=cpu, cwd=self.workspace.path)).encode('utf-8') + b'\n'
+        try:
+            socket.send_fds(self.sock, [request], [stdin.fileno(), stdout.fileno(), stderr.fileno()])
+            pid = self._read_message()['pid']
+        except (OSError, ValueError, KeyError) as e:
+            raise WorkerError(str(e))
+        process = ForkedProcess(pid)
+        if on_start is not None:
+            on_start(process)
+        result = self._read_message(timeout)
+        timed_out = result is None
+        if timed_out:
+            process.kill()
+            result = self._read_message()
+        # The worker sends the exit message right after wait4 returns
+        process.mark_reaped()
+        return result, timed_out
+
+    def close(self):
+        self.sock.close()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.workspace.close()
+
+
+class ForkServerPool:
+    """Up to size warm workers; each test borrows one for its duration"""
+    def __init__(self, size=None, python=PYTHON_COMMAND):
+        self.size = size or os.cpu_count() or 1
+        self.python = python
+        self.idle = queue.LifoQueue()
+        self.started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            start = self.started < self.size
+            if start:
+                self.started += 1
+        if not start:
+            return self.idle.get()
+        try:
+            return PythonWorker(self.python)
+        except BaseException as e:
+            # Give the slot back, or enough failed starts would leave every
+            # later caller waiting for an idle worker that never comes
+            with self._lock:
+                self.started -= 1
+            if isinstance(e, OSError):
+                raise WorkerError(f"Can't start worker: {e}") from e
+            raise
+
+    def _discard(self, worker):
+        worker.close()
+        with self._lock:
+            self.started -= 1
+
+    def run(self, request, input_data, timeout, cpu=None, on_start=None, output_limit=None):
+        """Run request (see PythonWorker.run) on input_data; returns (stdout, stderr, exit message, timed_out).
+
+        input_data is text or the path of a file, which becomes the child's
+        stdin as is. At most output_limit bytes of each stream are read back;
+        the exit message's output_size is the larger of the two as written.
+        """
+        input_file = None if isinstance(input_data, str) else open(input_data, 'rb')
+        try:
+            worker = self._acquire()
+            try:
+                workspace = worker.workspace
+                workspace.reset()
+                stdin = input_file or workspace.write_input(input_data)
+                result, timed_out = worker.run(request, stdin, workspace.stdout, workspace.stderr,
+                                               timeout, cpu, on_start)
+                result['output_size'] = workspace.output_size()
+                stdout, stderr = workspace.read_outputs(output_limit)
+            except BaseException:
+                self._discard(worker)
+                raise
+        finally:
+            if input_file is not None:
+                input_file.close()
+        self.idle.put(worker)
+        return stdout, stderr, result, timed_out
+
+    def close(self):
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_fork_server_pool():
+    """Return the process-wide ForkServerPool, starting workers on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Workspaces an earlier, crashed run left in RAM
+            remove_stale_workspaces()
+            _pool = ForkServerPool()
+            atexit.register(_pool.close)
+        return _pool
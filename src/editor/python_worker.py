@@ -0,0 +1,160 @@
+"""Fork server for test runs, started by src/editor/fork_server.py.
+
+The worker starts once, imports the modules solutions commonly use, and then
+forks a fresh child for every test. The child gets the test's stdin, stdout
+and stderr as file descriptors passed over the control socket, so tests never
+share interpreter state with each other or with the worker. A child either
+runs a Python script in place or execs a command.
+
+Because tests are children of this small process rather than of the app,
+their rusage isn't inflated by the app's memory. A child's peak RSS still
+starts from what it inherits at fork, so the worker's RSS at fork time is
+reported alongside it as the floor.
+
+Only the standard library may be imported here: the worker runs under the
+interpreter that runs solutions, not the app's.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import resource
+import builtins
+import traceback
+
+# Warm imports: forked children inherit them for free
+import math, collections, itertools, functools, heapq, bisect, re, string, random, array  # noqa: E401,F401
+import decimal, fractions, operator, copy, io  # noqa: E401,F401
+
+MAX_MESSAGE = 65536
+
+
+def receive(sock):
+    """Read one newline terminated request and the file descriptors sent with it"""
+    data, fds, _, _ = socket.recv_fds(sock, MAX_MESSAGE, 3)
+    while data and not data.endswith(b'\n'):
+        more = sock.recv(MAX_MESSAGE)
+        if not more:
+            break
+        data += more
+    return data, fds
+
+
+def send(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def current_rss():
+    """This process's resident memory now, in ru_maxrss units.
+
+    A forked child's peak starts from the parent's current RSS, not from
+    the parent's own peak (which for this worker even includes the app it
+    was spawned from).
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as file:
+            resident_pages = int(file.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(request, fds):
+    # Own session, so the parent can kill the test and anything it spawns
+    os.setsid()
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if request.get('cwd'):
+        os.chdir(request['cwd'])
+    cpu = request.get('cpu')
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu})
+    # Limits apply from here on and carry over exec
+    for name, (soft, hard) in request.get('rlimits', {}).items():
+        which = getattr(resource, name)
+        _, current = resource.getrlimit(which)
+        if current != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current), min(hard, current)
+        resource.setrlimit(which, (soft, hard))
+
+    if 'argv' in request:
+        # Python ignores these; restore the defaults for the program, as Popen does
+        for name in ('SIGPIPE', 'SIGXFSZ'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), signal.SIG_DFL)
+        try:
+            os.execvp(request['argv'][0], request['argv'])
+        except OSError as e:
+            os.write(2, f"Error: {e}\n".encode('utf-8'))
+        os._exit(127)
+
+    script = request['script']
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', closefd=False)
+    sys.stderr = open(2, 'w', closefd=False)
+    sys.argv = [script, *request.get('args', [])]
+    sys.path[0] = os.path.dirname(script)
+
+    code = 0
+    try:
+        with open(script, 'r') as file:
+            source = file.read()
+        namespace = {'__name__': '__main__', '__file__': script, '__builtins__': builtins}
+        exec(compile(source, script, 'exec'), namespace)
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Skip this frame so the traceback looks like `python script.py`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        code = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code & 0xff)
+
+
+def serve(sock):
+    while True:
+        data, fds = receive(sock)
+        if not data:
+            return
+        request = json.loads(data)
+        floor = current_rss()
+        begin = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                sock.close()
+                run_child(request, fds)
+            finally:
+                # Never return to the serve loop from a child
+                os._exit(127)
+        for fd in fds:
+            os.close(fd)
+        send(sock, {'pid': pid})
+        _, status, rusage = os.wait4(pid, 0)
+        send(sock, {
+            'status': status,
+            'wall': time.perf_counter() - begin,
+            'floor': floor,
+            'utime': rusage.ru_utime,
+            'stime': rusage.ru_stime,
+            'maxrss': rusage.ru_maxrss,
+        })
+
+
+if __name__ == '__main__':
+    serve(socket.socket(fileno=int(sys.argv[1])))
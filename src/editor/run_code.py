@@ -1,100 +1,500 @@
 import os
+import re
+import sys
+import math
+import time
+import signal
+import threading
 import subprocess
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
-def run_python(code, input_data, temp_dir):
-    file_path = os.path.join(temp_dir, 'script.py')
-    with open(file_path, 'w') as f:
-        f.write(code)
-    
-    try:
-        process = subprocess.run(
-            ['python', file_path],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return process.stderr if process.stderr else process.stdout
-    except subprocess.TimeoutExpired:
-        return "Error: Program execution timed out (5 seconds)"
+# Codeforces' most common limits, used until a problem's own are known
+DEFAULT_TIME_LIMIT = 2.0
+DEFAULT_MEMORY_LIMIT = 256 << 20
+# Output kept per stream; a program printing more is stopped
+DEFAULT_OUTPUT_LIMIT = 16 << 20
+READ_CHUNK = 65536
+# Start tests from the warm worker pool in fork_server.py
+USE_FORK_SERVER = True
 
-def run_cpp(code, input_data, temp_dir):
-    source_path = os.path.join(temp_dir, 'program.cpp')
-    exe_path = os.path.join(temp_dir, 'program')
-    
-    with open(source_path, 'w') as f:
-        f.write(code)
-    
-    try:
-        # Compile
+# Compiler flags per language; they are part of the build cache key
+COMPILE_FLAGS = {
+    "cpp": [],
+    "java": [],
+}
+
+
+VERDICT_OK = 'OK'
+VERDICT_TLE = 'TLE'
+VERDICT_MLE = 'MLE'
+VERDICT_RE = 'RE'
+VERDICT_OLE = 'OLE'
+VERDICT_NAMES = {
+    VERDICT_OK: "OK",
+    VERDICT_TLE: "Time Limit Exceeded",
+    VERDICT_MLE: "Memory Limit Exceeded",
+    VERDICT_RE: "Runtime Error",
+    VERDICT_OLE: "Output Limit Exceeded",
+}
+
+# What runtimes print when an allocation fails under the memory limit
+OUT_OF_MEMORY_MARKERS = ("MemoryError", "std::bad_alloc", "java.lang.OutOfMemoryError",
+                         "JavaScript heap out of memory")
+
+
+class Limits:
+    """Time, memory and output limits for one test.
+
+    time_limit is CPU time in seconds and memory_limit is in bytes. Both are
+    enforced in the child with rlimits; a wall clock timeout catches programs
+    that block without using CPU. output_limit caps the bytes captured from
+    each of stdout and stderr.
+    """
+    def __init__(self, time_limit=DEFAULT_TIME_LIMIT, memory_limit=DEFAULT_MEMORY_LIMIT,
+                 output_limit=DEFAULT_OUTPUT_LIMIT):
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.output_limit = output_limit
+
+    @property
+    def wall_timeout(self):
+        return 2 * self.time_limit + 1
+
+    def rlimits(self, command):
+        """{'RLIMIT_...': [soft, hard]} for the child running command.
+
+        The CPU limit is rounded up to whole seconds, the rlimit's
+        granularity; SIGXCPU at the soft limit ends the program. The JVM and
+        V8 reserve far more address space than they use, so for them the
+        memory limit is a heap size flag (see limit_command) rather than
+        RLIMIT_AS.
+        """
+        cpu_seconds = max(1, math.ceil(self.time_limit))
+        rlimits = {'RLIMIT_CPU': [cpu_seconds, cpu_seconds + 1]}
+        if os.path.basename(command[0]) not in ('java', 'node'):
+            rlimits['RLIMIT_AS'] = [self.memory_limit, self.memory_limit]
+        return rlimits
+
+    def _key(self):
+        return self.time_limit, self.memory_limit, self.output_limit
+
+    def __eq__(self, other):
+        return isinstance(other, Limits) and self._key() == other._key()
+
+    def __repr__(self):
+        return (f"Limits(time_limit={self.time_limit!r}, memory_limit={self.memory_limit!r}, "
+                f"output_limit={self.output_limit!r})")
+
+
+def limit_command(command, limits):
+    """command with the memory limit passed to runtimes that manage their own heap"""
+    megabytes = max(1, limits.memory_limit >> 20)
+    name = os.path.basename(command[0])
+    if name == 'java':
+        return [command[0], f'-Xmx{megabytes}m', *command[1:]]
+    if name == 'node':
+        return [command[0], f'--max-old-space-size={megabytes}', *command[1:]]
+    return command
+
+
+def set_rlimits(rlimits):
+    """Apply rlimits to this process, never above the hard limits it already has"""
+    for name, (soft, hard) in rlimits.items():
+        which = getattr(resource, name)
+        _, current = resource.getrlimit(which)
+        if current != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current), min(hard, current)
+        resource.setrlimit(which, (soft, hard))
+
+
+class CompilationError(Exception):
+    """The message is shown to the user as is, in place of the program output."""
+
+
+def java_class_name(code):
+    class_match = re.search(r'public\s+class\s+(\w+)', code)
+    if not class_match:
+        raise CompilationError("Error: No public class found in Java code")
+    return class_match.group(1)
+
+
+def build_program(language, code, build_dir, flags=None):
+    """Write code into build_dir and compile it if needed.
+
+    Returns the command that runs the program. Raises CompilationError when
+    the compiler rejects the code.
+    """
+    flags = COMPILE_FLAGS.get(language, []) if flags is None else flags
+    if language == "python":
+        file_path = os.path.join(build_dir, 'script.py')
+        with open(file_path, 'w') as f:
+            f.write(code)
+        return ['python', file_path]
+
+    if language == "cpp":
+        source_path = os.path.join(build_dir, 'program.cpp')
+        exe_path = os.path.join(build_dir, 'program')
+        with open(source_path, 'w') as f:
+            f.write(code)
         compile_process = subprocess.run(
-            ['g++', source_path, '-o', exe_path],
+            ['g++', *flags, source_path, '-o', exe_path],
             capture_output=True,
             text=True
         )
         if compile_process.returncode != 0:
-            return f"Compilation Error:\n{compile_process.stderr}"
-        
-        # Run
-        run_process = subprocess.run(
-            [exe_path],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return run_process.stderr if run_process.stderr else run_process.stdout
-    except subprocess.TimeoutExpired:
-        return "Error: Program execution timed out (5 seconds)"
+            raise CompilationError(f"Compilation Error:\n{compile_process.stderr}")
+        return [exe_path]
 
-def run_java(code, input_data, temp_dir):
-    # Extract public class name from code
-    import re
-    class_match = re.search(r'public\s+class\s+(\w+)', code)
-    if not class_match:
-        return "Error: No public class found in Java code"
-    
-    class_name = class_match.group(1)
-    source_path = os.path.join(temp_dir, f'{class_name}.java')
-    
-    with open(source_path, 'w') as f:
-        f.write(code)
-    
-    try:
-        # Compile
+    if language == "java":
+        class_name = java_class_name(code)
+        source_path = os.path.join(build_dir, f'{class_name}.java')
+        with open(source_path, 'w') as f:
+            f.write(code)
         compile_process = subprocess.run(
-            ['javac', source_path],
+            ['javac', *flags, '-d', build_dir, source_path],
             capture_output=True,
             text=True
         )
         if compile_process.returncode != 0:
-            return f"Compilation Error:\n{compile_process.stderr}"
-        
-        # Run
-        run_process = subprocess.run(
-            ['java', '-cp', temp_dir, class_name],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return run_process.stderr if run_process.stderr else run_process.stdout
-    except subprocess.TimeoutExpired:
-        return "Error: Program execution timed out (5 seconds)"
+            raise CompilationError(f"Compilation Error:\n{compile_process.stderr}")
+        # Class data sharing: the first run dumps the loaded classes to an
+        # archive in the build directory and later runs map it instead of
+        # loading and verifying them again. JDKs older than 19 ignore this.
+        return ['java', '-XX:+IgnoreUnrecognizedVMOptions', '-XX:+AutoCreateSharedArchive',
+                f'-XX:SharedArchiveFile={os.path.join(build_dir, "classes.jsa")}',
+                '-cp', build_dir, class_name]
 
-def run_javascript(code, input_data, temp_dir):
-    file_path = os.path.join(temp_dir, 'script.js')
-    with open(file_path, 'w') as f:
-        f.write(code)
-    
+    if language == "javascript":
+        file_path = os.path.join(build_dir, 'script.js')
+        with open(file_path, 'w') as f:
+            f.write(code)
+        return ['node', file_path]
+
+    raise CompilationError(f"Error: Unsupported language {language}")
+
+
+def pin_to_cpu(cpu):
+    """preexec_fn that pins the child to one core, or None where that isn't supported"""
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return None
+    return lambda: os.sched_setaffinity(0, {cpu})
+
+
+def child_setup(cpu, rlimits):
+    """preexec_fn that pins the child and applies rlimits, where the OS supports them"""
+    pin = pin_to_cpu(cpu)
+    if resource is None:
+        return pin
+
+    def setup():
+        if pin is not None:
+            pin()
+        set_rlimits(rlimits)
+    return setup
+
+
+def current_rss_bytes():
+    """This process's resident memory now, which is where a child forked from it starts its peak"""
     try:
-        process = subprocess.run(
-            ['node', file_path],
-            input=input_data,
-            capture_output=True,
-            text=True,
-            timeout=5
+        with open('/proc/self/statm', 'rb') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        return maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def maxrss_bytes(maxrss):
+    """ru_maxrss is in kilobytes on Linux and in bytes on macOS"""
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class RunResult:
+    """Output and resource usage of one run of a program.
+
+    Times are in seconds and memory in bytes. user_time, system_time and
+    peak_rss are None where the OS doesn't report them. A child starts out
+    with the memory it inherits from the process that started it, so peak_rss
+    is exact only when it is above rss_floor; at or below it the program used
+    at most that much. timed_out means the wall clock timeout killed it.
+    stdout and stderr are cut at the output limit; output_limit_exceeded
+    says the program printed more than that and was stopped. check is the
+    checker's CheckResult when the output was compared with an answer.
+    """
+    def __init__(self, stdout='', stderr='', exit_code=0, wall_time=0.0, user_time=None,
+                 system_time=None, peak_rss=None, rss_floor=0, timed_out=False,
+                 output_limit_exceeded=False, limits=None):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+        self.wall_time = wall_time
+        self.user_time = user_time
+        self.system_time = system_time
+        self.peak_rss = peak_rss
+        self.rss_floor = rss_floor
+        self.timed_out = timed_out
+        self.output_limit_exceeded = output_limit_exceeded
+        self.limits = limits or Limits()
+        self.check = None
+
+    @property
+    def cpu_time(self):
+        if self.user_time is None:
+            return None
+        return self.user_time + self.system_time
+
+    @property
+    def output(self):
+        """What the editor shows as the program's output: stderr if any, else stdout"""
+        return self.stderr if self.stderr else self.stdout
+
+    @property
+    def verdict(self):
+        """VERDICT_OK, or why the run failed regardless of what it printed"""
+        if self.output_limit_exceeded:
+            return VERDICT_OLE
+        cpu_time = self.cpu_time
+        if (self.timed_out or (hasattr(signal, 'SIGXCPU') and self.exit_code == -signal.SIGXCPU)
+                or (cpu_time is not None and cpu_time > self.limits.time_limit)):
+            return VERDICT_TLE
+        # At or below the floor the peak is the inherited memory, not the program's
+        if self.peak_rss is not None and self.peak_rss > max(self.limits.memory_limit, self.rss_floor):
+            return VERDICT_MLE
+        if self.exit_code != 0:
+            if any(marker in self.stderr for marker in OUT_OF_MEMORY_MARKERS):
+                return VERDICT_MLE
+            return VERDICT_RE
+        return VERDICT_OK
+
+    @property
+    def memory_note(self):
+        """Explains an MLE that comes from a limit below what the runtime needs before the program starts"""
+        if self.verdict == VERDICT_MLE and self.limits.memory_limit <= self.rss_floor:
+            return (f"The memory limit is below the {self.rss_floor >> 20} MB the runtime uses "
+                    f"before the program starts")
+        return ""
+
+    @property
+    def report(self):
+        """Plain text for callers without a verdict display: the output, prefixed by the verdict if it failed"""
+        verdict = self.verdict
+        if verdict == VERDICT_OK:
+            return self.output
+        text = f"Error: {VERDICT_NAMES[verdict]}"
+        if verdict == VERDICT_RE:
+            text += f" (exit code {self.exit_code})"
+        if self.memory_note:
+            text += f"\n{self.memory_note}"
+        return f"{text}\n{self.output}" if self.output else text
+
+
+class _KillHandle:
+    """Kills a child reaped with os.wait4, where Popen doesn't know its status"""
+    def __init__(self, process):
+        self.process = process
+        self.pid = process.pid
+        self.reaped = False
+        self._lock = threading.Lock()
+
+    def mark_reaped(self):
+        with self._lock:
+            self.reaped = True
+
+    def kill(self):
+        with self._lock:
+            if not self.reaped:
+                os.kill(self.pid, signal.SIGKILL)
+
+
+def _run_forked(command, input_data, limits, cpu, on_start):
+    """Run in a child of a warm worker; None when the worker can't be used"""
+    from src.editor.fork_server import WorkerError, fork_server_supported, get_fork_server_pool
+    if not fork_server_supported():
+        return None
+    if command[0] == 'python':
+        request = {'script': command[1], 'args': command[2:]}
+    else:
+        request = {'argv': command}
+    # Output goes to files; RLIMIT_FSIZE stops the program one byte past the limit
+    request['rlimits'] = dict(limits.rlimits(command), RLIMIT_FSIZE=[limits.output_limit + 1] * 2)
+    try:
+        stdout, stderr, message, timed_out = get_fork_server_pool().run(
+            request, input_data, limits.wall_timeout, cpu, on_start, limits.output_limit)
+    except (WorkerError, OSError):
+        # No usable worker interpreter (e.g. only python3, or a frozen build):
+        # the program itself doesn't need one
+        return None
+    return RunResult(
+        stdout, stderr,
+        exit_code=os.waitstatus_to_exitcode(message['status']),
+        wall_time=message['wall'],
+        user_time=message['utime'],
+        system_time=message['stime'],
+        peak_rss=maxrss_bytes(message['maxrss']),
+        rss_floor=maxrss_bytes(message['floor']),
+        timed_out=timed_out,
+        output_limit_exceeded=message['output_size'] > limits.output_limit,
+        limits=limits
+    )
+
+
+def read_capped(stream, limit, on_overflow):
+    """Read stream to EOF keeping at most limit bytes.
+
+    Returns (data, exceeded). on_overflow() is called once when the stream
+    goes past limit; the rest is read and dropped so the writer never blocks.
+    """
+    chunks = []
+    size = 0
+    exceeded = False
+    while True:
+        chunk = stream.read1(READ_CHUNK)
+        if not chunk:
+            break
+        if not exceeded:
+            chunks.append(chunk[:limit - size])
+            size += len(chunk)
+            if size > limit:
+                exceeded = True
+                on_overflow()
+    stream.close()
+    return b''.join(chunks), exceeded
+
+
+def _run_subprocess(command, input_data, limits, cpu, on_start):
+    timeout = limits.wall_timeout
+    # An input file is handed to the child as its stdin; text goes through a pipe
+    input_file = open(input_data, 'rb') if not isinstance(input_data, str) else None
+    try:
+        process = subprocess.Popen(
+            command,
+            stdin=input_file if input_file is not None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=child_setup(cpu, limits.rlimits(command))
         )
-        return process.stderr if process.stderr else process.stdout
-    except subprocess.TimeoutExpired:
-        return "Error: Program execution timed out (5 seconds)"
\ No newline at end of file
+    finally:
+        if input_file is not None:
+            input_file.close()
+    # A child forked from this process counts our memory as its own
+    rss_floor = current_rss_bytes()
+    begin = time.perf_counter()
+    # Reaping with wait4 gives the rusage; without it (Windows) there is only wall time
+    use_wait4 = hasattr(os, 'wait4')
+    handle = _KillHandle(process) if use_wait4 else process
+    if on_start is not None:
+        on_start(handle)
+
+    # Service the pipes from threads the way communicate() does, but keep at
+    # most output_limit bytes of each stream
+    outputs = {}
+
+    def write_input():
+        try:
+            process.stdin.write(input_data.encode('utf-8'))
+        except OSError:
+            pass
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    def read_output(name, stream):
+        outputs[name] = read_capped(stream, limits.output_limit, handle.kill)
+
+    threads = [
+        threading.Thread(target=read_output, args=('stdout', process.stdout), daemon=True),
+        threading.Thread(target=read_output, args=('stderr', process.stderr), daemon=True),
+    ]
+    if process.stdin is not None:
+        threads.append(threading.Thread(target=write_input, daemon=True))
+    for thread in threads:
+        thread.start()
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        handle.kill()
+
+    timer = threading.Timer(timeout, expire)
+    timer.start()
+    rusage = None
+    try:
+        if use_wait4 and hasattr(os, 'waitid'):
+            # Wait for the exit without reaping, then reap under the lock so
+            # kill() can never reach a pid that has been reused
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            with handle._lock:
+                _, status, rusage = os.wait4(process.pid, 0)
+                handle.reaped = True
+        elif use_wait4:
+            _, status, rusage = os.wait4(process.pid, 0)
+            handle.mark_reaped()
+        else:
+            process.wait()
+    finally:
+        timer.cancel()
+    wall_time = time.perf_counter() - begin
+    if use_wait4:
+        process.returncode = os.waitstatus_to_exitcode(status)
+    for thread in threads:
+        thread.join()
+    (stdout, stdout_exceeded), (stderr, stderr_exceeded) = outputs['stdout'], outputs['stderr']
+    result = RunResult(
+        stdout.decode('utf-8', 'replace'),
+        stderr.decode('utf-8', 'replace'),
+        exit_code=process.returncode,
+        wall_time=wall_time,
+        timed_out=expired.is_set(),
+        output_limit_exceeded=stdout_exceeded or stderr_exceeded,
+        limits=limits
+    )
+    if rusage is not None:
+        result.user_time = rusage.ru_utime
+        result.system_time = rusage.ru_stime
+        result.peak_rss = maxrss_bytes(rusage.ru_maxrss)
+        result.rss_floor = rss_floor
+    return result
+
+
+def run_program(command, input_data, limits=None, cpu=None, on_start=None):
+    """Run a built program on input_data under limits and return a RunResult.
+
+    input_data is the text to feed to stdin, or the path (e.g. a
+    pathlib.Path) of a file to use as stdin directly.
+
+    on_start is called with the process handle once the process exists, so
+    the caller can kill it to stop the run. Programs run in a forked child of
+    a warm worker when the platform allows it, which is cheaper to start and
+    keeps the app's memory out of the child's peak RSS.
+    """
+    limits = limits or Limits()
+    command = limit_command(command, limits)
+    if USE_FORK_SERVER:
+        result = _run_forked(command, input_data, limits, cpu, on_start)
+        if result is not None:
+            return result
+    return _run_subprocess(command, input_data, limits, cpu, on_start)
+
+
+def _build_and_run(language, code, input_data, temp_dir):
+    try:
+        command = build_program(language, code, temp_dir)
+    except CompilationError as e:
+        return str(e)
+    return run_program(command, input_data).report
+
+def run_python(code, input_data, temp_dir):
+    return _build_and_run("python", code, input_data, temp_dir)
+
+def run_cpp(code, input_data, temp_dir):
+    return _build_and_run("cpp", code, input_data, temp_dir)
+
+def run_java(code, input_data, temp_dir):
+    return _build_and_run("java", code, input_data, temp_dir)
+
+def run_javascript(code, input_data, temp_dir):
+    return _build_and_run("javascript", code, input_data, temp_dir)
@@ -0,0 +1,116 @@
+import time
+import threading
+from PyQt5.QtCore import pyqtSignal
+from src.task_pool import Task, TaskSignals, PRIORITY_INTERACTIVE
+from src.editor.build_cache import get_build_cache
+from src.editor.checker import check
+from src.editor.run_code import CompilationError, VERDICT_OK
+from src.editor.stress import StressTester
+from src.editor.test_runner import ParallelRunner
+
+
+class RunTestsSignals(TaskSignals):
+    finished = pyqtSignal(list)
+    compiled = pyqtSignal()
+    test_started = pyqtSignal(int)
+    test_finished = pyqtSignal(int, object)
+
+
+class RunTestsTask(Task):
+    """Builds the code and runs every test input off the GUI thread.
+
+    Progress is reported per test through signals, which Qt delivers on the
+    GUI thread. cancel() kills the running test processes. With expected
+    outputs, each test that ran cleanly is checked here, off the GUI thread,
+    with checker(stdout, expected) and the CheckResult is set on its result.
+    """
+    signals_class = RunTestsSignals
+
+    def __init__(self, language, code, inputs, pin_cpus=False, limits=None, expected=None, checker=check,
+                 priority=PRIORITY_INTERACTIVE):
+        super().__init__(priority)
+        self.language = language
+        self.code = code
+        self.inputs = inputs
+        self.limits = limits
+        self.expected = expected
+        self.checker = checker
+        self.runner = ParallelRunner(pin_cpus=pin_cpus)
+
+    def cancel(self):
+        super().cancel()
+        self.runner.stop()
+
+    def execute(self):
+        command = get_build_cache().get(self.language, self.code)
+        if self.is_cancelled():
+            return []
+        self.signals.compiled.emit()
+        return self.runner.run(command, self.inputs, self._emit_finished, self._emit_started, self.limits)
+
+    def _emit_started(self, index):
+        if not self.is_cancelled():
+            self.signals.test_started.emit(index)
+
+    def _emit_finished(self, index, result):
+        if self.expected is not None and result.verdict == VERDICT_OK:
+            result.check = self.checker(result.stdout, self.expected[index])
+        if not self.is_cancelled():
+            self.signals.test_finished.emit(index, result)
+
+
+class StressSignals(TaskSignals):
+    finished = pyqtSignal(object)
+    compiled = pyqtSignal()
+    progress = pyqtSignal(int, float)
+
+
+class StressTask(Task):
+    """Builds generator, brute force and solution once and stress tests them.
+
+    Each program is a (language, code) pair. progress(iterations, elapsed)
+    is emitted at most every PROGRESS_INTERVAL seconds; finished carries
+    the StressResult. cancel() kills the running processes.
+    """
+    signals_class = StressSignals
+    PROGRESS_INTERVAL = 0.25
+
+    def __init__(self, generator, brute, solution, seed=1, limits=None, checker=check,
+                 priority=PRIORITY_INTERACTIVE):
+        super().__init__(priority)
+        self.programs = [("Generator", generator), ("Brute force", brute), ("Solution", solution)]
+        self.seed = seed
+        self.limits = limits
+        self.checker = checker
+        self.tester = None
+        self._last_progress = 0.0
+        self._progress_lock = threading.Lock()
+
+    def cancel(self):
+        super().cancel()
+        if self.tester is not None:
+            self.tester.stop()
+
+    def execute(self):
+        commands = []
+        for name, (language, code) in self.programs:
+            try:
+                commands.append(get_build_cache().get(language, code))
+            except CompilationError as e:
+                raise CompilationError(f"{name}: {e}")
+            if self.is_cancelled():
+                return None
+        self.signals.compiled.emit()
+        self.tester = StressTester(*commands, seed=self.seed, limits=self.limits, checker=self.checker)
+        if self.is_cancelled():
+            self.tester.stop()
+        return self.tester.run(self._emit_progress)
+
+    def _emit_progress(self, iterations, elapsed):
+        now = time.monotonic()
+        with self._progress_lock:
+            if now - self._last_progress < self.PROGRESS_INTERVAL:
+                return
+            self._last_progress = now
+        if not self.is_cancelled():
+            self.signals.progress.emit(iterations, elapsed)
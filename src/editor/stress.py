@@ -0,0 +1,232 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from src.utils import get_cache_dir
+from src.editor.build_cache import get_build_cache
+from src.editor.checker import check
+from src.editor.run_code import (VERDICT_OK, VERDICT_NAMES, DEFAULT_MEMORY_LIMIT, Limits, child_setup,
+                                 limit_command)
+from src.editor.test_runner import ProcessGroup, available_cpus
+
+
+# Generating a max-constraint test may take longer than a solution may
+GENERATE_TIMEOUT = 60
+# Largest input file a generator may write; well above Codeforces' max tests
+MAX_GENERATED_INPUT = 256 << 20
+# Generated inputs kept on disk; the least recently generated go first
+MAX_GENERATED_INPUTS_BYTES = 1 << 30
+# Tail of the generator's stderr shown when it fails
+GENERATOR_ERROR_BYTES = 4096
+
+
+class StressError(Exception):
+    """The generator or the brute force failed, so the run can't go on."""
+
+
+class _Stopped(Exception):
+    """Raised inside a worker when stop() killed its process"""
+
+
+class StressFailure:
+    """An input on which the solution disagrees with the brute force"""
+    def __init__(self, seed, input_data, expected, output, message):
+        self.seed = seed
+        self.input_data = input_data
+        self.expected = expected
+        self.output = output
+        self.message = message
+
+
+class StressResult:
+    def __init__(self, iterations, elapsed, failure=None):
+        self.iterations = iterations
+        self.elapsed = elapsed
+        self.failure = failure
+
+    @property
+    def rate(self):
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class StressTester:
+    """Runs generator, brute force and solution on random inputs until the
+    solution and the brute force disagree.
+
+    Each argument is a built command. Iteration i runs the generator with
+    seed + i as its only command line argument and feeds what it prints to
+    both solutions, so a failing seed reproduces the failing input.
+    Iterations run in parallel, one per core. When one fails, the iterations
+    already running are finished and the lowest failing seed is reported, so
+    the result doesn't depend on which core was fastest.
+
+    stop() may be called from any thread; it kills the running processes.
+    """
+    def __init__(self, generator, brute, solution, seed=1, limits=None, checker=check,
+                 max_workers=None, max_iterations=None):
+        self.generator = generator
+        self.brute = brute
+        self.solution = solution
+        self.seed = seed
+        self.limits = limits
+        self.checker = checker
+        self.max_workers = min(max_workers or len(available_cpus()), len(available_cpus()))
+        self.max_iterations = max_iterations
+        self.processes = ProcessGroup()
+        self.iterations = 0
+        self._next = 0
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def stop(self):
+        self.processes.stop()
+
+    def is_stopped(self):
+        return self.processes.is_stopped()
+
+    def _run(self, command, input_data):
+        result = self.processes.run(command, input_data, self.limits)
+        if result is None:
+            raise _Stopped()
+        return result
+
+    def iterate(self, seed):
+        """Run one iteration; a StressFailure if the solution got it wrong, else None"""
+        generated = self._run([*self.generator, str(seed)], "")
+        if generated.verdict != VERDICT_OK:
+            raise StressError(f"Generator failed with seed {seed}: {VERDICT_NAMES[generated.verdict]}\n"
+                              f"{generated.output}")
+        input_data = generated.stdout
+        expected = self._run(self.brute, input_data)
+        if expected.verdict != VERDICT_OK:
+            raise StressError(f"Brute force failed with seed {seed}: {VERDICT_NAMES[expected.verdict]}\n"
+                              f"{expected.output}")
+        actual = self._run(self.solution, input_data)
+        if actual.verdict != VERDICT_OK:
+            return StressFailure(seed, input_data, expected.stdout, actual.output, VERDICT_NAMES[actual.verdict])
+        result = self.checker(actual.stdout, expected.stdout)
+        if not result:
+            return StressFailure(seed, input_data, expected.stdout, actual.stdout, result.message)
+        return None
+
+    def _take(self):
+        """The next iteration number, or None once the run is over"""
+        with self._lock:
+            if self._failed or self.processes.is_stopped():
+                return None
+            if self.max_iterations is not None and self._next >= self.max_iterations:
+                return None
+            self._next += 1
+            return self._next - 1
+
+    def run(self, on_progress=None):
+        """Iterate until a failure, stop() or max_iterations; returns a StressResult.
+
+        on_progress(iterations, elapsed) is called from the worker threads
+        after every iteration.
+        """
+        begin = time.perf_counter()
+        failures = []
+
+        def work():
+            while True:
+                iteration = self._take()
+                if iteration is None:
+                    return
+                try:
+                    failure = self.iterate(self.seed + iteration)
+                except _Stopped:
+                    return
+                except StressError:
+                    self.stop()
+                    raise
+                with self._lock:
+                    self.iterations += 1
+                    iterations = self.iterations
+                    if failure is not None:
+                        failures.append(failure)
+                        self._failed = True
+                if on_progress is not None:
+                    on_progress(iterations, time.perf_counter() - begin)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(work) for _ in range(self.max_workers)]
+            for future in futures:
+                future.result()
+        failure = min(failures, key=lambda failure: failure.seed) if failures else None
+        return StressResult(self.iterations, time.perf_counter() - begin, failure)
+
+
+def generated_inputs_dir():
+    directory = os.path.join(get_cache_dir(), 'tests')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def evict_generated_inputs(directory, keep, max_bytes=MAX_GENERATED_INPUTS_BYTES):
+    """Remove the oldest inputs in directory until they fit in max_bytes, never the one at keep"""
+    entries = []
+    total = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        total += stat.st_size
+        if path != keep:
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def generate_input(generator, seed, path, memory_limit=DEFAULT_MEMORY_LIMIT, timeout=GENERATE_TIMEOUT,
+                   max_size=MAX_GENERATED_INPUT):
+    """Run the generator command for seed with its stdout going straight to the file at path.
+
+    Meant for large tests: neither stream passes through this process. The
+    generator runs under rlimits like a test, with timeout seconds of CPU
+    time and at most max_size bytes of output.
+    """
+    limits = Limits(timeout, memory_limit, max_size)
+    command = limit_command([*generator, str(seed)], limits)
+    rlimits = dict(limits.rlimits(command), RLIMIT_FSIZE=[max_size + 1] * 2)
+    with open(path, 'wb') as output, tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=output, stderr=errors,
+                                     preexec_fn=child_setup(None, rlimits), timeout=limits.wall_timeout)
+        except subprocess.TimeoutExpired:
+            raise StressError(f"Generator timed out after {limits.wall_timeout} seconds with seed {seed}")
+        # Checked first: Python ignores SIGXFSZ and may still exit with 0
+        if os.fstat(output.fileno()).st_size > max_size:
+            raise StressError(f"Generator wrote more than {max_size >> 20} MB with seed {seed}")
+        if process.returncode == 0:
+            return path
+        errors.seek(max(0, os.fstat(errors.fileno()).st_size - GENERATOR_ERROR_BYTES))
+        message = errors.read().decode('utf-8', 'replace')
+    raise StressError(f"Generator failed with seed {seed}:\n{message}")
+
+
+def generate_test_input(language, code, seed, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Build the generator and write its test for seed to a file; returns the file's path"""
+    command = get_build_cache().get(language, code)
+    digest = hashlib.sha256(f"{language}\0{code}".encode('utf-8')).hexdigest()[:12]
+    directory = generated_inputs_dir()
+    path = os.path.join(directory, f"{digest}-{seed}.txt")
+    try:
+        generate_input(command, seed, path, memory_limit)
+    except StressError:
+        os.remove(path)
+        raise
+    evict_generated_inputs(directory, keep=path)
+    return path
@@ -0,0 +1,185 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
+                             QPushButton, QPlainTextEdit, QComboBox, QSpinBox)
+from src.editor.run_task import StressTask
+from src.editor.stress import generate_test_input
+from src.task_pool import FunctionTask, get_task_pool
+
+LANGUAGES = ["python", "cpp", "java", "javascript"]
+
+DEFAULT_GENERATOR = """import sys
+import random
+
+# The seed is the first command line argument
+random.seed(int(sys.argv[1]))
+n = random.randint(1, 10)
+print(n)
+print(*[random.randint(1, 100) for _ in range(n)])
+"""
+
+
+class StressDialog(QDialog):
+    """Stress tests the editor's code against a brute force on generated inputs."""
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.task = None
+        self.failure = None
+        self.setWindowTitle("Stress Test")
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+
+        # Generator and brute force side by side; the solution is the editor's code
+        programs_layout = QGridLayout()
+        self.generator_language = QComboBox()
+        self.generator_language.addItems(LANGUAGES)
+        self.generator_text = QPlainTextEdit()
+        self.generator_text.setPlainText(DEFAULT_GENERATOR)
+        self.brute_language = QComboBox()
+        self.brute_language.addItems(LANGUAGES)
+        self.brute_text = QPlainTextEdit()
+        self.brute_text.setPlaceholderText("A slow but obviously correct solution")
+        for column, (title, language, text) in enumerate([
+            ("Generator (prints one test for the seed in argv[1])", self.generator_language, self.generator_text),
+            ("Brute Force", self.brute_language, self.brute_text),
+        ]):
+            label = QLabel(title)
+            label.setStyleSheet("font-weight: bold;")
+            programs_layout.addWidget(label, 0, column)
+            programs_layout.addWidget(language, 1, column)
+            programs_layout.addWidget(text, 2, column)
+        layout.addLayout(programs_layout)
+
+        # Seed and controls
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Seed:"))
+        self.seed_input = QSpinBox()
+        self.seed_input.setRange(1, 2 ** 31 - 1)
+        controls_layout.addWidget(self.seed_input)
+        self.start_button = QPushButton("Start")
+        self.start_button.clicked.connect(self.start)
+        controls_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.clicked.connect(self.stop)
+        self.stop_button.setEnabled(False)
+        controls_layout.addWidget(self.stop_button)
+        # Writes the generator's test for the seed to a file, for tests too
+        # large to keep as text
+        self.generate_button = QPushButton("Add Generated Test Case")
+        self.generate_button.clicked.connect(self.generate_test_case)
+        controls_layout.addWidget(self.generate_button)
+        self.status_label = QLabel("Not started")
+        controls_layout.addWidget(self.status_label)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+
+        # The failing test, once there is one
+        self.failure_text = QPlainTextEdit()
+        self.failure_text.setReadOnly(True)
+        layout.addWidget(self.failure_text)
+        self.add_test_case_button = QPushButton("Add Failing Input as Test Case")
+        self.add_test_case_button.clicked.connect(self.add_failure_as_test_case)
+        self.add_test_case_button.setEnabled(False)
+        layout.addWidget(self.add_test_case_button)
+
+        self.setLayout(layout)
+        self.resize(900, 600)
+
+    def set_running(self, running):
+        self.start_button.setEnabled(not running)
+        self.stop_button.setEnabled(running)
+
+    def start(self):
+        if self.task is None:
+            self.set_running(True)
+            self.status_label.setText("Getting the solution...")
+            self.editor.with_code(self._start)
+
+    def _start(self, code):
+        self.failure = None
+        self.failure_text.setPlainText("")
+        self.add_test_case_button.setEnabled(False)
+        self.status_label.setText("Compiling...")
+        task = StressTask(
+            (self.generator_language.currentText(), self.generator_text.toPlainText()),
+            (self.brute_language.currentText(), self.brute_text.toPlainText()),
+            (self.editor.current_language, code),
+            seed=self.seed_input.value(),
+            limits=self.editor.limits(),
+            checker=self.editor.checker()
+        )
+        task.compiled.connect(lambda: self.on_compiled(task))
+        task.progress.connect(lambda iterations, elapsed: self.on_progress(task, iterations, elapsed))
+        task.finished.connect(lambda result: self.on_finished(task, result))
+        task.error.connect(lambda message: self.on_error(task, message))
+        self.task = task
+        get_task_pool().submit(task)
+
+    def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        self.task = None
+        self.set_running(False)
+        self.status_label.setText(f"Stopped · {self.status_label.text()}")
+
+    def on_compiled(self, task):
+        if task is self.task:
+            self.status_label.setText("Running...")
+
+    def on_progress(self, task, iterations, elapsed):
+        if task is self.task:
+            self.status_label.setText(f"{iterations} iterations · {iterations / elapsed:.1f} it/s")
+
+    def on_finished(self, task, result):
+        if task is not self.task:
+            return
+        self.task = None
+        self.set_running(False)
+        self.status_label.setText(f"{result.iterations} iterations · {result.rate:.1f} it/s")
+        self.failure = result.failure
+        if self.failure is None:
+            return
+        self.failure_text.setPlainText(
+            f"Seed {self.failure.seed}: {self.failure.message}\n\n"
+            f"Input:\n{self.failure.input_data}\n"
+            f"Expected (brute force):\n{self.failure.expected}\n"
+            f"Found:\n{self.failure.output}"
+        )
+        self.add_test_case_button.setEnabled(True)
+        # Later runs can start from the failing seed to reproduce it
+        self.seed_input.setValue(self.failure.seed)
+
+    def on_error(self, task, message):
+        if task is not self.task:
+            return
+        self.task = None
+        self.set_running(False)
+        self.status_label.setText("Failed")
+        self.failure_text.setPlainText(message)
+
+    def add_failure_as_test_case(self):
+        if self.failure is not None:
+            self.editor.add_test_case(self.failure.input_data, self.failure.expected)
+
+    def generate_test_case(self):
+        seed = self.seed_input.value()
+        self.generate_button.setEnabled(False)
+        task = FunctionTask(generate_test_input, self.generator_language.currentText(),
+                            self.generator_text.toPlainText(), seed, self.editor.limits().memory_limit)
+        task.finished.connect(self.on_generated)
+        task.error.connect(self.on_generate_error)
+        get_task_pool().submit(task)
+
+    def on_generated(self, path):
+        self.generate_button.setEnabled(True)
+        self.editor.add_test_case(input_path=path)
+
+    def on_generate_error(self, message):
+        self.generate_button.setEnabled(True)
+        self.failure_text.setPlainText(message)
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
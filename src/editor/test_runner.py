@@ -0,0 +1,113 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.editor.run_code import run_program
+
+
+def available_cpus():
+    """Cores this process may run on"""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+class ProcessGroup:
+    """Processes started for one run, so stop() can kill them from any thread"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._stopped = False
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def is_stopped(self):
+        return self._stopped
+
+    def _started(self, process):
+        with self._lock:
+            self._processes.add(process)
+            stopped = self._stopped
+        if stopped:
+            process.kill()
+
+    def run(self, command, input_data, limits=None, cpu=None):
+        """run_program, tracked while it runs; None if the group was stopped meanwhile"""
+        started = []
+
+        def on_start(process):
+            started.append(process)
+            self._started(process)
+
+        try:
+            result = run_program(command, input_data, limits, cpu=cpu, on_start=on_start)
+        finally:
+            with self._lock:
+                self._processes.difference_update(started)
+        return None if self._stopped else result
+
+
+class ParallelRunner:
+    """Runs one built program on many inputs at once, at most one test per core.
+
+    With pin_cpus each running test gets a core of its own, so tests don't
+    migrate between cores or share one and their timings stay comparable.
+    Pinning is only available where the OS supports setting CPU affinity.
+
+    stop() may be called from any thread; it kills the running processes and
+    skips the tests that haven't started.
+    """
+    def __init__(self, max_workers=None, pin_cpus=False):
+        self.cpus = available_cpus()
+        self.max_workers = min(max_workers or len(self.cpus), len(self.cpus))
+        self.pin_cpus = pin_cpus and hasattr(os, 'sched_setaffinity')
+        self.processes = ProcessGroup()
+
+    def stop(self):
+        self.processes.stop()
+
+    def is_stopped(self):
+        return self.processes.is_stopped()
+
+    def run(self, command, inputs, on_result=None, on_start=None, limits=None):
+        """Run command on every input under limits and return RunResults in input order.
+
+        on_start(index) is called from a worker thread when a test starts and
+        on_result(index, result) from the calling thread as each test
+        finishes, in completion order. Tests skipped or killed by stop() have
+        no result and are not reported.
+        """
+        # Each worker takes a core for the duration of one test
+        cores = queue.Queue()
+        for cpu in self.cpus[:self.max_workers]:
+            cores.put(cpu)
+
+        def run_one(index, input_data):
+            cpu = cores.get()
+            try:
+                if self.processes.is_stopped():
+                    return index, None
+                if on_start is not None:
+                    on_start(index)
+                return index, self.processes.run(command, input_data, limits, cpu if self.pin_cpus else None)
+            finally:
+                cores.put(cpu)
+
+        results = [None] * len(inputs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(run_one, index, input_data) for index, input_data in enumerate(inputs)]
+            for future in as_completed(futures):
+                index, result = future.result()
+                results[index] = result
+                if result is not None and on_result is not None:
+                    on_result(index, result)
+        return results
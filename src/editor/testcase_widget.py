@@ -1,13 +1,76 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPlainTextEdit, QFrame)
+import os
+from pathlib import Path
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit, QFrame,
+                             QPushButton, QFileDialog)
 
 from PyQt5.QtCore import Qt
+from src.editor.run_code import VERDICT_OK, VERDICT_NAMES
+
+# Characters of a test's output shown in the widget; QPlainTextEdit gets
+# slow with megabytes of text
+PREVIEW_LIMIT = 20000
+
+
+def preview(text, limit=PREVIEW_LIMIT):
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}\n… {len(text) - limit} more characters not shown"
+
+
+# Bytes of an input file shown in the widget; the rest is never read
+FILE_PREVIEW_BYTES = 4096
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    if size < 1 << 20:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1 << 20):.1f} MB"
+
+
+def read_preview(path, limit=FILE_PREVIEW_BYTES):
+    """The start of the file at path, and a note on how much is left out"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        text = f.read(limit).decode('utf-8', 'replace')
+    if size > limit:
+        text += f"\n… {format_size(size - limit)} more not shown"
+    return text
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "n/a"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_memory(result):
+    """Peak memory of a RunResult; only an upper bound when it didn't exceed the inherited floor"""
+    if result.peak_rss is None:
+        return "n/a"
+    text = f"{result.peak_rss / (1 << 20):.1f} MB"
+    return f"≤ {text}" if result.peak_rss <= result.rss_floor else text
+
+
+def format_metrics(result):
+    return (f"Time {format_duration(result.wall_time)} · CPU {format_duration(result.cpu_time)}"
+            f" · Memory {format_memory(result)}")
 
 
 class TestCaseWidget(QWidget):
-    def __init__(self, input_data, expected_output, index, parent=None):
+    def __init__(self, input_data, expected_output, index, parent=None, input_path=None):
         super().__init__(parent)
         self.index = index
+        self.has_result = False
+        self.result = None
+        # Large inputs stay in a file that is fed to the program as is
+        self.input_path = None
         self.initUI(input_data, expected_output)
+        if input_path is not None:
+            self.set_input_file(input_path)
         
     def initUI(self, input_data, expected_output):
         layout = QVBoxLayout()
@@ -26,6 +89,21 @@ class TestCaseWidget(QWidget):
         layout.addWidget(input_label)
         layout.addWidget(self.input_text)
         
+        # Input file: name and size, or buttons to pick one
+        input_file_layout = QHBoxLayout()
+        self.input_file_label = QLabel()
+        self.input_file_label.setStyleSheet("color: gray;")
+        input_file_layout.addWidget(self.input_file_label)
+        input_file_layout.addStretch()
+        self.load_input_button = QPushButton("Load Input File...")
+        self.load_input_button.clicked.connect(self.choose_input_file)
+        input_file_layout.addWidget(self.load_input_button)
+        self.clear_input_button = QPushButton("Use Text Input")
+        self.clear_input_button.clicked.connect(self.clear_input_file)
+        self.clear_input_button.setVisible(False)
+        input_file_layout.addWidget(self.clear_input_button)
+        layout.addLayout(input_file_layout)
+        
         # Expected output section
         expected_label = QLabel("Expected Output:")
         expected_label.setStyleSheet("font-weight: bold;")
@@ -44,11 +122,33 @@ class TestCaseWidget(QWidget):
         layout.addWidget(actual_label)
         layout.addWidget(self.actual_text)
         
+        # stderr, kept apart from the stdout that is judged
+        self.error_label = QLabel("Error Output:")
+        self.error_label.setStyleSheet("font-weight: bold;")
+        self.error_text = QPlainTextEdit()
+        self.error_text.setReadOnly(True)
+        self.error_text.setMaximumHeight(80)
+        layout.addWidget(self.error_label)
+        layout.addWidget(self.error_text)
+        self.set_error_output("")
+        
         # Result label
         self.result_label = QLabel()
         self.result_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.result_label)
         
+        # Where the output first differs from the expected one
+        self.detail_label = QLabel()
+        self.detail_label.setAlignment(Qt.AlignCenter)
+        self.detail_label.setWordWrap(True)
+        layout.addWidget(self.detail_label)
+        
+        # Wall time, CPU time and peak memory of the last run
+        self.metrics_label = QLabel()
+        self.metrics_label.setAlignment(Qt.AlignCenter)
+        self.metrics_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.metrics_label)
+        
         # Add some spacing and a separator line
         line = QFrame()
         line.setFrameShape(QFrame.HLine)
@@ -57,9 +157,86 @@ class TestCaseWidget(QWidget):
         
         self.setLayout(layout)
     
-    def update_result(self, actual_output, passed):
-        self.actual_text.setPlainText(actual_output)
-        if passed:
+    def input_source(self):
+        """What run_program takes as input: the input file's path, or the text"""
+        if self.input_path is not None:
+            return Path(self.input_path)
+        return self.input_text.toPlainText()
+
+    def set_input_file(self, path):
+        """Use the file at path as input, showing only its size and first bytes"""
+        self.input_path = path
+        self.input_text.setPlainText(read_preview(path))
+        self.input_text.setReadOnly(True)
+        self.input_file_label.setText(f"{os.path.basename(path)} · {format_size(os.path.getsize(path))}")
+        self.input_file_label.setToolTip(path)
+        self.clear_input_button.setVisible(True)
+
+    def clear_input_file(self):
+        self.input_path = None
+        self.input_text.setPlainText("")
+        self.input_text.setReadOnly(False)
+        self.input_file_label.setText("")
+        self.input_file_label.setToolTip("")
+        self.clear_input_button.setVisible(False)
+
+    def choose_input_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Input File")
+        if path:
+            self.set_input_file(path)
+
+    def set_error_output(self, text):
+        self.error_text.setPlainText(preview(text))
+        self.error_label.setVisible(bool(text))
+        self.error_text.setVisible(bool(text))
+
+    def set_status(self, text):
+        self.has_result = False
+        self.set_metrics(None)
+        self.set_error_output("")
+        self.detail_label.setText("")
+        self.result_label.setText(text)
+        self.result_label.setStyleSheet("QLabel { color: gray; font-weight: bold; font-size: 14px; padding: 5px; }")
+
+    def set_metrics(self, result):
+        """Show the resource usage of a RunResult, or clear it with None"""
+        self.result = result
+        self.set_slowest(False)
+        self.metrics_label.setText(format_metrics(result) if result is not None else "")
+
+    def set_slowest(self, slowest):
+        if slowest:
+            self.metrics_label.setStyleSheet("color: #FF9800; font-weight: bold;")
+            self.metrics_label.setToolTip("Slowest test of this run")
+        else:
+            self.metrics_label.setStyleSheet("color: gray;")
+            self.metrics_label.setToolTip("")
+
+    def update_result(self, actual_output, passed, result=None):
+        """Show a finished test; a failed verdict in result takes precedence over the comparison.
+
+        actual_output is the stdout that was judged; result's stderr is shown
+        on its own.
+        """
+        self.has_result = True
+        self.set_metrics(result)
+        self.actual_text.setPlainText(preview(actual_output))
+        self.set_error_output(result.stderr if result is not None else "")
+        verdict = result.verdict if result is not None else VERDICT_OK
+        check = result.check if result is not None else None
+        note = result.memory_note if result is not None else ""
+        self.detail_label.setText(note or (check.message if check is not None and not passed else ""))
+        if verdict != VERDICT_OK:
+            self.result_label.setText(f"✗ {VERDICT_NAMES[verdict].upper()}")
+            self.result_label.setStyleSheet("""
+                QLabel {
+                    color: #f44336;
+                    font-weight: bold;
+                    font-size: 14px;
+                    padding: 5px;
+                }
+            """)
+        elif passed:
             self.result_label.setText("✓ PASSED")
             self.result_label.setStyleSheet("""
                 QLabel {
@@ -78,4 +255,4 @@ class TestCaseWidget(QWidget):
                     font-size: 14px;
                     padding: 5px;
                 }
-            """)
\ No newline at end of file
+            """)
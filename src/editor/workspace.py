@@ -0,0 +1,105 @@
+"""Reusable directories for test runs, on tmpfs where there is one.
+
+Creating and deleting a directory and three temporary files for every test
+shows up next to a run that takes a few milliseconds, more so when /tmp is
+on a slow disk. A Workspace is created once and reset between tests
+instead: its stdin, stdout and stderr files stay open and are truncated,
+and whatever the last program left in the directory is removed. Built
+programs live in the build cache, not here, so they survive the reset.
+
+Workspace directories carry the owning process's pid in their name, so the
+ones left behind by a crashed or killed app (in RAM, on /dev/shm) can be
+told apart and removed by remove_stale_workspaces().
+"""
+import os
+import shutil
+import tempfile
+
+SHM_DIR = '/dev/shm'
+WORKSPACE_PREFIX = 'cf-finder-'
+
+
+def workspace_root():
+    """Where workspaces go: /dev/shm when it is a writable directory, else the temporary directory"""
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK | os.X_OK):
+        return SHM_DIR
+    return tempfile.gettempdir()
+
+
+def _owner_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, but belongs to someone else
+        return True
+    return True
+
+
+def remove_stale_workspaces(root=None):
+    """Remove the workspaces in root whose owning process is gone"""
+    root = root or workspace_root()
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(WORKSPACE_PREFIX):
+            continue
+        pid = name[len(WORKSPACE_PREFIX):].split('-', 1)[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not _owner_alive(int(pid)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class Workspace:
+    """A directory and the standard stream files of the test running in it.
+
+    Used by one test at a time; call reset() before each test.
+    """
+    def __init__(self, root=None):
+        self.path = tempfile.mkdtemp(prefix=f'{WORKSPACE_PREFIX}{os.getpid()}-', dir=root or workspace_root())
+        self.stdin = open(os.path.join(self.path, '.stdin'), 'w+b')
+        self.stdout = open(os.path.join(self.path, '.stdout'), 'w+b')
+        self.stderr = open(os.path.join(self.path, '.stderr'), 'w+b')
+        self._own_files = {'.stdin', '.stdout', '.stderr'}
+
+    def reset(self):
+        """Empty the stream files and remove anything else the last test created"""
+        for file in (self.stdin, self.stdout, self.stderr):
+            file.seek(0)
+            file.truncate()
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name in self._own_files:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def write_input(self, text):
+        """Put text in the stdin file; returns the file, rewound for the test to read"""
+        self.stdin.write(text.encode('utf-8'))
+        self.stdin.seek(0)
+        return self.stdin
+
+    def output_size(self):
+        return max(os.fstat(self.stdout.fileno()).st_size, os.fstat(self.stderr.fileno()).st_size)
+
+    def read_outputs(self, limit=None):
+        """(stdout, stderr) as text, at most limit bytes of each"""
+        outputs = []
+        for file in (self.stdout, self.stderr):
+            file.seek(0)
+            data = file.read(limit) if limit is not None else file.read()
+            outputs.append(data.decode('utf-8', 'replace'))
+        return outputs[0], outputs[1]
+
+    def close(self):
+        for file in (self.stdin, self.stdout, self.stderr):
+            file.close()
+        shutil.rmtree(self.path, ignore_errors=True)
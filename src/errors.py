@@ -0,0 +1,5 @@
+class FinderError(Exception):
+    """A request can't be answered from the data, e.g. an unknown handle or no matching problems.
+
+    The message is meant for the user; anything else raised is a bug.
+    """
@@ -0,0 +1,158 @@
+"""Fetch, filter and recommendation logic shared by the GUI and the CLI.
+
+Nothing here imports Qt, so it can be used from scripts and cron jobs.
+"""
+import random
+from collections import defaultdict
+from src.catalog_file import MappedCatalog
+from src.codeforces_api import CodeforcesClient
+from src.recommendation import RecommendationEngine
+from src.errors import FinderError
+
+RECOMMENDATION_TYPES = ('practice', 'warmup')
+DEFAULT_MIN_RATING = 800
+DEFAULT_MAX_RATING = 3500
+DEFAULT_CONTEST_LIMIT = 100
+
+
+def get_solved_problems(submissions):
+    solved_problems = set()
+    for submission in submissions:
+        if submission['verdict'] == 'OK':
+            problem = submission['problem']
+            solved_problems.add(f"{problem.get('contestId')}_{problem.get('index')}")
+    return solved_problems
+
+
+def process_submissions(submissions):
+    # Process tags
+    tags_counter = defaultdict(int)
+    # Process ratings
+    rating_counter = defaultdict(int)
+
+    # Track unique problems
+    solved_problems = set()
+
+    for submission in submissions:
+        if submission['verdict'] == 'OK':
+            problem = submission['problem']
+            problem_id = (problem['contestId'], problem['index'])
+
+            # Only count each problem once
+            if problem_id not in solved_problems:
+                solved_problems.add(problem_id)
+
+                # Count tags
+                for tag in problem.get('tags', []):
+                    tags_counter[tag] += 1
+
+                # Count ratings
+                if 'rating' in problem:
+                    rating = problem['rating']
+                    rating_counter[rating] += 1
+
+    return dict(tags_counter), dict(rating_counter)
+
+
+def summarize_submissions(submissions):
+    total_solved = len({(sub['problem']['contestId'], sub['problem']['index'])
+                      for sub in submissions if sub['verdict'] == 'OK'})
+    max_rating = max((sub['problem'].get('rating', 0) for sub in submissions
+                    if sub['verdict'] == 'OK' and 'rating' in sub['problem']), default=0)
+    return total_solved, max_rating
+
+
+def compute_stats(username, submissions):
+    tags_data, rating_data = process_submissions(submissions)
+    total_solved, max_rating = summarize_submissions(submissions)
+    return {
+        'username': username,
+        'tags_data': tags_data,
+        'rating_data': rating_data,
+        'total_solved': total_solved,
+        'max_rating': max_rating,
+    }
+
+
+class ProblemFinder:
+    """Finds problems for a handle from the Codeforces catalog.
+
+    The catalog is fetched once per finder and reused for every handle, so
+    one finder can serve picks for many users.
+    """
+    def __init__(self, min_rating=DEFAULT_MIN_RATING, max_rating=DEFAULT_MAX_RATING,
+                 contest_limit=DEFAULT_CONTEST_LIMIT, tags=None, client=None):
+        self.client = client or CodeforcesClient()
+        self.min_rating = min_rating
+        self.max_rating = max_rating
+        self.contest_limit = contest_limit
+        self.tags = tags
+        self._catalog = None
+
+    def get_user_submissions(self, handle):
+        return self.client.get_user_submissions(handle)
+
+    def get_all_problems(self):
+        if self._catalog is None:
+            self._catalog = self.client.get_problems()
+        return self._catalog
+
+    def get_stats(self, handle):
+        return compute_stats(handle, self.get_user_submissions(handle))
+
+    def find(self, handle, recommendation_type=None):
+        """Problems for handle: recommendations of the given type, or every match of the filters"""
+        if recommendation_type == 'practice':
+            problems = self.get_practice_recommendations(handle)
+        elif recommendation_type == 'warmup':
+            problems = self.get_warmup_recommendations(handle)
+        else:
+            problems = self.get_problems(handle)
+        if not problems:
+            raise FinderError("No problems found matching the criteria")
+        return problems
+
+    def pick(self, handle, count=1, rng=random):
+        """A random sample of count unsolved problems matching the filters"""
+        problems = self.find(handle)
+        return rng.sample(problems, min(count, len(problems)))
+
+    def get_practice_recommendations(self, handle):
+        submissions = self.get_user_submissions(handle)
+        recommendation_engine = RecommendationEngine(submissions, self.get_all_problems())
+        return recommendation_engine.get_practice_recommendations()
+
+    def get_warmup_recommendations(self, handle):
+        submissions = self.get_user_submissions(handle)
+        recommendation_engine = RecommendationEngine(submissions, self.get_all_problems())
+        return recommendation_engine.get_warmup_recommendations()
+
+    def get_problems(self, handle):
+        solved_problems = get_solved_problems(self.get_user_submissions(handle))
+        return self.filter_problems(self.get_all_problems(), solved_problems)
+
+    def filter_problems(self, all_problems, solved_problems):
+        filtered_problems = []
+        seen_contest_ids = set()
+        if isinstance(all_problems, MappedCatalog):
+            # Narrow by the rating column before building any problem dicts
+            all_problems = all_problems.rows(all_problems.indices_in_rating_range(self.min_rating, self.max_rating))
+
+        for problem in all_problems:
+            if len(seen_contest_ids) >= self.contest_limit:
+                break
+
+            contest_id = problem.get('contestId')
+            problem_id = f"{contest_id}_{problem.get('index')}"
+
+            if (problem.get('rating', 0) >= self.min_rating and
+                problem.get('rating', 0) <= self.max_rating and
+                problem_id not in solved_problems and
+                (not self.tags or any(tag in problem.get('tags', []) for tag in self.tags))):
+
+                if contest_id not in seen_contest_ids:
+                    seen_contest_ids.add(contest_id)
+
+                filtered_problems.append(problem)
+
+        return filtered_problems
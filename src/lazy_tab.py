@@ -0,0 +1,28 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtCore import pyqtSignal
+
+
+class LazyTab(QWidget):
+    """Placeholder tab page that builds its real widget on first use.
+
+    The factory is only called when the tab is activated or the widget is
+    requested through widget(), so expensive pages stay off the startup path.
+    """
+    created = pyqtSignal(object)
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self._widget = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_loaded(self):
+        return self._widget is not None
+
+    def widget(self):
+        if self._widget is None:
+            self._widget = self.factory()
+            self.layout().addWidget(self._widget)
+            self.created.emit(self._widget)
+        return self._widget
@@ -0,0 +1,89 @@
+import atexit
+import threading
+from src.utils import load_preferences, save_preferences, get_preferences_path
+
+# Changes made within this window are coalesced into a single write
+WRITE_DELAY = 0.5
+
+
+class PreferencesStore:
+    """In-memory view of the user preferences with write-behind persistence.
+
+    get/set never touch the disk. Changes are written by a background thread
+    once no further change has arrived for ``delay`` seconds, using an atomic
+    replace so a crash mid-write cannot corrupt the file.
+    """
+    def __init__(self, path=None, delay=WRITE_DELAY):
+        self.path = path or get_preferences_path()
+        self.delay = delay
+        self._data = load_preferences(self.path)
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._version = 0
+        self._writer = None
+        self._closed = False
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def get(self, key, default=None):
+        with self._condition:
+            return self._data.get(key, default)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values):
+        with self._condition:
+            changed = {key: value for key, value in values.items() if self._data.get(key) != value}
+            if not changed:
+                return
+            self._data.update(changed)
+            self._dirty = True
+            self._version += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='preferences-writer', daemon=True)
+                self._writer.start()
+            self._condition.notify()
+
+    def snapshot(self):
+        with self._condition:
+            return dict(self._data)
+
+    def flush(self):
+        """Write pending changes now, on the calling thread."""
+        # Snapshot and write under one lock so an older snapshot can never
+        # replace a newer one on disk
+        with self._write_lock:
+            with self._condition:
+                if not self._dirty:
+                    return
+                data = dict(self._data)
+                self._dirty = False
+            save_preferences(data, self.path)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.flush()
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Debounce: keep waiting while changes keep arriving
+                version = self._version
+                while True:
+                    self._condition.wait(self.delay)
+                    if self._closed or self._version == version:
+                        break
+                    version = self._version
+            try:
+                self.flush()
+            except OSError:
+                # Keep the changes pending and retry after the next delay
+                with self._condition:
+                    self._dirty = True
@@ -1,6 +1,7 @@
 import random
 from collections import Counter
 from statistics import median, stdev
+from src.errors import FinderError
 
 # Define the number of recent contests to consider
 N_RECENT_CONTESTS = 50
@@ -84,7 +85,7 @@ class RecommendationEngine:
         solved_ratings, failed_tags = self.analyze_submissions()
         
         if not solved_ratings:
-            raise Exception("Not enough data to determine solved ratings.")
+            raise FinderError("Not enough data to determine solved ratings.")
             
         rating_median = median(solved_ratings)
         rating_stdev = stdev(solved_ratings) if len(solved_ratings) > 1 else 0
@@ -113,7 +114,7 @@ class RecommendationEngine:
         solved_ratings, _ = self.analyze_submissions()
         
         if not solved_ratings:
-            raise Exception("Not enough data to determine solved ratings.")
+            raise FinderError("Not enough data to determine solved ratings.")
             
         rating_median = median(solved_ratings)
         rating_stdev = stdev(solved_ratings) if len(solved_ratings) > 1 else 0
@@ -0,0 +1,318 @@
+"""Local HTTP service that serves picks, recommendations and stats to many users.
+
+Runs on asyncio with only the standard library:
+
+    python cli.py serve --port 8080
+
+    GET /pick?handle=tourist&min_rating=1500&max_rating=1900&count=3&tags=dp,graphs
+    GET /recommend?handle=tourist&type=warmup
+    GET /stats?handle=tourist
+    GET /metrics
+
+One problem catalog is held in memory for every user and submissions are
+cached per handle. Concurrent requests that need the same upstream data share
+a single Codeforces call, and the number of calls in flight is bounded.
+/metrics reports request latency percentiles per endpoint.
+"""
+import asyncio
+import json
+import random
+import logging
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit, parse_qs
+from src.codeforces_api import CodeforcesClient, NetworkError
+from src.errors import FinderError
+from src.snapshot import SnapshotMissing
+from src.finder import (ProblemFinder, compute_stats, RECOMMENDATION_TYPES, DEFAULT_MIN_RATING,
+                        DEFAULT_MAX_RATING, DEFAULT_CONTEST_LIMIT)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+CATALOG_MAX_AGE = 60 * 60
+SUBMISSIONS_MAX_AGE = 5 * 60
+MAX_CACHED_HANDLES = 1000
+MAX_UPSTREAM_REQUESTS = 4
+LATENCY_WINDOW = 10000
+MAX_HEADER_LINES = 100
+MAX_PICK_COUNT = 50
+
+logger = logging.getLogger(__name__)
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               422: 'Unprocessable Entity', 500: 'Internal Server Error', 502: 'Bad Gateway'}
+
+
+class BadRequest(Exception):
+    pass
+
+
+class LatencyRecorder:
+    """Keeps the most recent request latencies per endpoint"""
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, endpoint, seconds):
+        self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def percentiles(self):
+        report = {}
+        for endpoint, samples in self.samples.items():
+            ordered = sorted(samples)
+
+            def percentile(p):
+                return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+            report[endpoint] = {
+                'count': self.counts[endpoint],
+                'p50_ms': percentile(50),
+                'p90_ms': percentile(90),
+                'p99_ms': percentile(99),
+                'max_ms': ordered[-1] * 1000,
+            }
+        return report
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call"""
+    def __init__(self):
+        self.in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key, fn):
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        self.calls += 1
+        future = asyncio.ensure_future(fn())
+        self.in_flight[key] = future
+        future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+class _PrefetchedClient:
+    """Gives ProblemFinder data the service has already fetched"""
+    def __init__(self, catalog, submissions):
+        self.catalog = catalog
+        self.submissions = submissions
+
+    def get_problems(self):
+        return self.catalog
+
+    def get_user_submissions(self, handle):
+        return self.submissions
+
+
+class FinderService:
+    """Shared catalog, per-handle submission cache and the request handlers"""
+    def __init__(self, client=None, catalog_max_age=CATALOG_MAX_AGE, submissions_max_age=SUBMISSIONS_MAX_AGE,
+                 max_cached_handles=MAX_CACHED_HANDLES, max_upstream_requests=MAX_UPSTREAM_REQUESTS):
+        self.client = client or CodeforcesClient()
+        self.catalog_max_age = catalog_max_age
+        self.submissions_max_age = submissions_max_age
+        self.max_cached_handles = max_cached_handles
+        self.upstream = asyncio.Semaphore(max_upstream_requests)
+        self.flights = SingleFlight()
+        self.latency = LatencyRecorder()
+        self.catalog = None
+        self.catalog_fetched_at = 0
+        self.submissions = OrderedDict()
+        self.rng = random.Random()
+
+    async def _call_upstream(self, fn, *args):
+        async with self.upstream:
+            # The client is blocking, so run it on the default executor
+            return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _compute(self, fn, *args):
+        # Scanning the catalog and building stats is CPU-bound; off the loop
+        # thread other connections keep being served meanwhile
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def get_catalog(self):
+        if self.catalog is None or time.monotonic() - self.catalog_fetched_at > self.catalog_max_age:
+            async def fetch():
+                catalog = await self._call_upstream(self.client.get_problems)
+                self.catalog, self.catalog_fetched_at = catalog, time.monotonic()
+                return catalog
+            return await self.flights.run('catalog', fetch)
+        return self.catalog
+
+    async def get_submissions(self, handle):
+        key = handle.lower()
+        cached = self.submissions.get(key)
+        if cached is not None and time.monotonic() - cached[1] <= self.submissions_max_age:
+            self.submissions.move_to_end(key)
+            return cached[0]
+
+        async def fetch():
+            submissions = await self._call_upstream(self.client.get_user_submissions, handle)
+            self.submissions[key] = (submissions, time.monotonic())
+            self.submissions.move_to_end(key)
+            while len(self.submissions) > self.max_cached_handles:
+                self.submissions.popitem(last=False)
+            return submissions
+        return await self.flights.run(('submissions', key), fetch)
+
+    async def pick(self, params):
+        handle = _required(params, 'handle')
+        finder = ProblemFinder(_int(params, 'min_rating', DEFAULT_MIN_RATING),
+                               _int(params, 'max_rating', DEFAULT_MAX_RATING),
+                               _int(params, 'contest_limit', DEFAULT_CONTEST_LIMIT),
+                               _list(params, 'tags'),
+                               client=await self._prefetched(handle))
+        count = min(_int(params, 'count', 1, minimum=1), MAX_PICK_COUNT)
+        return {'handle': handle, 'problems': await self._compute(finder.pick, handle, count, self.rng)}
+
+    async def recommend(self, params):
+        handle = _required(params, 'handle')
+        recommendation_type = params.get('type', 'practice')
+        if recommendation_type not in RECOMMENDATION_TYPES:
+            raise BadRequest(f"type must be one of {', '.join(RECOMMENDATION_TYPES)}")
+        finder = ProblemFinder(0, DEFAULT_MAX_RATING, 1000, client=await self._prefetched(handle))
+        return {'handle': handle, 'problems': await self._compute(finder.find, handle, recommendation_type)}
+
+    async def stats(self, params):
+        handle = _required(params, 'handle')
+        return await self._compute(compute_stats, handle, await self.get_submissions(handle))
+
+    async def metrics(self, params):
+        return {
+            'latency': self.latency.percentiles(),
+            'upstream': {'calls': self.flights.calls, 'coalesced': self.flights.coalesced},
+            'cached_handles': len(self.submissions),
+        }
+
+    async def _prefetched(self, handle):
+        catalog, submissions = await asyncio.gather(self.get_catalog(), self.get_submissions(handle))
+        return _PrefetchedClient(catalog, submissions)
+
+    def routes(self):
+        return {'/pick': self.pick, '/recommend': self.recommend, '/stats': self.stats, '/metrics': self.metrics}
+
+    async def handle_request(self, method, target):
+        """Return (status, body) for one request"""
+        url = urlsplit(target)
+        handler = self.routes().get(url.path)
+        if handler is None:
+            return 404, {'error': f"Unknown path {url.path}"}
+        if method != 'GET':
+            return 405, {'error': "Only GET is supported"}
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        begin = time.perf_counter()
+        try:
+            return 200, await handler(params)
+        except BadRequest as e:
+            return 400, {'error': str(e)}
+        except (NetworkError, SnapshotMissing) as e:
+            return 502, {'error': str(e)}
+        except FinderError as e:
+            # Unknown handle, no matching problems and the like
+            return 422, {'error': str(e)}
+        except Exception:
+            # A bug rather than a problem with the request
+            logger.exception("Error handling %s", target)
+            return 500, {'error': "Internal server error"}
+        finally:
+            self.latency.record(url.path, time.perf_counter() - begin)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    # The stream can't be trusted past a malformed head
+                    await write_response(writer, 400, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                status, body = await self.handle_request(method, target)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await write_response(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _required(params, name):
+    if not params.get(name):
+        raise BadRequest(f"Missing parameter {name}")
+    return params[name]
+
+
+def _int(params, name, default, minimum=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise BadRequest(f"{name} must be at least {minimum}")
+    return value
+
+
+def _list(params, name):
+    value = params.get(name)
+    return [item for item in value.split(',') if item] if value else None
+
+
+async def read_request(reader):
+    """Read one HTTP/1.1 request head; returns (method, target, headers) or None at EOF"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise BadRequest("Malformed request line")
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise BadRequest("Malformed Content-Length")
+    if length < 0:
+        raise BadRequest("Malformed Content-Length")
+    if length:
+        await reader.readexactly(length)
+    return method, target, headers
+
+
+async def write_response(writer, status, body, keep_alive=True):
+    payload = json.dumps(body).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + payload)
+    await writer.drain()
+
+
+async def start_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, client=None):
+    async def run():
+        server = await start_server(FinderService(client), host, port)
+        print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
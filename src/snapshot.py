@@ -0,0 +1,165 @@
+import os
+import re
+import json
+import threading
+import time
+from src.catalog_file import CatalogFormatError, MappedCatalog, write_catalog
+from src.utils import get_cache_dir, write_json_atomic
+
+SNAPSHOT_DIR_NAME = 'snapshot'
+MANIFEST_FILE = 'manifest.json'
+CATALOG_FILE = 'catalog-{}.bin'
+CONTESTS_FILE = 'contests-{}.json'
+SUBMISSIONS_DIR = 'submissions'
+
+
+class SnapshotMissing(Exception):
+    pass
+
+
+def format_age(seconds):
+    """Human readable age like 'just now', '5 min ago', '3 h ago' or '2 days ago'"""
+    if seconds < 60:
+        return 'just now'
+    if seconds < 3600:
+        return f'{int(seconds // 60)} min ago'
+    if seconds < 86400:
+        return f'{int(seconds // 3600)} h ago'
+    return f'{int(seconds // 86400)} days ago'
+
+
+class Snapshot:
+    """Local copy of the Codeforces data the app needs to work offline.
+
+    The problem catalog is stored in the binary format of src.catalog_file
+    and memory-mapped on load, so it is usable without parsing. It is saved
+    together with the contest list as one generation; the manifest names the
+    current generation, so readers never see a catalog from one refresh and
+    contests from another, and a mapped file is never overwritten while in
+    use. Submissions are stored per handle. The manifest also records when
+    each part was fetched so the age can be shown without reading the data.
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(get_cache_dir(), SNAPSHOT_DIR_NAME)
+        os.makedirs(os.path.join(self.directory, SUBMISSIONS_DIR), exist_ok=True)
+        self._lock = threading.Lock()
+        self._catalog = None
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def _submissions_path(self, handle):
+        safe_handle = re.sub(r'[^a-z0-9_.-]', '_', handle.lower())
+        return self._path(SUBMISSIONS_DIR, f'{safe_handle}.json')
+
+    def manifest(self):
+        try:
+            with open(self._path(MANIFEST_FILE), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {'catalog': None, 'submissions': {}}
+
+    def _update_manifest(self, update):
+        with self._lock:
+            manifest = self.manifest()
+            update(manifest)
+            write_json_atomic(self._path(MANIFEST_FILE), manifest)
+
+    def save_catalog(self, problems, contests, contests_fetched_at=None):
+        fetched_at = time.time()
+        contests_fetched_at = contests_fetched_at or fetched_at
+        generation = int(fetched_at * 1000)
+        write_catalog(self._path(CATALOG_FILE.format(generation)), problems, fetched_at)
+        write_json_atomic(self._path(CONTESTS_FILE.format(generation)), contests)
+        # Written and fsynced by us, so it never needs the checksum pass
+        self._update_manifest(lambda manifest: manifest.update(
+            generation=generation, verified=generation, catalog=fetched_at, contests=contests_fetched_at))
+        self._remove_old_generations(generation)
+
+    def _remove_old_generations(self, current):
+        keep = {CATALOG_FILE.format(current), CONTESTS_FILE.format(current)}
+        for file_name in os.listdir(self.directory):
+            if file_name in keep or not re.fullmatch(r'(catalog|contests)-\d+\.(bin|json)', file_name):
+                continue
+            try:
+                os.remove(self._path(file_name))
+            except OSError:
+                # Still mapped by a reader on platforms that lock open files
+                pass
+
+    def load_contests(self):
+        """Return (contests, fetched_at)"""
+        manifest = self.manifest()
+        try:
+            with open(self._path(CONTESTS_FILE.format(manifest['generation'])), 'r') as file:
+                contests = json.load(file)
+        except (KeyError, OSError, ValueError):
+            raise SnapshotMissing("No offline snapshot of the contest list yet")
+        return contests, manifest.get('contests', manifest['catalog'])
+
+    def load_catalog(self):
+        """Return (problems, fetched_at) where problems is a MappedCatalog"""
+        manifest = self.manifest()
+        generation = manifest.get('generation')
+        if generation is None:
+            raise SnapshotMissing("No offline snapshot of the problem catalog yet")
+        path = self._path(CATALOG_FILE.format(generation))
+        # The checksum reads every page of the file, which would defeat the
+        # lazy mapping; a generation is checked once, when first adopted
+        verify = manifest.get('verified') != generation
+        with self._lock:
+            if self._catalog is None or self._catalog.path != path:
+                try:
+                    self._catalog = MappedCatalog(path, verify=verify)
+                except (OSError, ValueError, CatalogFormatError):
+                    raise SnapshotMissing("The offline snapshot of the problem catalog is unreadable")
+            else:
+                verify = False
+        if verify:
+            def mark_verified(manifest):
+                if manifest.get('generation') == generation:
+                    manifest['verified'] = generation
+            self._update_manifest(mark_verified)
+        return self._catalog, self._catalog.fetched_at
+
+    def save_submissions(self, handle, submissions):
+        fetched_at = time.time()
+        write_json_atomic(self._submissions_path(handle), {
+            'handle': handle,
+            'fetched_at': fetched_at,
+            'submissions': submissions,
+        })
+        self._update_manifest(lambda manifest: manifest.setdefault('submissions', {}).update(
+            {handle.lower(): fetched_at}))
+
+    def load_submissions(self, handle):
+        """Return (submissions, fetched_at)"""
+        try:
+            with open(self._submissions_path(handle), 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            raise SnapshotMissing(f"No offline snapshot of submissions for {handle} yet")
+        return data['submissions'], data['fetched_at']
+
+    def fetched_at(self, handle=None):
+        """Time of the oldest part of the snapshot a query for handle would use"""
+        manifest = self.manifest()
+        times = [manifest.get('catalog')]
+        if handle:
+            times.append(manifest.get('submissions', {}).get(handle.lower()))
+        if any(t is None for t in times):
+            return None
+        return min(times)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Return the process-wide Snapshot"""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = Snapshot()
+        return _snapshot
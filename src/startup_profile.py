@@ -0,0 +1,190 @@
+"""Startup profiling mode.
+
+Enabled with ``--profile-startup [REPORT]`` on the command line or the
+CF_FINDER_PROFILE_STARTUP environment variable. It records how long every
+module import takes and when the first window is shown and painted, and
+writes the results to a JSON report once the window has painted.
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+PROFILE_FLAG = '--profile-startup'
+PROFILE_ENV = 'CF_FINDER_PROFILE_STARTUP'
+DEFAULT_REPORT_PATH = 'startup-profile.json'
+
+_profiler = None
+
+
+class _TimedLoader:
+    """Loader proxy that times module execution, then gets out of the way."""
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+        self.create_seconds = 0.0
+
+    def create_module(self, spec):
+        # Extension modules do their real work (dlopen, init) here
+        begin = time.perf_counter()
+        try:
+            return self.loader.create_module(spec)
+        finally:
+            self.create_seconds = time.perf_counter() - begin
+
+    def exec_module(self, module):
+        # Put the real loader back before anything can observe the proxy
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        with self.profiler.time_import(module.__name__, self.create_seconds):
+            self.loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _ImportTimer:
+    """Meta path finder that wraps the loaders found by the finders after it."""
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self, report_path=DEFAULT_REPORT_PATH):
+        self.report_path = report_path
+        self.start = time.perf_counter()
+        self.imports = []
+        self.phases = {}
+        self.marks = {}
+        self._stack = []
+        self._finder = _ImportTimer(self)
+
+    def install(self):
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def time_import(self, name, create_seconds=0.0):
+        # Children are timed inside their parent, so self time is the
+        # cumulative time minus whatever nested imports took.
+        self._stack.append(0.0)
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - begin + create_seconds
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports.append({
+                'module': name,
+                'cumulative_ms': elapsed * 1000,
+                'self_ms': (elapsed - children) * 1000,
+                'depth': len(self._stack),
+            })
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - begin) * 1000
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.start) * 1000
+
+    def report(self):
+        top_level = [entry for entry in self.imports if entry['depth'] == 0]
+        return {
+            'python': sys.version.split()[0],
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'total_import_ms': sum(entry['cumulative_ms'] for entry in top_level),
+            'marks_ms': self.marks,
+            'phases_ms': self.phases,
+            'slowest_imports': sorted(self.imports, key=lambda entry: entry['self_ms'], reverse=True)[:25],
+            'imports': self.imports,
+        }
+
+    def write_report(self):
+        with open(self.report_path, 'w') as file:
+            json.dump(self.report(), file, indent=4)
+
+
+def start_from_argv(argv):
+    """Enable profiling if requested; strips the profiling flag from argv."""
+    global _profiler
+    report_path = os.environ.get(PROFILE_ENV)
+    if PROFILE_FLAG in argv:
+        position = argv.index(PROFILE_FLAG)
+        del argv[position]
+        if position < len(argv) and not argv[position].startswith('-'):
+            report_path = argv.pop(position)
+        else:
+            report_path = report_path or DEFAULT_REPORT_PATH
+    if not report_path:
+        return None
+    _profiler = StartupProfiler(report_path)
+    _profiler.install()
+    return _profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+@contextmanager
+def profile_phase(name):
+    """Time a startup phase; a no-op unless profiling is enabled."""
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.phase(name):
+            yield
+
+
+def mark(name):
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def watch_first_paint(window, on_painted=None):
+    """Record first show/paint of window and write the report once painted.
+
+    on_painted is called after the first paint even when profiling is off.
+    """
+    if _profiler is None and on_painted is None:
+        return
+    from PyQt5.QtCore import QObject, QEvent
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                if _profiler is not None:
+                    _profiler.mark('first_paint')
+                    _profiler.uninstall()
+                    _profiler.write_report()
+                if on_painted is not None:
+                    on_painted()
+            return False
+
+    window._first_paint_filter = _FirstPaintFilter(window)
+    window.installEventFilter(window._first_paint_filter)
@@ -1,16 +1,42 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QLabel, QFrame, QScrollArea)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import requests
-from collections import defaultdict
 import numpy as np
+from src.chart_canvas import CachedFigureCanvas, data_key
+from src.task_pool import Task, TaskSignals, PRIORITY_BACKGROUND, get_task_pool
+from src.codeforces_api import CodeforcesClient
+from src.finder import compute_stats
+
+class StatsTaskSignals(TaskSignals):
+    finished = pyqtSignal(dict)
+    used_snapshot = pyqtSignal(float)
+
+class StatsTask(Task):
+    """Downloads a user's submissions and aggregates them off the GUI thread."""
+    signals_class = StatsTaskSignals
+
+    def __init__(self, username, offline=False, priority=PRIORITY_BACKGROUND):
+        super().__init__(priority)
+        self.username = username
+        self.client = CodeforcesClient(offline, on_snapshot_used=self.signals.used_snapshot.emit)
+
+    def execute(self):
+        submissions = self.client.get_user_submissions(self.username)
+        if self.is_cancelled():
+            return {}
+        return compute_stats(self.username, submissions)
 
 class StatsPage(QWidget):
+    used_snapshot = pyqtSignal(float)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.username = ""
+        self.offline = False
+        self.stats_task = None
+        self.stats = None
+        self.chart_colors = {'background': 'white', 'foreground': 'black'}
         self.initUI()
         
     def initUI(self):
@@ -26,6 +52,12 @@ class StatsPage(QWidget):
         self.refresh_btn = QPushButton("Refresh Stats")
         self.refresh_btn.clicked.connect(self.refresh_stats)
         header_layout.addWidget(self.refresh_btn)
+        
+        # Cancel button, only visible while stats are loading
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_refresh)
+        self.cancel_btn.hide()
+        header_layout.addWidget(self.cancel_btn)
         header_layout.addStretch()
         
         layout.addLayout(header_layout)
@@ -40,7 +72,7 @@ class StatsPage(QWidget):
         tags_frame = QFrame()
         tags_frame.setFrameStyle(QFrame.StyledPanel)
         tags_layout = QVBoxLayout(tags_frame)
-        self.tags_canvas = FigureCanvas(plt.Figure(figsize=(8, 8)))
+        self.tags_canvas = CachedFigureCanvas(plt.Figure(figsize=(8, 8)))
         tags_layout.addWidget(self.tags_canvas)
         charts_layout.addWidget(tags_frame)
         
@@ -48,7 +80,7 @@ class StatsPage(QWidget):
         rating_frame = QFrame()
         rating_frame.setFrameStyle(QFrame.StyledPanel)
         rating_layout = QVBoxLayout(rating_frame)
-        self.rating_canvas = FigureCanvas(plt.Figure(figsize=(10, 6)))
+        self.rating_canvas = CachedFigureCanvas(plt.Figure(figsize=(10, 6)))
         rating_layout.addWidget(self.rating_canvas)
         charts_layout.addWidget(rating_frame)
         
@@ -71,83 +103,84 @@ class StatsPage(QWidget):
     def refresh_stats(self):
         if not self.username:
             return
-            
-        try:
-            # Fetch user submission data
-            submissions = self.fetch_user_submissions()
-            if not submissions:
-                return
-                
-            # Process the data
-            tags_data, rating_data = self.process_submissions(submissions)
-            
-            # Update charts
-            self.update_tags_chart(tags_data)
-            self.update_rating_chart(rating_data)
-            
-            # Update summary stats
-            total_solved = len({(sub['problem']['contestId'], sub['problem']['index']) 
-                              for sub in submissions if sub['verdict'] == 'OK'})
-            max_rating = max((sub['problem'].get('rating', 0) for sub in submissions 
-                            if sub['verdict'] == 'OK' and 'rating' in sub['problem']), default=0)
-            
-            self.stats_label.setText(
-                f"Total Problems Solved: {total_solved} | "
-                f"Maximum Rating Solved: {max_rating}"
-            )
-            
-        except Exception as e:
-            self.stats_label.setText(f"Error fetching stats: {str(e)}")
+        
+        # Only the latest request matters; drop any load still in flight
+        self.cancel_refresh()
+        self.set_loading(True)
+        self.stats_label.setText(f"Loading stats for {self.username}...")
+        
+        task = StatsTask(self.username, self.offline)
+        task.used_snapshot.connect(self.used_snapshot)
+        task.finished.connect(lambda stats: self.on_stats_loaded(task, stats))
+        task.error.connect(lambda message: self.on_stats_error(task, message))
+        self.stats_task = task
+        get_task_pool().submit(task)
+    
+    def set_offline(self, offline):
+        self.offline = offline
+    
+    def cancel_refresh(self):
+        if self.stats_task is not None:
+            self.stats_task.cancel()
+            self.stats_task = None
+            self.set_loading(False)
+            self.stats_label.setText("Stats loading cancelled")
     
-    def fetch_user_submissions(self):
-        url = f"https://codeforces.com/api/user.status?handle={self.username}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()['result']
-        return None
-        
-    def process_submissions(self, submissions):
-        # Process tags
-        tags_counter = defaultdict(int)
-        # Process ratings
-        rating_counter = defaultdict(int)
-        
-        # Track unique problems
-        solved_problems = set()
-        
-        for submission in submissions:
-            if submission['verdict'] == 'OK':
-                problem = submission['problem']
-                problem_id = (problem['contestId'], problem['index'])
-                
-                # Only count each problem once
-                if problem_id not in solved_problems:
-                    solved_problems.add(problem_id)
-                    
-                    # Count tags
-                    for tag in problem.get('tags', []):
-                        tags_counter[tag] += 1
-                    
-                    # Count ratings
-                    if 'rating' in problem:
-                        rating = problem['rating']
-                        rating_counter[rating] += 1
-        
-        return dict(tags_counter), dict(rating_counter)
+    def set_loading(self, loading):
+        self.refresh_btn.setEnabled(not loading)
+        self.cancel_btn.setVisible(loading)
+    
+    def on_stats_loaded(self, task, stats):
+        # A result may already be queued when the task gets cancelled
+        if task is not self.stats_task:
+            return
+        self.stats_task = None
+        self.stats = stats
+        self.set_loading(False)
+        
+        # Update charts
+        self.update_tags_chart(stats['tags_data'])
+        self.update_rating_chart(stats['rating_data'])
+        
+        # Update summary stats
+        self.stats_label.setText(
+            f"Total Problems Solved: {stats['total_solved']} | "
+            f"Maximum Rating Solved: {stats['max_rating']}"
+        )
+    
+    def on_stats_error(self, task, error_message):
+        if task is not self.stats_task:
+            return
+        self.stats_task = None
+        self.set_loading(False)
+        self.stats_label.setText(f"Error fetching stats: {error_message}")
+    
+    def set_chart_colors(self, colors):
+        self.chart_colors = colors
+        if self.stats is not None:
+            self.update_tags_chart(self.stats['tags_data'])
+            self.update_rating_chart(self.stats['rating_data'])
     
     def update_tags_chart(self, tags_data):
+        # Nothing to do if the chart already shows this data
+        key = data_key(tags_data, self.chart_colors)
+        background = self.chart_colors['background']
+        foreground = self.chart_colors['foreground']
+        if not self.tags_canvas.needs_update(key):
+            return
+        
         # Clear previous figure
         self.tags_canvas.figure.clear()
         
-        # Create figure with white background
-        self.tags_canvas.figure.set_facecolor('white')
+        # Create figure with the theme background
+        self.tags_canvas.figure.set_facecolor(background)
         
         # Create gridspec with more space for legend
         gs = self.tags_canvas.figure.add_gridspec(1, 2, width_ratios=[1, 1.2])
         
         # Create pie chart
         ax_pie = self.tags_canvas.figure.add_subplot(gs[0])
-        ax_pie.set_facecolor('white')
+        ax_pie.set_facecolor(background)
         
         # Sort tags by count
         sorted_tags = dict(sorted(tags_data.items(), key=lambda x: x[1], reverse=True))
@@ -173,11 +206,11 @@ class StatsPage(QWidget):
                 # autopct=lambda pct: f'{pct:.1f}%' if pct > 4 else '')  # Only show percentages > 4%
         
         # Add title
-        ax_pie.set_title("Problem Tags Distribution", pad=10, size=12, weight='bold')
+        ax_pie.set_title("Problem Tags Distribution", pad=10, size=12, weight='bold', color=foreground)
         
         # Create custom legend
         ax_legend = self.tags_canvas.figure.add_subplot(gs[1])
-        ax_legend.set_facecolor('white')
+        ax_legend.set_facecolor(background)
         ax_legend.axis('off')
         
         # Create legend entries with more compact format
@@ -195,23 +228,32 @@ class StatsPage(QWidget):
                         bbox_to_anchor=(0, 0.5),
                         frameon=False,
                         fontsize=8,
+                        labelcolor=foreground,
                         ncol=1 if len(legend_labels) > 15 else 2)  # Use 2 columns if fewer items
         
         # Adjust layout with more padding
         self.tags_canvas.figure.tight_layout(pad=1.5)
         
         # Draw the updated chart
+        self.tags_canvas.set_content_key(key)
         self.tags_canvas.draw()
         
         
     def update_rating_chart(self, rating_data):
+        # Nothing to do if the chart already shows this data
+        key = data_key(rating_data, self.chart_colors)
+        background = self.chart_colors['background']
+        foreground = self.chart_colors['foreground']
+        if not self.rating_canvas.needs_update(key):
+            return
+        
         # Clear previous figure
         self.rating_canvas.figure.clear()
         
-        # Create figure with white background
-        self.rating_canvas.figure.set_facecolor('white')
+        # Create figure with the theme background
+        self.rating_canvas.figure.set_facecolor(background)
         ax = self.rating_canvas.figure.add_subplot(111)
-        ax.set_facecolor('white')
+        ax.set_facecolor(background)
         
         # Create rating ranges from 800 to max rating in steps of 100
         max_rating = max(rating_data.keys(), default=3500)  # Using default for Python 3.4+
@@ -241,7 +283,7 @@ class StatsPage(QWidget):
             if height > 0:  # Only show label if there are problems
                 ax.text(bar.get_x() + bar.get_width()/2., height,
                     f'{int(height)}',
-                    ha='center', va='bottom')
+                    ha='center', va='bottom', color=foreground)
             # **Optional: Show 0 for empty ranges if desired**
             # else:
             #     ax.text(bar.get_x() + bar.get_width()/2., 0,
@@ -249,13 +291,14 @@ class StatsPage(QWidget):
             #            ha='center', va='bottom')
         
         # Customize the chart
-        ax.set_title("Problems Solved by Rating", pad=20, size=14, weight='bold')
-        ax.set_xlabel("Problem Rating", size=12)
-        ax.set_ylabel("Number of Problems", size=12)
+        ax.set_title("Problems Solved by Rating", pad=20, size=14, weight='bold', color=foreground)
+        ax.set_xlabel("Problem Rating", size=12, color=foreground)
+        ax.set_ylabel("Number of Problems", size=12, color=foreground)
         
         # Ensure all x-axis labels are shown
         ax.set_xticks(rating_ranges)
         ax.tick_params(axis='x', rotation=45)
+        ax.tick_params(colors=foreground)
         
         # Add grid for better readability
         ax.grid(True, axis='y', linestyle='--', alpha=0.3)
@@ -263,11 +306,14 @@ class StatsPage(QWidget):
         # Remove top and right spines
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_color(foreground)
+        ax.spines['bottom'].set_color(foreground)
         
         # Set background color
-        ax.set_facecolor('white')
+        ax.set_facecolor(background)
         
         # Adjust layout to prevent label cutoff
         self.rating_canvas.figure.tight_layout()
         
+        self.rating_canvas.set_content_key(key)
         self.rating_canvas.draw()
\ No newline at end of file
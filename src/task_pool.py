@@ -0,0 +1,116 @@
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+# Interactive work (a query the user is waiting on) is dequeued before
+# background refreshes when the pool is saturated.
+PRIORITY_BACKGROUND = 0
+PRIORITY_INTERACTIVE = 10
+
+
+class TaskSignals(QObject):
+    """Signals shared by every task; subclasses add their own typed result signals."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    done = pyqtSignal()
+
+
+class Task(QRunnable):
+    """A unit of background work submitted to the shared TaskPool.
+
+    Subclasses implement execute() and may set signals_class to a TaskSignals
+    subclass that declares a more specific ``finished`` signature.
+    """
+    signals_class = TaskSignals
+
+    def __init__(self, priority=PRIORITY_BACKGROUND):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.priority = priority
+        self.signals = self.signals_class()
+        self._cancelled = False
+
+    @property
+    def finished(self):
+        return self.signals.finished
+
+    @property
+    def error(self):
+        return self.signals.error
+
+    def __getattr__(self, name):
+        # Expose extra signals declared by subclasses, e.g. task.progress
+        signals = self.__dict__.get('signals')
+        if signals is not None and hasattr(type(signals), name):
+            return getattr(signals, name)
+        raise AttributeError(name)
+
+    def cancel(self):
+        """Request cancellation; results of a cancelled task are never emitted."""
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def execute(self):
+        raise NotImplementedError
+
+    def run(self):
+        try:
+            if self._cancelled:
+                return
+            try:
+                result = self.execute()
+            except Exception as e:
+                if not self._cancelled:
+                    self.signals.error.emit(str(e))
+            else:
+                if not self._cancelled:
+                    self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class FunctionTask(Task):
+    """Runs a plain callable on the pool."""
+    def __init__(self, fn, *args, priority=PRIORITY_BACKGROUND, **kwargs):
+        super().__init__(priority)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def execute(self):
+        return self.fn(*self.args, **self.kwargs)
+
+
+class TaskPool:
+    """Bounded QThreadPool shared by all background work in the application."""
+    def __init__(self, max_threads=None):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads or max(4, QThread.idealThreadCount()))
+        # Keep Python references alive until the task's signals have been delivered
+        self._active = set()
+
+    def submit(self, task):
+        self._active.add(task)
+        task.signals.done.connect(lambda: self._active.discard(task))
+        self.pool.start(task, task.priority)
+        return task
+
+    def run(self, fn, *args, priority=PRIORITY_BACKGROUND, **kwargs):
+        return self.submit(FunctionTask(fn, *args, priority=priority, **kwargs))
+
+    def active_count(self):
+        return len(self._active)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+
+_task_pool = None
+
+
+def get_task_pool():
+    """Return the process-wide TaskPool, creating it on first use."""
+    global _task_pool
+    if _task_pool is None:
+        _task_pool = TaskPool()
+    return _task_pool
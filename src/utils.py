@@ -3,6 +3,14 @@ import os
 import shutil
 import webbrowser
 import json
+import tempfile
+import time
+
+APP_DIR_NAME = 'codeforces-finder'
+PREFERENCES_FILE = 'preferences.json'
+BROWSER_CACHE_FILE = 'browsers.json'
+# Backstop for changes the fingerprint can't see, like registry edits
+BROWSER_CACHE_MAX_AGE = 7 * 24 * 60 * 60
 
 def get_default_browser_name():
     """Get the name of the default system browser"""
@@ -51,12 +59,13 @@ def _detect_browsers_on_linux():
             return name
     return None
 
-def get_available_browsers():
+def get_available_browsers(default_name=None):
     """Get list of available browsers on the system"""
     browsers = {}
     
     # Add default browser first
-    default_name = get_default_browser_name()
+    if default_name is None:
+        default_name = get_default_browser_name()
     browsers[f'{default_name} (Default)'] = ''
 
     # Try to detect common browsers
@@ -70,6 +79,62 @@ def get_available_browsers():
 
     return browsers
 
+def detect_browsers():
+    """Detect the default and available browsers, probing the system once"""
+    default_name = get_default_browser_name() or 'System Browser'
+    return {
+        'default': default_name,
+        'available': get_available_browsers(default_name),
+    }
+
+def _browser_fingerprint():
+    """Cheap summary of the state browser detection depends on.
+
+    Installing or removing a browser changes the mtime of a PATH directory,
+    and changing the default browser rewrites a mimeapps.list on Linux.
+    """
+    watched = os.environ.get('PATH', '').split(os.pathsep)
+    if sys.platform.startswith('linux'):
+        config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+        watched += [os.path.join(config_home, 'mimeapps.list'), '/etc/xdg/mimeapps.list']
+    mtimes = []
+    for path in watched:
+        try:
+            mtimes.append([path, os.stat(path).st_mtime])
+        except OSError:
+            mtimes.append([path, None])
+    return {'platform': sys.platform, 'mtimes': mtimes}
+
+def load_cached_browsers(path=None):
+    """Return cached detection results, or None if missing or stale"""
+    path = path or os.path.join(get_cache_dir(), BROWSER_CACHE_FILE)
+    try:
+        with open(path, 'r') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cache.get('created_at', 0) > BROWSER_CACHE_MAX_AGE:
+        return None
+    if cache.get('fingerprint') != _browser_fingerprint():
+        return None
+    return cache.get('browsers')
+
+def get_browsers_cached(path=None):
+    """Detect browsers, reusing the on-disk cache while it is still valid"""
+    path = path or os.path.join(get_cache_dir(), BROWSER_CACHE_FILE)
+    browsers = load_cached_browsers(path)
+    if browsers is None:
+        browsers = detect_browsers()
+        try:
+            write_json_atomic(path, {
+                'created_at': time.time(),
+                'fingerprint': _browser_fingerprint(),
+                'browsers': browsers,
+            })
+        except OSError:
+            pass
+    return browsers
+
 def _get_browser_commands():
     browser_commands = {
         'Firefox': 'firefox',
@@ -81,18 +146,66 @@ def _get_browser_commands():
     }
     return browser_commands
 
-def load_preferences():
-    """Load user preferences from a JSON file"""
+def get_config_dir():
+    """Get the per-user configuration directory, creating it if needed"""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_cache_dir():
+    """Get the per-user cache directory, creating it if needed"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA') or os.path.expanduser('~')
+        path = os.path.join(base, APP_DIR_NAME, 'cache')
+    elif sys.platform == 'darwin':
+        path = os.path.join(os.path.expanduser('~/Library/Caches'), APP_DIR_NAME)
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_preferences_path():
+    return os.path.join(get_config_dir(), PREFERENCES_FILE)
+
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file next to path, then atomically replace path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
     try:
-        with open('preferences.json', 'r') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {}
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def load_preferences(path=None):
+    """Load user preferences from a JSON file"""
+    # Older versions kept preferences in the working directory
+    candidates = (path,) if path else (get_preferences_path(), PREFERENCES_FILE)
+    for candidate in candidates:
+        try:
+            with open(candidate, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            continue
+        except ValueError:
+            return {}
+    return {}
 
-def save_preferences(preferences):
+def save_preferences(preferences, path=None):
     """Save user preferences to a JSON file"""
-    with open('preferences.json', 'w') as file:
-        json.dump(preferences, file, indent=4)
+    write_json_atomic(path or get_preferences_path(), preferences)
 
 def load_bookmarks():
     """Load bookmarks from a JSON file"""
@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from unittest.mock import patch
+from PyQt5.QtWidgets import QApplication
+from src.bookmarks import BookmarkStore, get_problem_key
+from src.bookmarks_page import BookmarksPage, PAGE_SIZE
+
+def make_problem(contest_id, index='A', rating=800, tags=None):
+    return {
+        'name': f'Problem {contest_id}{index}',
+        'rating': rating,
+        'contestId': contest_id,
+        'index': index,
+        'tags': tags or [],
+        'url': f'https://codeforces.com/problemset/problem/{contest_id}/{index}'
+    }
+
+class TestBookmarkStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.legacy_path = os.path.join(self.temp_dir.name, 'bookmarks.json')
+        self.store = BookmarkStore(os.path.join(self.temp_dir.name, 'bookmarks.db'), self.legacy_path)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_add_dedupes(self):
+        problem = make_problem(1)
+        self.assertTrue(self.store.add(problem))
+        self.assertFalse(self.store.add(problem))
+        self.assertEqual(self.store.count(), 1)
+        self.assertTrue(self.store.contains(get_problem_key(problem)))
+
+    def test_remove(self):
+        problem = make_problem(1, tags=['dp'])
+        self.store.add(problem)
+        self.assertTrue(self.store.remove('1_A'))
+        self.assertFalse(self.store.remove('1_A'))
+        self.assertEqual(self.store.count(), 0)
+        self.assertEqual(self.store.tags(), [])
+
+    def test_filters_and_paging(self):
+        for i in range(1, 11):
+            self.store.add(make_problem(i, rating=800 + i * 100, tags=['math'] if i % 2 else ['dp']))
+        self.assertEqual(self.store.count(tag='math'), 5)
+        self.assertEqual(self.store.count(min_rating=1200, max_rating=1500), 4)
+        page = self.store.page(offset=0, limit=3, order='rating_desc')
+        self.assertEqual([p['rating'] for p in page], [1800, 1700, 1600])
+        page = self.store.page(offset=3, limit=3, order='rating_desc', tag='dp')
+        self.assertEqual([p['contestId'] for p in page], [4, 2])
+        self.assertEqual(self.store.tags(), ['dp', 'math'])
+
+    def test_keyset_paging_matches_offset_paging(self):
+        for i in range(1, 31):
+            # Repeated ratings and creation times, so ties decide the order
+            self.store._insert(make_problem(i, rating=800 + i % 4 * 100), created_at=1000 + i % 3)
+        for order in ('newest', 'oldest', 'rating_asc', 'rating_desc'):
+            expected = [p['key'] for p in self.store.page(limit=100, order=order, min_rating=900)]
+            seen, after = [], None
+            while True:
+                page = self.store.page(limit=7, order=order, after=after, min_rating=900)
+                if not page:
+                    break
+                seen.extend(p['key'] for p in page)
+                after = page[-1]['cursor']
+            self.assertEqual(seen, expected)
+            self.assertEqual(len(seen), 23)
+
+    def test_revision_tracks_changes(self):
+        revision = self.store.revision
+        self.store.add(make_problem(1))
+        self.store.add(make_problem(1))
+        self.assertEqual(self.store.revision, revision + 1)
+        self.store.remove('1_A')
+        self.store.remove('1_A')
+        self.assertEqual(self.store.revision, revision + 2)
+
+    def test_imports_legacy_json_once(self):
+        self.store.close()
+        path = os.path.join(self.temp_dir.name, 'migrated.db')
+        with open(self.legacy_path, 'w') as file:
+            json.dump([make_problem(5), make_problem(5), make_problem(6)], file)
+        self.store = BookmarkStore(path, self.legacy_path)
+        self.assertEqual(self.store.count(), 2)
+        self.store.remove('5_A')
+        self.store.close()
+        self.store = BookmarkStore(path, self.legacy_path)
+        self.assertEqual(self.store.count(), 1)
+
+class TestBookmarksPage(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = BookmarkStore(os.path.join(self.temp_dir.name, 'bookmarks.db'),
+                                   os.path.join(self.temp_dir.name, 'bookmarks.json'))
+        for i in range(1, PAGE_SIZE * 2 + 6):
+            self.store._insert(make_problem(i, tags=['dp']), created_at=1000 + i)
+        self.page = BookmarksPage(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_default_range_filters_nothing(self):
+        self.assertEqual(self.page.filters(), {'tag': None, 'min_rating': None, 'max_rating': None})
+        self.page.min_rating.setValue(1000)
+        self.assertEqual(self.page.filters()['min_rating'], 1000)
+
+    def test_paging(self):
+        self.assertEqual(self.page.page_problems[0]['contestId'], PAGE_SIZE * 2 + 5)
+        self.page.next_page()
+        self.page.next_page()
+        self.assertEqual([p['contestId'] for p in self.page.page_problems], [5, 4, 3, 2, 1])
+        self.assertEqual(self.page.page_label.text(), f"Page 3 of 3 ({PAGE_SIZE * 2 + 5} bookmarks)")
+        self.assertFalse(self.page.next_button.isEnabled())
+        self.page.previous_page()
+        self.assertEqual(self.page.page_problems[0]['contestId'], PAGE_SIZE + 5)
+        self.assertTrue(self.page.next_button.isEnabled())
+
+    def test_removing_the_last_row_goes_back_a_page(self):
+        for _ in range(2):
+            self.page.next_page()
+        for _ in range(5):
+            self.page.table.setCurrentCell(0, 0)
+            self.page.remove_selected()
+        self.assertEqual(self.page.page_index, 1)
+        self.assertEqual(len(self.page.page_problems), PAGE_SIZE)
+
+    def test_tags_and_counts_reload_only_after_changes(self):
+        with patch.object(self.store, 'tags', wraps=self.store.tags) as tags, \
+                patch.object(self.store, 'count', wraps=self.store.count) as count:
+            self.page.next_page()
+            self.page.previous_page()
+            self.assertEqual((tags.call_count, count.call_count), (0, 0))
+            self.store.add(make_problem(1000, tags=['graphs']))
+            self.page.refresh()
+            self.assertEqual((tags.call_count, count.call_count), (1, 1))
+        self.assertGreater(self.page.tag_combo.findData('graphs'), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.editor.build_cache import BuildCache
+from src.editor.run_code import CompilationError, run_program
+
+CPP_CODE = """#include <iostream>
+int main() { int a, b; std::cin >> a >> b; std::cout << a + b << std::endl; }
+"""
+
+class TestBuildCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = BuildCache(self.temp_dir.name, max_builds=3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reuses_builds_of_the_same_code(self):
+        first = self.cache.get('python', 'print(1)')
+        self.assertEqual(self.cache.get('python', 'print(1)'), first)
+        self.assertNotEqual(self.cache.get('python', 'print(2)'), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_incomplete_build_is_rebuilt(self):
+        command = self.cache.get('python', 'print(1)')
+        os.remove(os.path.join(os.path.dirname(command[-1]), 'command.json'))
+        self.assertEqual(self.cache.get('python', 'print(1)'), command)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_evicts_least_recently_used(self):
+        for i in range(5):
+            self.cache.get('python', f'print({i})')
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 3)
+
+    @unittest.skipUnless(shutil.which('g++'), "g++ is not installed")
+    def test_cpp_compiles_once(self):
+        command = self.cache.get('cpp', CPP_CODE)
+        self.assertEqual(run_program(command, "2 3\n").output.strip(), "5")
+        self.assertEqual(self.cache.get('cpp', CPP_CODE), command)
+        self.assertEqual(self.cache.misses, 1)
+        # Different flags are a different build
+        self.cache.get('cpp', CPP_CODE, ['-O2'])
+        self.assertEqual(self.cache.misses, 2)
+
+    @unittest.skipUnless(shutil.which('g++'), "g++ is not installed")
+    def test_compilation_error(self):
+        with self.assertRaises(CompilationError):
+            self.cache.get('cpp', 'int main( {')
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+if __name__ == '__main__':
+    unittest.main()
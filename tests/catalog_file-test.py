@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.catalog_file import CatalogFormatError, MappedCatalog, HEADER, write_catalog
+
+PROBLEMS = [
+    {'name': 'Theatre Square', 'rating': 1000, 'contestId': 1, 'index': 'A', 'tags': ['math'],
+     'url': 'https://codeforces.com/problemset/problem/1/A'},
+    {'name': 'Ünicode', 'rating': 0, 'contestId': 2, 'index': 'B1', 'tags': [],
+     'url': 'https://codeforces.com/problemset/problem/2/B1'},
+    {'name': 'Gym', 'rating': 1900, 'contestId': None, 'index': 'C', 'tags': ['dp', 'math'],
+     'url': 'https://codeforces.com/problemset/problem/None/C'},
+]
+
+class TestCatalogFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'catalog.bin')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        write_catalog(self.path, PROBLEMS, 42.5)
+        catalog = MappedCatalog(self.path)
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual(list(catalog), PROBLEMS)
+        self.assertEqual(catalog[-1], PROBLEMS[-1])
+        self.assertEqual(catalog[1:], PROBLEMS[1:])
+        self.assertEqual(catalog.fetched_at, 42.5)
+        self.assertEqual(catalog.indices_in_rating_range(900, 2000), [0, 2])
+        with self.assertRaises(IndexError):
+            catalog[3]
+        catalog.close()
+
+    def test_empty_catalog(self):
+        write_catalog(self.path, [])
+        catalog = MappedCatalog(self.path)
+        self.assertEqual(list(catalog), [])
+        catalog.close()
+
+    def test_corruption_is_detected(self):
+        write_catalog(self.path, PROBLEMS)
+        with open(self.path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'X')
+        with self.assertRaises(CatalogFormatError):
+            MappedCatalog(self.path)
+
+    def test_rejects_foreign_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"problems": []}' + b' ' * HEADER.size)
+        with self.assertRaises(CatalogFormatError):
+            MappedCatalog(self.path)
+        with open(self.path, 'wb') as file:
+            file.write(b'CF')
+        with self.assertRaises(CatalogFormatError):
+            MappedCatalog(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+from PyQt5.QtWidgets import QApplication
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.chart_canvas import CachedFigureCanvas, data_key
+from src.stats_page import StatsPage
+
+TAGS = {'math': 3, 'dp': 2, 'greedy': 1}
+RATINGS = {800: 2, 1200: 1}
+
+class TestCachedFigureCanvas(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def test_data_key(self):
+        self.assertEqual(data_key({'a': 1, 'b': 2}, 'x'), data_key({'b': 2, 'a': 1}, 'x'))
+        self.assertNotEqual(data_key({'a': 1}, 'x'), data_key({'a': 2}, 'x'))
+
+    def test_unchanged_data_is_not_redrawn(self):
+        page = StatsPage()
+        with patch.object(page.tags_canvas, 'draw', wraps=page.tags_canvas.draw) as tags_draw, \
+                patch.object(page.rating_canvas, 'draw', wraps=page.rating_canvas.draw) as rating_draw:
+            page.update_tags_chart(TAGS)
+            page.update_rating_chart(RATINGS)
+            page.update_tags_chart(dict(TAGS))
+            page.update_rating_chart(dict(RATINGS))
+            self.assertEqual((tags_draw.call_count, rating_draw.call_count), (1, 1))
+            # New colors change what the charts look like
+            page.stats = {'tags_data': TAGS, 'rating_data': RATINGS}
+            page.set_chart_colors({'background': 'black', 'foreground': 'white'})
+            self.assertEqual((tags_draw.call_count, rating_draw.call_count), (2, 2))
+
+    def test_rasters_are_reused_and_evicted_least_recently_used_first(self):
+        canvas = CachedFigureCanvas(plt.Figure(figsize=(2, 2)))
+        canvas.figure.add_subplot(111).plot([1, 2, 3])
+        with patch('src.chart_canvas.MAX_CACHED_RASTERS', 2), \
+                patch.object(FigureCanvasQTAgg, 'draw', autospec=True,
+                             side_effect=FigureCanvasQTAgg.draw) as render:
+            for key in ('a', 'b'):
+                canvas.set_content_key(key)
+                canvas.draw()
+            self.assertEqual(render.call_count, 2)
+            # A cached raster is restored without rendering the figure
+            canvas.set_content_key('a')
+            canvas.draw()
+            self.assertEqual(render.call_count, 2)
+            # 'b' is now the least recently used and makes room for 'c'
+            canvas.set_content_key('c')
+            canvas.draw()
+            self.assertEqual([key[0] for key in canvas._rasters], ['a', 'c'])
+            canvas.set_content_key('b')
+            canvas.draw()
+            self.assertEqual(render.call_count, 4)
+
+    def test_resize_back_restores_raster(self):
+        canvas = CachedFigureCanvas(plt.Figure(figsize=(2, 2)))
+        canvas.set_content_key('a')
+        canvas.draw()
+        # What the canvas' resizeEvent does
+        canvas.figure.set_size_inches(3, 2)
+        canvas.draw()
+        self.assertEqual(len(canvas._rasters), 2)
+        with patch.object(FigureCanvasQTAgg, 'draw') as render:
+            canvas.figure.set_size_inches(2, 2)
+            canvas.draw()
+        render.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
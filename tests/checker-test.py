@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import mmap
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.editor import checker
+from src.editor.checker import check, MODE_EXACT, MODE_LINES, MODE_TOKENS, MODE_FLOAT
+
+class TestChecker(unittest.TestCase):
+
+    def test_tokens_ignore_whitespace(self):
+        self.assertTrue(check("1  2\r\n3\n\n", "1 2 3"))
+        result = check("1 2\n4", "1 2\n3")
+        self.assertFalse(result)
+        self.assertEqual(result.line, 2)
+        self.assertEqual(result.message, "Line 2, token 3: expected '3', found '4'")
+
+    def test_tokens_length_mismatch(self):
+        self.assertEqual(check("1 2", "1 2 3").message, "Output ended early: expected '3' as token 3")
+        self.assertEqual(check("1 2 3 4", "1 2 3").message, "Extra output at token 4: '4'")
+        self.assertTrue(check("", " \n"))
+
+    def test_lines(self):
+        self.assertTrue(check("a b  \nc\n\n\n", "a b\nc", MODE_LINES))
+        self.assertEqual(check("a  b\nc", "a b\nc", MODE_LINES).message, "Line 1: expected 'a b', found 'a  b'")
+        self.assertEqual(check("a\nb\nc", "a\nb\n", MODE_LINES).line, 3)
+        self.assertFalse(check("a\n", "a\nb", MODE_LINES))
+
+    def test_exact(self):
+        self.assertTrue(check("a b\n", "a b\n", MODE_EXACT))
+        self.assertFalse(check("a b", "a b\n", MODE_EXACT))
+        result = check("ab\ncd", "ab\nce", MODE_EXACT)
+        self.assertEqual(result.message, "Line 2, character 5: expected 'e', found 'd'")
+
+    def test_float_tolerance(self):
+        self.assertTrue(check("0.3333333 2", "0.333333333 2.0", MODE_FLOAT))
+        # Relative error counts for large answers
+        self.assertTrue(check("1000000000.5", "1000000000", MODE_FLOAT))
+        self.assertFalse(check("0.34", "0.333", MODE_FLOAT))
+        self.assertFalse(check("0.3333", "0.333333333", MODE_FLOAT, abs_eps=1e-9, rel_eps=1e-9))
+        # Words still have to match exactly
+        self.assertFalse(check("YES 1.0", "yes 1", MODE_FLOAT))
+        self.assertFalse(check("nan", "1.0", MODE_FLOAT))
+
+    def test_large_outputs_span_chunks(self):
+        expected = "\n".join(str(i) for i in range(100000))
+        self.assertGreater(len(expected), 4 * checker.TOKEN_CHUNK)
+        self.assertTrue(check(expected.replace("\n", " "), expected))
+        result = check(expected.replace("\n77777\n", "\n77778\n"), expected)
+        self.assertEqual((result.line, result.message), (77778, "Line 77778, token 77778: expected '77777', found '77778'"))
+
+    def test_mmap_and_bytes(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"1 2\n3\n")
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self.assertTrue(check(data, b"1 2 3"))
+                self.assertEqual(check(data, b"1 2 4").line, 2)
+                self.assertTrue(check(data, b"1 2\n3\n", MODE_EXACT))
+                self.assertTrue(check(data, b"1 2\n3", MODE_LINES))
+        with self.assertRaises(TypeError):
+            check("1", b"1")
+
+if __name__ == '__main__':
+    unittest.main()
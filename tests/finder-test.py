@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+import io
+import json
+import random
+import subprocess
+import sys
+import os
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.errors import FinderError
+from src.finder import ProblemFinder, compute_stats
+from src import cli
+
+PROBLEMS = [
+    {'name': 'A', 'rating': 800, 'contestId': 3, 'index': 'A', 'tags': ['math']},
+    {'name': 'B', 'rating': 1200, 'contestId': 3, 'index': 'B', 'tags': ['dp']},
+    {'name': 'C', 'rating': 1500, 'contestId': 2, 'index': 'A', 'tags': ['dp', 'graphs']},
+    {'name': 'D', 'rating': 1900, 'contestId': 1, 'index': 'A', 'tags': ['graphs']},
+]
+SUBMISSIONS = {
+    'alice': [
+        {'verdict': 'OK', 'problem': {'contestId': 3, 'index': 'A', 'rating': 800, 'tags': ['math']}},
+        {'verdict': 'WRONG_ANSWER', 'problem': {'contestId': 3, 'index': 'B', 'rating': 1200, 'tags': ['dp']}},
+    ],
+    'bob': [],
+}
+
+class FakeClient:
+    def __init__(self):
+        self.catalog_fetches = 0
+
+    def get_problems(self):
+        self.catalog_fetches += 1
+        return PROBLEMS
+
+    def get_user_submissions(self, handle):
+        if handle not in SUBMISSIONS:
+            raise Exception("Failed to fetch user submissions")
+        return SUBMISSIONS[handle]
+
+class TestProblemFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def test_filters_solved_rating_and_tags(self):
+        finder = ProblemFinder(1000, 2000, 100, client=self.client)
+        self.assertEqual([p['name'] for p in finder.find('alice')], ['B', 'C', 'D'])
+        finder = ProblemFinder(1000, 2000, 100, tags=['graphs'], client=self.client)
+        self.assertEqual([p['name'] for p in finder.find('bob')], ['C', 'D'])
+
+    def test_contest_limit(self):
+        finder = ProblemFinder(800, 2000, 1, client=self.client)
+        self.assertEqual([p['name'] for p in finder.find('bob')], ['A'])
+
+    def test_catalog_is_shared_between_handles(self):
+        finder = ProblemFinder(client=self.client)
+        finder.find('alice')
+        finder.find('bob')
+        self.assertEqual(self.client.catalog_fetches, 1)
+
+    def test_pick_is_reproducible(self):
+        finder = ProblemFinder(client=self.client)
+        first = finder.pick('bob', 2, random.Random(7))
+        self.assertEqual(len(first), 2)
+        self.assertEqual(first, finder.pick('bob', 2, random.Random(7)))
+
+    def test_no_matches(self):
+        finder = ProblemFinder(3000, 3500, 100, client=self.client)
+        with self.assertRaises(FinderError):
+            finder.find('bob')
+
+    def test_stats(self):
+        stats = compute_stats('alice', SUBMISSIONS['alice'])
+        self.assertEqual(stats['total_solved'], 1)
+        self.assertEqual(stats['tags_data'], {'math': 1})
+        self.assertEqual(stats['max_rating'], 800)
+
+class TestCli(unittest.TestCase):
+
+    def run_cli(self, argv):
+        out = io.StringIO()
+        with patch('src.cli.CodeforcesClient', return_value=FakeClient()):
+            status = cli.main(argv, out)
+        return status, json.loads(out.getvalue())
+
+    def test_pick_for_many_handles(self):
+        status, results = self.run_cli(['pick', 'alice', 'bob', '--count', '2', '--seed', '1'])
+        self.assertEqual(status, 0)
+        self.assertEqual(set(results), {'alice', 'bob'})
+        self.assertEqual(len(results['bob']['problems']), 2)
+
+    def test_stats_and_errors(self):
+        status, results = self.run_cli(['stats', 'alice', 'nobody'])
+        self.assertEqual(status, 1)
+        self.assertEqual(results['alice']['total_solved'], 1)
+        self.assertIn('error', results['nobody'])
+
+    def test_does_not_import_qt(self):
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+        code = "import sys, src.cli; sys.exit('PyQt5' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=root).returncode, 0)
+
+if __name__ == '__main__':
+    unittest.main()
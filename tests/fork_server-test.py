@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import signal
+import threading
+import subprocess
+from unittest.mock import patch
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.editor.fork_server import ForkedProcess, ForkServerPool, WorkerError, fork_server_supported
+
+@unittest.skipUnless(fork_server_supported(), "fork server needs fork() and fd passing")
+class TestForkServerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pool = ForkServerPool(size=2, python=sys.executable)
+
+    def tearDown(self):
+        self.pool.close()
+        self.temp_dir.cleanup()
+
+    def script(self, code):
+        path = os.path.join(self.temp_dir.name, f'script{len(os.listdir(self.temp_dir.name))}.py')
+        with open(path, 'w') as f:
+            f.write(code)
+        return {'script': path}
+
+    def test_runs_script_on_input(self):
+        stdout, stderr, result, timed_out = self.pool.run(self.script("print(int(input()) * 2)"), "21\n", 5)
+        self.assertEqual((stdout, stderr, timed_out), ("42\n", "", False))
+        self.assertEqual(result['status'], 0)
+
+    def test_tests_are_isolated(self):
+        script = self.script("import math\nprint(getattr(math, 'leak', 0))\nmath.leak = 1\n")
+        self.assertEqual(self.pool.run(script, "", 5)[0], "0\n")
+        self.assertEqual(self.pool.run(script, "", 5)[0], "0\n")
+        self.assertEqual(self.pool.started, 1)
+
+    def test_errors_and_exit_codes(self):
+        stdout, stderr, result, _ = self.pool.run(self.script("raise ValueError('bad')"), "", 5)
+        self.assertIn("ValueError: bad", stderr)
+        self.assertNotIn("python_worker", stderr)
+        self.assertNotEqual(result['status'], 0)
+        _, stderr, result, _ = self.pool.run(self.script("import sys\nsys.exit(3)"), "", 5)
+        self.assertEqual(os.waitstatus_to_exitcode(result['status']), 3)
+
+    def test_timeout_kills_child(self):
+        begin = time.perf_counter()
+        _, _, _, timed_out = self.pool.run(self.script("while True: pass"), "", 0.5)
+        self.assertTrue(timed_out)
+        self.assertLess(time.perf_counter() - begin, 3)
+        # The worker is still usable afterwards
+        self.assertEqual(self.pool.run(self.script("print('ok')"), "", 5)[0], "ok\n")
+
+    def test_runs_in_reset_workspace(self):
+        script = self.script("import os\nprint(sorted(f for f in os.listdir() if not f.startswith('.')))\n"
+                             "open('scratch.txt', 'w').write('x')\n")
+        self.assertEqual(self.pool.run(script, "", 5)[0], "[]\n")
+        self.assertEqual(self.pool.run(script, "", 5)[0], "[]\n")
+        self.assertEqual(self.pool.started, 1)
+
+    def test_failed_start_frees_slot(self):
+        pool = ForkServerPool(size=1, python='/nonexistent/python')
+        for _ in range(2):
+            with self.assertRaises(WorkerError):
+                pool.run({'argv': ['cat']}, "", 5)
+        self.assertEqual(pool.started, 0)
+
+    def test_kill_before_setsid(self):
+        # Still in the parent's process group, as a child is right after fork()
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        self.addCleanup(process.wait)
+        ForkedProcess(process.pid).kill()
+        self.assertEqual(process.wait(timeout=5), -signal.SIGKILL)
+
+    def test_execs_commands(self):
+        stdout, stderr, result, timed_out = self.pool.run({'argv': ['cat']}, "echo\n", 5)
+        self.assertEqual((stdout, stderr, timed_out), ("echo\n", "", False))
+        self.assertEqual(result['status'], 0)
+        _, stderr, result, _ = self.pool.run({'argv': ['no-such-program-xyz']}, "", 5)
+        self.assertIn("Error:", stderr)
+        self.assertEqual(os.waitstatus_to_exitcode(result['status']), 127)
+
+    def test_reports_resource_usage(self):
+        _, _, result, _ = self.pool.run(self.script("x = bytearray(64 << 20)\nsum(range(10 ** 6))"), "", 10)
+        self.assertGreater(result['wall'], 0)
+        self.assertGreater(result['utime'], 0)
+        # 64 MB touched on top of what the child inherits from the worker
+        self.assertGreater(result['maxrss'], result['floor'])
+
+    def test_kill_from_another_thread(self):
+        started = []
+        threading.Timer(0.5, lambda: started[0].kill()).start()
+        _, _, result, timed_out = self.pool.run(self.script("import time\ntime.sleep(30)"), "", 10,
+                                                on_start=started.append)
+        self.assertFalse(timed_out)
+        self.assertNotEqual(result['status'], 0)
+
+    def test_kill_after_reap_is_noop(self):
+        started = []
+        self.pool.run(self.script("pass"), "", 5, on_start=started.append)
+        self.assertTrue(started[0].reaped)
+        # The pid may already belong to someone else
+        with patch('os.killpg') as killpg, patch('os.kill') as kill:
+            started[0].kill()
+        killpg.assert_not_called()
+        kill.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
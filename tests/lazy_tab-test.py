@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+from PyQt5.QtWidgets import QApplication, QLabel, QTabWidget
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.lazy_tab import LazyTab
+
+class TestLazyTab(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        self.built = []
+
+    def factory(self):
+        label = QLabel(f"page {len(self.built)}")
+        self.built.append(label)
+        return label
+
+    def test_builds_on_first_show_only(self):
+        tabs = QTabWidget()
+        tabs.addTab(QLabel("first"), "First")
+        lazy = LazyTab(self.factory)
+        created = []
+        lazy.created.connect(created.append)
+        tabs.addTab(lazy, "Lazy")
+        # Wired up the way the main window's on_tab_changed does it
+        def on_tab_changed(index):
+            tab = tabs.widget(index)
+            if isinstance(tab, LazyTab):
+                tab.widget()
+        tabs.currentChanged.connect(on_tab_changed)
+        tabs.show()
+        QApplication.processEvents()
+        self.assertFalse(lazy.is_loaded())
+        self.assertEqual(self.built, [])
+
+        tabs.setCurrentIndex(1)
+        self.assertTrue(lazy.is_loaded())
+        self.assertEqual(created, self.built)
+        # Switching away and back reuses the page
+        tabs.setCurrentIndex(0)
+        tabs.setCurrentIndex(1)
+        self.assertEqual(len(self.built), 1)
+        self.assertIs(lazy.widget(), self.built[0])
+        self.assertIs(self.built[0].parent(), lazy)
+        tabs.close()
+
+    def test_widget_builds_on_demand(self):
+        lazy = LazyTab(self.factory)
+        self.assertIs(lazy.widget(), lazy.widget())
+        self.assertEqual(len(self.built), 1)
+
+if __name__ == '__main__':
+    unittest.main()
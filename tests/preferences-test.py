@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.preferences import PreferencesStore
+from src.utils import save_preferences, load_preferences
+
+class TestPreferencesStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'preferences.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_loads_existing_file(self):
+        save_preferences({'theme': 'Nord'}, self.path)
+        store = PreferencesStore(self.path)
+        self.assertEqual(store.get('theme'), 'Nord')
+        self.assertIsNone(store.get('browser'))
+
+    def test_set_is_in_memory_until_flush(self):
+        store = PreferencesStore(self.path, delay=60)
+        store.set('browser', 'Firefox')
+        self.assertEqual(store.get('browser'), 'Firefox')
+        self.assertFalse(os.path.exists(self.path))
+        store.flush()
+        with open(self.path) as file:
+            self.assertEqual(json.load(file), {'browser': 'Firefox'})
+        store.close()
+
+    def test_rapid_changes_are_coalesced(self):
+        with patch('src.preferences.save_preferences') as mock_save:
+            store = PreferencesStore(self.path, delay=0.05)
+            for theme in ['Light', 'Nord', 'Dracula', 'Monokai']:
+                store.set('theme', theme)
+            store._writer.join(0.5)
+            store.close()
+        mock_save.assert_called_once_with({'theme': 'Monokai'}, self.path)
+
+    def test_unchanged_value_does_not_write(self):
+        save_preferences({'theme': 'Nord'}, self.path)
+        with patch('src.preferences.save_preferences') as mock_save:
+            store = PreferencesStore(self.path)
+            store.set('theme', 'Nord')
+            store.flush()
+        mock_save.assert_not_called()
+
+    def test_save_replaces_atomically(self):
+        save_preferences({'a': 1}, self.path)
+        save_preferences({'a': 2}, self.path)
+        self.assertEqual(load_preferences(self.path), {'a': 2})
+        self.assertEqual(os.listdir(self.temp_dir.name), ['preferences.json'])
+
+if __name__ == '__main__':
+    unittest.main()
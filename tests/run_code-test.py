@@ -0,0 +1,203 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import time
+import shutil
+import pathlib
+import tempfile
+
+from PyQt5.QtWidgets import QApplication
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.codeforces_api import parse_problem_limits
+from src.editor.run_code import (RunResult, Limits, build_program, run_program, limit_command,
+                                 VERDICT_OK, VERDICT_TLE, VERDICT_MLE, VERDICT_RE, VERDICT_OLE)
+from src.editor import testcase_widget
+from src.editor.testcase_widget import format_memory, format_metrics, preview, read_preview
+
+# Touches 160 MB so the peak is well above anything inherited, even from
+# the test process itself when run without the fork server
+ALLOCATE = "x = bytearray(160 << 20)\nprint(len(x) >> 20)\n"
+ALLOCATE_LIMITS = Limits(memory_limit=1 << 30)
+
+class TestRunProgram(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.command = build_program('python', ALLOCATE, self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_metrics(self, result):
+        self.assertEqual(result.output.strip(), "160")
+        self.assertEqual(result.exit_code, 0)
+        self.assertGreater(result.wall_time, 0)
+        self.assertGreaterEqual(result.cpu_time, 0)
+        self.assertGreater(result.peak_rss, 160 << 20)
+        self.assertGreater(result.peak_rss, result.rss_floor)
+
+    def test_metrics(self):
+        self.check_metrics(run_program(self.command, "", ALLOCATE_LIMITS))
+
+    @unittest.skipUnless(hasattr(os, 'wait4'), "rusage needs wait4")
+    def test_metrics_without_fork_server(self):
+        with patch('src.editor.run_code.USE_FORK_SERVER', False):
+            self.check_metrics(run_program([sys.executable, self.command[1]], "", ALLOCATE_LIMITS))
+
+    @unittest.skipUnless(hasattr(os, 'wait4'), "rusage needs wait4")
+    def test_kill_after_reap_is_noop(self):
+        started = []
+        with patch('src.editor.run_code.USE_FORK_SERVER', False):
+            run_program([sys.executable, '-c', 'pass'], "", on_start=started.append)
+        self.assertTrue(started[0].reaped)
+        with patch('os.kill') as kill:
+            started[0].kill()
+        kill.assert_not_called()
+
+    def results(self, code, limits):
+        """Results of code run through the fork server and directly"""
+        command = [sys.executable, build_program('python', code, self.temp_dir.name)[1]]
+        results = []
+        for use_fork_server in (True, False):
+            with patch('src.editor.run_code.USE_FORK_SERVER', use_fork_server):
+                results.append(run_program(command, "", limits))
+        return results
+
+    def verdicts(self, code, limits):
+        return [result.verdict for result in self.results(code, limits)]
+
+    def test_verdicts(self):
+        limits = Limits(time_limit=1, memory_limit=128 << 20)
+        self.assertEqual(self.verdicts("print(1)", limits), [VERDICT_OK] * 2)
+        self.assertEqual(self.verdicts("while True: pass", limits), [VERDICT_TLE] * 2)
+        self.assertEqual(self.verdicts("x = bytearray(256 << 20)", limits), [VERDICT_MLE] * 2)
+        self.assertEqual(self.verdicts("raise SystemExit(3)", limits), [VERDICT_RE] * 2)
+
+    def test_wall_timeout_catches_blocked_programs(self):
+        begin = time.perf_counter()
+        self.assertEqual(self.verdicts("import time\ntime.sleep(30)", Limits(time_limit=0.5)), [VERDICT_TLE] * 2)
+        self.assertLess(time.perf_counter() - begin, 10)
+
+    def test_output_limit(self):
+        limits = Limits(output_limit=1 << 20)
+        for result in self.results("while True: print('x' * 999)", limits):
+            self.assertEqual(result.verdict, VERDICT_OLE)
+            self.assertEqual(len(result.stdout), 1 << 20)
+        for result in self.results("print('x' * 999)", limits):
+            self.assertEqual(result.verdict, VERDICT_OK)
+            self.assertEqual(len(result.stdout), 1000)
+
+    def test_input_file_is_used_as_stdin(self):
+        path = os.path.join(self.temp_dir.name, 'input.txt')
+        with open(path, 'w') as f:
+            f.write("3\n" + "5 " * 100000)
+        command = [sys.executable, build_program('python', "input()\nprint(sum(map(int, input().split())))",
+                                                 self.temp_dir.name)[1]]
+        for use_fork_server in (True, False):
+            with patch('src.editor.run_code.USE_FORK_SERVER', use_fork_server):
+                self.assertEqual(run_program(command, pathlib.Path(path)).stdout, "500000\n")
+
+    def test_falls_back_without_worker_interpreter(self):
+        from src.editor.fork_server import ForkServerPool
+        pool = ForkServerPool(size=1, python='/nonexistent')
+        commands = [['echo', 'hi']]
+        if shutil.which('g++'):
+            commands.append(build_program('cpp', '#include <cstdio>\nint main() { puts("hi"); }\n',
+                                          self.temp_dir.name))
+        with patch('src.editor.fork_server.get_fork_server_pool', return_value=pool):
+            for command in commands:
+                result = run_program(command, "")
+                self.assertEqual((result.stdout, result.verdict), ("hi\n", VERDICT_OK))
+
+class TestLimits(unittest.TestCase):
+
+    def test_rlimits(self):
+        limits = Limits(time_limit=1.5, memory_limit=64 << 20)
+        self.assertEqual(limits.rlimits(['./program']),
+                         {'RLIMIT_CPU': [2, 3], 'RLIMIT_AS': [64 << 20, 64 << 20]})
+        # Managed runtimes get a heap flag instead of an address space limit
+        self.assertNotIn('RLIMIT_AS', limits.rlimits(['java', 'Main']))
+        self.assertEqual(limit_command(['java', '-cp', '.', 'Main'], limits), ['java', '-Xmx64m', '-cp', '.', 'Main'])
+        self.assertEqual(limit_command(['node', 'a.js'], limits), ['node', '--max-old-space-size=64', 'a.js'])
+
+    def test_report(self):
+        self.assertEqual(RunResult("1\n").report, "1\n")
+        self.assertEqual(RunResult(stderr="boom", exit_code=1).report, "Error: Runtime Error (exit code 1)\nboom")
+        self.assertEqual(RunResult(timed_out=True).report, "Error: Time Limit Exceeded")
+
+    def test_limit_below_floor(self):
+        limits = Limits(memory_limit=16 << 20)
+        # Everything up to the floor was inherited, so it can't exceed the limit
+        result = RunResult("1\n", peak_rss=40 << 20, rss_floor=40 << 20, limits=limits)
+        self.assertEqual((result.verdict, result.memory_note), (VERDICT_OK, ""))
+        result = RunResult("1\n", peak_rss=60 << 20, rss_floor=40 << 20, limits=limits)
+        self.assertEqual(result.verdict, VERDICT_MLE)
+        self.assertEqual(result.memory_note,
+                         "The memory limit is below the 40 MB the runtime uses before the program starts")
+        self.assertIn(result.memory_note, result.report)
+        self.assertEqual(RunResult(peak_rss=60 << 20, rss_floor=10 << 20, limits=limits).memory_note, "")
+
+    def test_parse_problem_limits(self):
+        html = ('<div class="time-limit"><div class="property-title">time limit per test</div>2.5 seconds</div>'
+                '<div class="memory-limit"><div class="property-title">memory limit per test</div>512 megabytes</div>')
+        self.assertEqual(parse_problem_limits(html), (2.5, 512 << 20))
+        with self.assertRaises(Exception):
+            parse_problem_limits("<html></html>")
+
+class TestMetricsDisplay(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def test_format(self):
+        result = RunResult("1\n", wall_time=0.0123, user_time=0.01, system_time=0.002,
+                           peak_rss=30 << 20, rss_floor=10 << 20)
+        self.assertEqual(format_metrics(result), "Time 12 ms · CPU 12 ms · Memory 30.0 MB")
+        # Below the floor only an upper bound is known
+        self.assertEqual(format_memory(RunResult(peak_rss=10 << 20, rss_floor=10 << 20)), "≤ 10.0 MB")
+        self.assertEqual(format_metrics(RunResult(wall_time=2)), "Time 2.00 s · CPU n/a · Memory n/a")
+
+    def test_preview(self):
+        self.assertEqual(preview("abc", limit=5), "abc")
+        self.assertEqual(preview("abcdefgh", limit=5), "abcde\n… 3 more characters not shown")
+
+    def test_file_preview(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("1 2 3\n" * 10000)
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(read_preview(f.name, limit=6), "1 2 3\n\n… 58.6 KB more not shown")
+        widget = testcase_widget.TestCaseWidget("", "", 0, input_path=f.name)
+        self.assertEqual(widget.input_source(), pathlib.Path(f.name))
+        self.assertIn("58.6 KB", widget.input_file_label.text())
+        self.assertTrue(widget.input_text.isReadOnly())
+        widget.clear_input_file()
+        self.assertEqual(widget.input_source(), "")
+
+    def test_widget_shows_and_clears_metrics(self):
+        widget = testcase_widget.TestCaseWidget("1", "1", 0)
+        widget.update_result("1", True, RunResult("1", wall_time=0.5))
+        self.assertIn("Time 500 ms", widget.metrics_label.text())
+        widget.set_status("Running...")
+        self.assertEqual(widget.metrics_label.text(), "")
+        self.assertIsNone(widget.result)
+
+    def test_widget_keeps_stderr_apart(self):
+        widget = testcase_widget.TestCaseWidget("", "1", 0)
+        self.assertTrue(widget.error_text.isHidden())
+        widget.update_result("1", True, RunResult("1", "debug\n"))
+        self.assertEqual(widget.actual_text.toPlainText(), "1")
+        self.assertEqual(widget.error_text.toPlainText(), "debug\n")
+        self.assertFalse(widget.error_text.isHidden())
+        widget.set_status("Running...")
+        self.assertTrue(widget.error_text.isHidden())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.errors import FinderError
+from src.service import FinderService, LatencyRecorder, start_server
+
+PROBLEMS = [
+    {'name': 'A', 'rating': 800, 'contestId': 2, 'index': 'A', 'tags': ['math']},
+    {'name': 'B', 'rating': 1200, 'contestId': 2, 'index': 'B', 'tags': ['dp']},
+    {'name': 'C', 'rating': 1500, 'contestId': 1, 'index': 'A', 'tags': ['dp']},
+]
+
+class SlowClient:
+    """Blocking client that counts upstream calls"""
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _call(self, name):
+        with self.lock:
+            self.calls.append(name)
+        time.sleep(0.05)
+
+    def get_problems(self):
+        self._call('problems')
+        return PROBLEMS
+
+    def get_user_submissions(self, handle):
+        self._call(handle)
+        if handle == 'nobody':
+            raise FinderError("Failed to fetch user submissions")
+        return [{'verdict': 'OK', 'problem': {'contestId': 2, 'index': 'A', 'rating': 800, 'tags': ['math']}}]
+
+async def http_get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+class TestService(unittest.TestCase):
+
+    def run_with_server(self, scenario):
+        async def main():
+            self.client = SlowClient()
+            service = FinderService(self.client)
+            server = await start_server(service, '127.0.0.1', 0)
+            async with server:
+                return await scenario(server.sockets[0].getsockname()[1])
+        return asyncio.run(main())
+
+    def test_concurrent_requests_share_upstream_calls(self):
+        async def scenario(port):
+            return await asyncio.gather(*(http_get(port, '/pick?handle=alice&count=2') for _ in range(10)))
+        responses = self.run_with_server(scenario)
+        self.assertTrue(all(status == 200 for status, _ in responses))
+        self.assertEqual(len(responses[0][1]['problems']), 2)
+        self.assertEqual(sorted(self.client.calls), ['alice', 'problems'])
+
+    def test_computation_does_not_block_other_requests(self):
+        def slow_stats(handle, submissions):
+            time.sleep(0.5)
+            return {}
+
+        async def scenario(port):
+            await http_get(port, '/stats?handle=alice')
+            begin = time.perf_counter()
+            slow = asyncio.ensure_future(http_get(port, '/stats?handle=alice'))
+            await asyncio.sleep(0.1)
+            await http_get(port, '/metrics')
+            elapsed = time.perf_counter() - begin
+            await slow
+            return elapsed
+        with patch('src.service.compute_stats', slow_stats):
+            self.assertLess(self.run_with_server(scenario), 0.4)
+
+    def test_malformed_requests(self):
+        async def raw(port, data):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            response = await reader.read()
+            writer.close()
+            return int(response.split()[1])
+
+        async def scenario(port):
+            return [
+                await raw(port, b"GET /metrics HTTP/1.1\r\nContent-Length: abc\r\n\r\n"),
+                await raw(port, b"NONSENSE\r\n\r\n"),
+                (await http_get(port, '/stats?handle=broken'))[0],
+            ]
+        with patch.object(SlowClient, 'get_user_submissions', return_value=None), \
+                self.assertLogs('src.service', 'ERROR'):
+            # Submissions of None break compute_stats the way a bug would
+            self.assertEqual(self.run_with_server(scenario), [400, 400, 500])
+
+    def test_errors_and_metrics(self):
+        async def scenario(port):
+            return [
+                await http_get(port, '/pick'),
+                await http_get(port, '/pick?handle=alice&count=x'),
+                await http_get(port, '/pick?handle=alice&count=-1'),
+                await http_get(port, '/stats?handle=nobody'),
+                await http_get(port, '/nowhere'),
+                await http_get(port, '/stats?handle=alice'),
+                await http_get(port, '/metrics'),
+            ]
+        responses = self.run_with_server(scenario)
+        self.assertEqual([status for status, _ in responses], [400, 400, 400, 422, 404, 200, 200])
+        self.assertEqual(responses[5][1]['total_solved'], 1)
+        metrics = responses[6][1]
+        self.assertEqual(metrics['latency']['/stats']['count'], 2)
+        self.assertEqual(metrics['cached_handles'], 1)
+
+    def test_latency_percentiles(self):
+        recorder = LatencyRecorder()
+        for ms in range(1, 101):
+            recorder.record('/pick', ms / 1000)
+        report = recorder.percentiles()['/pick']
+        self.assertAlmostEqual(report['p50_ms'], 51)
+        self.assertAlmostEqual(report['p99_ms'], 100)
+        self.assertAlmostEqual(report['max_ms'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
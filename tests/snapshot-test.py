@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import tempfile
+import requests
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.catalog_file import MappedCatalog
+from src.snapshot import Snapshot, SnapshotMissing
+from src.codeforces_api import CodeforcesClient
+
+PROBLEMS_RESPONSE = {'result': {'problems': [
+    {'contestId': 1, 'index': 'A', 'name': 'Alpha', 'rating': 800, 'tags': ['math']},
+]}}
+SUBMISSIONS_RESPONSE = {'result': [
+    {'verdict': 'OK', 'problem': {'contestId': 1, 'index': 'A', 'rating': 800, 'tags': ['math']}},
+]}
+
+PROBLEMS = [{
+    'name': 'Alpha', 'rating': 800, 'contestId': 1, 'index': 'A', 'tags': ['math'],
+    'url': 'https://codeforces.com/problemset/problem/1/A',
+}]
+
+def fake_get(url, params=None, timeout=None):
+    response = MagicMock()
+    response.status_code = 200
+    if 'user.status' in url:
+        response.json.return_value = SUBMISSIONS_RESPONSE
+    elif 'contest.list' in url:
+        response.json.return_value = {'result': [{'id': 1, 'name': 'Round 1'}]}
+    else:
+        response.json.return_value = PROBLEMS_RESPONSE
+    return response
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot = Snapshot(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_missing_snapshot(self):
+        with self.assertRaises(SnapshotMissing):
+            self.snapshot.load_catalog()
+        with self.assertRaises(SnapshotMissing):
+            self.snapshot.load_submissions('tourist')
+        self.assertIsNone(self.snapshot.fetched_at())
+
+    def test_round_trip(self):
+        self.snapshot.save_catalog(PROBLEMS, [{'id': 1}])
+        self.snapshot.save_submissions('Tourist', [{'verdict': 'OK'}])
+        problems, _ = self.snapshot.load_catalog()
+        self.assertEqual(list(problems), PROBLEMS)
+        contests, _ = self.snapshot.load_contests()
+        self.assertEqual(contests, [{'id': 1}])
+        submissions, _ = self.snapshot.load_submissions('tourist')
+        self.assertEqual(submissions, [{'verdict': 'OK'}])
+        self.assertIsNotNone(self.snapshot.fetched_at('tourist'))
+        self.assertIsNone(self.snapshot.fetched_at('petr'))
+
+    @patch('requests.get', side_effect=fake_get)
+    def test_online_fetch_refreshes_snapshot(self, mock_get):
+        client = CodeforcesClient(snapshot=self.snapshot)
+        self.assertEqual(client.get_problems()[0]['name'], 'Alpha')
+        client.get_user_submissions('tourist')
+        client.fetch_user_submissions('a&count=1#x')
+        self.assertEqual(mock_get.call_args.kwargs['params'], {'handle': 'a&count=1#x'})
+        contests, _ = self.snapshot.load_contests()
+        self.assertEqual(contests, [{'id': 1, 'name': 'Round 1'}])
+        self.assertEqual(self.snapshot.load_submissions('tourist')[0], SUBMISSIONS_RESPONSE['result'])
+
+    def test_falls_back_to_snapshot_when_api_is_down(self):
+        with patch('requests.get', side_effect=fake_get):
+            CodeforcesClient(snapshot=self.snapshot).get_problems()
+        used = []
+        client = CodeforcesClient(snapshot=self.snapshot, on_snapshot_used=used.append)
+        with patch('requests.get', side_effect=requests.ConnectionError('down')):
+            problems = client.get_problems()
+        self.assertEqual(problems[0]['name'], 'Alpha')
+        self.assertEqual(len(used), 1)
+
+    def test_offline_mode_never_touches_network(self):
+        self.snapshot.save_catalog(PROBLEMS, [])
+        client = CodeforcesClient(offline=True, snapshot=self.snapshot)
+        with patch('requests.get') as mock_get:
+            self.assertEqual(list(client.get_problems()), PROBLEMS)
+            with self.assertRaises(SnapshotMissing):
+                client.get_user_submissions('tourist')
+        mock_get.assert_not_called()
+
+    def test_catalog_checksum_verified_once(self):
+        self.snapshot.save_catalog(PROBLEMS, [])
+        with patch('src.snapshot.MappedCatalog', wraps=MappedCatalog) as mapped:
+            self.snapshot.load_catalog()
+            self.assertEqual(mapped.call_args.kwargs['verify'], False)
+
+            # A generation this process didn't write, e.g. from an older version
+            manifest = self.snapshot.manifest()
+            del manifest['verified']
+            self.snapshot._update_manifest(lambda m: (m.clear(), m.update(manifest)))
+            fresh = Snapshot(self.temp_dir.name)
+            fresh.load_catalog()
+            self.assertEqual(mapped.call_args.kwargs['verify'], True)
+            Snapshot(self.temp_dir.name).load_catalog()
+            self.assertEqual(mapped.call_args.kwargs['verify'], False)
+
+    def test_new_generation_replaces_old_files(self):
+        self.snapshot.save_catalog(PROBLEMS, [])
+        problems, _ = self.snapshot.load_catalog()
+        with patch('src.snapshot.time.time', return_value=problems.fetched_at + 60):
+            self.snapshot.save_catalog(PROBLEMS[:0], [{'id': 2}])
+        # Readers holding the old catalog keep a working mapping
+        self.assertEqual(list(problems), PROBLEMS)
+        self.assertEqual(len(self.snapshot.load_catalog()[0]), 0)
+        self.assertEqual(self.snapshot.load_contests()[0], [{'id': 2}])
+        files = [f for f in os.listdir(self.temp_dir.name) if f.startswith(('catalog-', 'contests-'))]
+        self.assertEqual(len(files), 2)
+
+if __name__ == '__main__':
+    unittest.main()
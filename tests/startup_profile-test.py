@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import json
+import tempfile
+import importlib
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtTest import QTest
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src import startup_profile
+from src.startup_profile import StartupProfiler, start_from_argv, watch_first_paint, PROFILE_FLAG, PROFILE_ENV
+
+class TestStartupProfiler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.meta_path = list(sys.meta_path)
+        package = os.path.join(self.temp_dir.name, 'profiled_pkg')
+        os.makedirs(package)
+        with open(os.path.join(package, '__init__.py'), 'w') as f:
+            f.write("from profiled_pkg import child\n")
+        with open(os.path.join(package, 'child.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.02)\n")
+        sys.path.insert(0, self.temp_dir.name)
+        importlib.invalidate_caches()
+
+    def tearDown(self):
+        sys.meta_path[:] = self.meta_path
+        sys.path.remove(self.temp_dir.name)
+        for name in ('profiled_pkg', 'profiled_pkg.child'):
+            sys.modules.pop(name, None)
+        self.temp_dir.cleanup()
+
+    def test_records_import_times(self):
+        profiler = StartupProfiler(os.path.join(self.temp_dir.name, 'report.json'))
+        profiler.install()
+        try:
+            import profiled_pkg
+        finally:
+            profiler.uninstall()
+        times = {entry['module']: entry for entry in profiler.imports}
+        parent, child = times['profiled_pkg'], times['profiled_pkg.child']
+        self.assertEqual((parent['depth'], child['depth']), (0, 1))
+        self.assertGreaterEqual(child['self_ms'], 20)
+        # The child's time counts toward the parent's cumulative time only
+        self.assertGreaterEqual(parent['cumulative_ms'], child['cumulative_ms'])
+        self.assertLess(parent['self_ms'], child['self_ms'])
+        # Modules keep their real loader
+        self.assertNotIsInstance(profiled_pkg.__loader__, startup_profile._TimedLoader)
+        self.assertNotIsInstance(profiled_pkg.child.__spec__.loader, startup_profile._TimedLoader)
+
+        profiler.write_report()
+        with open(profiler.report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report['slowest_imports'][0]['module'], 'profiled_pkg.child')
+        self.assertAlmostEqual(report['total_import_ms'], parent['cumulative_ms'])
+
+    def test_uninstall_restores_meta_path(self):
+        profiler = StartupProfiler()
+        profiler.install()
+        self.assertIs(sys.meta_path[0], profiler._finder)
+        profiler.uninstall()
+        profiler.uninstall()
+        self.assertEqual(sys.meta_path, self.meta_path)
+
+    def test_start_from_argv(self):
+        report_path = os.path.join(self.temp_dir.name, 'report.json')
+        argv = ['main.py', PROFILE_FLAG, report_path, '--other']
+        with patch.dict(os.environ, {PROFILE_ENV: ''}), patch.object(startup_profile, '_profiler', None):
+            profiler = start_from_argv(argv)
+            self.assertEqual(argv, ['main.py', '--other'])
+            self.assertEqual(profiler.report_path, report_path)
+            self.assertIs(startup_profile.get_profiler(), profiler)
+            # Profiling stops and the report is written on first paint
+            window = QWidget()
+            watch_first_paint(window)
+            window.show()
+            QTest.qWaitForWindowExposed(window)
+            window.repaint()
+            QApplication.processEvents()
+            window.close()
+        self.assertEqual(sys.meta_path, self.meta_path)
+        with open(report_path) as f:
+            self.assertIn('first_paint', json.load(f)['marks_ms'])
+        with patch.dict(os.environ, {PROFILE_ENV: ''}), patch.object(startup_profile, '_profiler', None):
+            self.assertIsNone(start_from_argv(['main.py']))
+
+if __name__ == '__main__':
+    unittest.main()
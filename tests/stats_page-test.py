@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import threading
+
+from PyQt5.QtWidgets import QApplication
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.stats_page import StatsPage, StatsTask
+from src.task_pool import TaskPool
+
+SUBMISSIONS = [
+    {'verdict': 'OK', 'problem': {'contestId': 1, 'index': 'A', 'rating': 800, 'tags': ['math']}},
+    {'verdict': 'OK', 'problem': {'contestId': 2, 'index': 'B', 'rating': 1200, 'tags': ['math', 'dp']}},
+]
+
+class BlockingClient:
+    """Stands in for CodeforcesClient; returns submissions once released"""
+    def __init__(self, offline=False, on_snapshot_used=None):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_user_submissions(self, handle):
+        self.started.set()
+        self.release.wait(5)
+        return SUBMISSIONS
+
+class TestStatsTask(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        patcher = patch('src.stats_page.CodeforcesClient', BlockingClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = TaskPool(max_threads=2)
+        patcher = patch('src.stats_page.get_task_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_computes_stats(self):
+        task = StatsTask('tourist')
+        task.client.release.set()
+        results = []
+        task.finished.connect(results.append)
+        task.run()
+        self.assertEqual((results[0]['username'], results[0]['total_solved']), ('tourist', 2))
+
+    def test_cancel_while_downloading_emits_nothing(self):
+        task = StatsTask('tourist')
+        results = []
+        task.finished.connect(results.append)
+        self.pool.submit(task)
+        self.assertTrue(task.client.started.wait(5))
+        task.cancel()
+        task.client.release.set()
+        self.assertTrue(self.pool.wait(5000))
+        QApplication.processEvents()
+        self.assertEqual(results, [])
+
+    def test_new_refresh_cancels_the_previous_one(self):
+        page = StatsPage()
+        page.username = 'tourist'
+        page.refresh_stats()
+        first = page.stats_task
+        self.assertTrue(first.client.started.wait(5))
+        page.refresh_stats()
+        second = page.stats_task
+        self.assertTrue(first.is_cancelled())
+        self.assertFalse(page.refresh_btn.isEnabled())
+        first.client.release.set()
+        second.client.release.set()
+        self.assertTrue(self.pool.wait(5000))
+        QApplication.processEvents()
+        self.assertIsNone(page.stats_task)
+        self.assertEqual(page.stats['total_solved'], 2)
+        self.assertTrue(page.refresh_btn.isEnabled())
+
+    def test_cancel_refresh(self):
+        page = StatsPage()
+        page.username = 'tourist'
+        page.refresh_stats()
+        task = page.stats_task
+        page.cancel_refresh()
+        task.client.release.set()
+        self.assertTrue(self.pool.wait(5000))
+        QApplication.processEvents()
+        self.assertIsNone(page.stats)
+        self.assertEqual(page.stats_label.text(), "Stats loading cancelled")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.editor.build_cache import BuildCache
+from src.editor.stress import StressTester, StressError, evict_generated_inputs, generate_input
+
+GENERATOR = """import sys
+import random
+random.seed(int(sys.argv[1]))
+n = random.randint(1, 8)
+print(n)
+print(*[random.randint(1, 10) for _ in range(n)])
+"""
+BRUTE = "input()\nprint(max(map(int, input().split())))\n"
+# Only looks at the first three numbers
+WRONG = "input()\nprint(max(list(map(int, input().split()))[:3]))\n"
+
+class TestStressTester(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = BuildCache(self.temp_dir.name)
+        self.generator = self.cache.get('python', GENERATOR)
+        self.brute = self.cache.get('python', BRUTE)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_finds_lowest_failing_seed(self):
+        result = StressTester(self.generator, self.brute, self.cache.get('python', WRONG), seed=1).run()
+        failure = result.failure
+        self.assertIsNotNone(failure)
+        self.assertGreaterEqual(result.iterations, failure.seed)
+        numbers = list(map(int, failure.input_data.split()[1:]))
+        self.assertEqual(failure.expected.strip(), str(max(numbers)))
+        self.assertEqual(failure.output.strip(), str(max(numbers[:3])))
+        # Every seed before the failing one passes, so starting there reproduces it at once
+        again = StressTester(self.generator, self.brute, self.cache.get('python', WRONG), seed=failure.seed).run()
+        self.assertEqual((again.iterations, again.failure.input_data), (1, failure.input_data))
+
+    def test_correct_solution_runs_all_iterations(self):
+        progress = []
+        result = StressTester(self.generator, self.brute, self.brute, max_iterations=10).run(
+            lambda iterations, elapsed: progress.append(iterations))
+        self.assertIsNone(result.failure)
+        self.assertEqual(result.iterations, 10)
+        self.assertEqual(sorted(progress), list(range(1, 11)))
+        self.assertGreater(result.rate, 0)
+
+    def test_generator_failure_is_an_error(self):
+        with self.assertRaises(StressError):
+            StressTester(self.cache.get('python', "raise SystemExit(1)"), self.brute, self.brute).run()
+
+    def test_generate_input_to_file(self):
+        path = os.path.join(self.temp_dir.name, 'generated.txt')
+        generate_input(self.generator, 5, path)
+        with open(path) as f:
+            generated = f.read()
+        self.assertEqual(generated, StressTester(self.generator, self.brute, self.brute)._run(
+            [*self.generator, "5"], "").stdout)
+        with self.assertRaisesRegex(StressError, "broken"):
+            generate_input(self.cache.get('python', "import sys\nsys.exit('x' * 10000 + 'broken')"), 5, path)
+
+    @unittest.skipUnless(sys.platform != 'win32', "rlimits are POSIX only")
+    def test_generate_input_limits(self):
+        path = os.path.join(self.temp_dir.name, 'generated.txt')
+        with self.assertRaisesRegex(StressError, "more than 1 MB"):
+            generate_input(self.cache.get('python', "import sys\nsys.stdout.write('1' * (2 << 20))"), 5, path,
+                           max_size=1 << 20)
+        with self.assertRaises(StressError):
+            generate_input(self.cache.get('python', "x = bytearray(512 << 20)"), 5, path, memory_limit=64 << 20)
+
+    def test_evict_generated_inputs(self):
+        directory = os.path.join(self.temp_dir.name, 'inputs')
+        os.makedirs(directory)
+        paths = []
+        for i in range(4):
+            paths.append(os.path.join(directory, f'{i}.txt'))
+            with open(paths[-1], 'w') as f:
+                f.write('1' * 100)
+            os.utime(paths[-1], (i, i))
+        # The oldest file is kept when it is the one just generated
+        evict_generated_inputs(directory, keep=paths[0], max_bytes=250)
+        self.assertEqual(sorted(os.listdir(directory)), ['0.txt', '3.txt'])
+
+    def test_stop(self):
+        tester = StressTester(self.generator, self.brute, self.cache.get('python', "import time\ntime.sleep(30)"))
+        threading.Timer(0.5, tester.stop).start()
+        begin = time.perf_counter()
+        result = tester.run()
+        self.assertLess(time.perf_counter() - begin, 5)
+        self.assertIsNone(result.failure)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import threading
+
+from PyQt5.QtWidgets import QApplication
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.task_pool import (Task, FunctionTask, TaskPool, PRIORITY_BACKGROUND,
+                           PRIORITY_INTERACTIVE)
+
+class FailingTask(Task):
+    def execute(self):
+        raise ValueError("boom")
+
+class TestTaskPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def test_run_emits_finished(self):
+        task = FunctionTask(lambda a, b: a + b, 2, 3)
+        results = []
+        task.finished.connect(results.append)
+        task.run()
+        self.assertEqual(results, [5])
+
+    def test_run_emits_error(self):
+        task = FailingTask()
+        errors = []
+        task.error.connect(errors.append)
+        task.run()
+        self.assertEqual(errors, ["boom"])
+
+    def test_cancelled_task_emits_nothing(self):
+        task = FunctionTask(lambda: 1)
+        results = []
+        task.finished.connect(results.append)
+        task.cancel()
+        task.run()
+        self.assertEqual(results, [])
+        self.assertTrue(task.is_cancelled())
+
+    def test_default_priorities(self):
+        self.assertEqual(FunctionTask(lambda: None).priority, PRIORITY_BACKGROUND)
+        task = FunctionTask(lambda: None, priority=PRIORITY_INTERACTIVE)
+        self.assertEqual(task.priority, PRIORITY_INTERACTIVE)
+
+    def test_submit_delivers_result_and_releases_task(self):
+        pool = TaskPool(max_threads=2)
+        results = []
+        task = FunctionTask(lambda: 'done')
+        task.finished.connect(results.append)
+        pool.submit(task)
+        self.assertTrue(pool.wait(5000))
+        QApplication.processEvents()
+        self.assertEqual(results, ['done'])
+        self.assertEqual(pool.active_count(), 0)
+
+    def test_interactive_tasks_run_first(self):
+        pool = TaskPool(max_threads=1)
+        release = threading.Event()
+        order = []
+        # Occupies the only thread so the rest queue up
+        pool.submit(FunctionTask(release.wait, 5))
+        pool.submit(FunctionTask(order.append, 'background'))
+        pool.submit(FunctionTask(order.append, 'interactive', priority=PRIORITY_INTERACTIVE))
+        release.set()
+        self.assertTrue(pool.wait(5000))
+        QApplication.processEvents()
+        self.assertEqual(order, ['interactive', 'background'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import time
+import tempfile
+import threading
+
+from PyQt5.QtWidgets import QApplication
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.editor.build_cache import BuildCache
+from src.editor.test_runner import ParallelRunner, available_cpus
+from src.editor.run_task import RunTestsTask
+
+SLOW_ECHO = "import time\ntime.sleep(0.3)\nprint(input())\n"
+
+class TestParallelRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.command = BuildCache(self.temp_dir.name).get('python', SLOW_ECHO)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_results_in_input_order_and_streamed(self):
+        inputs = [f"{i}\n" for i in range(4)]
+        streamed = []
+        outputs = ParallelRunner(max_workers=3).run(self.command, inputs, lambda i, out: streamed.append(i))
+        self.assertEqual([result.output.strip() for result in outputs], [str(i) for i in range(4)])
+        self.assertEqual(sorted(streamed), list(range(4)))
+
+    @unittest.skipIf(len(available_cpus()) < 2, "needs at least two cores")
+    def test_runs_concurrently(self):
+        workers = min(4, len(available_cpus()))
+        begin = time.perf_counter()
+        ParallelRunner(max_workers=workers).run(self.command, ["x\n"] * workers)
+        # Serially this would take workers * 0.3 s plus interpreter startup
+        self.assertLess(time.perf_counter() - begin, 0.3 * workers)
+
+    def test_pinning(self):
+        outputs = ParallelRunner(pin_cpus=True).run(self.command, ["a\n", "b\n"])
+        self.assertEqual([result.output.strip() for result in outputs], ["a", "b"])
+
+    def test_stop_kills_running_tests(self):
+        command = BuildCache(self.temp_dir.name).get('python', "import time\ntime.sleep(30)\n")
+        runner = ParallelRunner(max_workers=2)
+        outputs = []
+        thread = threading.Thread(target=lambda: outputs.extend(runner.run(command, [""] * 4)))
+        begin = time.perf_counter()
+        thread.start()
+        time.sleep(0.5)
+        runner.stop()
+        thread.join(10)
+        self.assertLess(time.perf_counter() - begin, 5)
+        self.assertEqual(outputs, [None] * 4)
+
+class TestRunTestsTask(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if QApplication.instance() is None:
+            cls.app = QApplication([])
+        else:
+            cls.app = QApplication.instance()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = patch('src.editor.run_task.get_build_cache', return_value=BuildCache(self.temp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reports_each_test(self):
+        task = RunTestsTask('python', 'print(int(input()) * 2)', ["1\n", "2\n"])
+        started, finished, results = [], [], []
+        task.test_started.connect(started.append)
+        task.test_finished.connect(lambda index, result: finished.append((index, result.output.strip())))
+        task.finished.connect(results.append)
+        task.run()
+        # test_started comes from the runner's worker threads
+        self.app.processEvents()
+        self.assertEqual(sorted(started), [0, 1])
+        self.assertEqual(sorted(finished), [(0, '2'), (1, '4')])
+        self.assertEqual(len(results), 1)
+
+    def test_checks_against_expected_outputs(self):
+        task = RunTestsTask('python', 'print(int(input()) * 2)', ["1\n", "2\n"], expected=["2", "5"])
+        finished = {}
+        task.test_finished.connect(lambda index, result: finished.update({index: result.check}))
+        task.run()
+        self.assertTrue(finished[0].passed)
+        self.assertEqual(finished[1].message, "Line 1, token 1: expected '5', found '4'")
+
+    def test_compilation_error_is_reported(self):
+        task = RunTestsTask('java', 'class NotPublic {}', ["1\n"])
+        errors = []
+        task.error.connect(errors.append)
+        task.run()
+        self.assertEqual(errors, ["Error: No public class found in Java code"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,8 @@ from PyQt5.QtGui import QPalette, QColor
 from PyQt5.QtCore import Qt
 import sys
 import os
+import json
+import tempfile
 
 # Add the parent directory of 'src' to the system path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
@@ -34,7 +36,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_dark_mode(self, mock_set_palette):
-        self.theme_manager.apply_dark_mode()
+        self.theme_manager.apply_theme("Dark (Default)")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(53, 53, 53))
@@ -53,7 +55,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_light_mode(self, mock_set_palette):
-        self.theme_manager.apply_light_mode()
+        self.theme_manager.apply_theme("Light")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(240, 240, 240))
@@ -72,7 +74,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_monokai_mode(self, mock_set_palette):
-        self.theme_manager.apply_monokai_mode()
+        self.theme_manager.apply_theme("Monokai")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(39, 40, 34))
@@ -91,7 +93,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_solarized_mode(self, mock_set_palette):
-        self.theme_manager.apply_solarized_mode()
+        self.theme_manager.apply_theme("Solarized")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(236, 239, 244))
@@ -110,7 +112,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_solarized_dark_mode(self, mock_set_palette):
-        self.theme_manager.apply_solarized_dark_mode()
+        self.theme_manager.apply_theme("Solarized Dark")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(0, 43, 54))
@@ -129,7 +131,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_dracula_mode(self, mock_set_palette):
-        self.theme_manager.apply_dracula_mode()
+        self.theme_manager.apply_theme("Dracula")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(40, 42, 54))
@@ -148,7 +150,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_nord_mode(self, mock_set_palette):
-        self.theme_manager.apply_nord_mode()
+        self.theme_manager.apply_theme("Nord")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(46, 52, 64))
@@ -167,7 +169,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_gruvbox_mode(self, mock_set_palette):
-        self.theme_manager.apply_gruvbox_mode()
+        self.theme_manager.apply_theme("Gruvbox")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(38, 35, 32))
@@ -186,7 +188,7 @@ class TestThemeManager(unittest.TestCase):
 
     @patch('PyQt5.QtWidgets.QApplication.setPalette')
     def test_apply_one_dark_mode(self, mock_set_palette):
-        self.theme_manager.apply_one_dark_mode()
+        self.theme_manager.apply_theme("One Dark")
         self.assertTrue(mock_set_palette.called)
         palette = mock_set_palette.call_args[0][0]
         self.assertEqual(palette.color(QPalette.Window), QColor(30, 30, 30))
@@ -203,5 +205,52 @@ class TestThemeManager(unittest.TestCase):
         self.assertEqual(palette.color(QPalette.Highlight), QColor(255, 121, 198))
         self.assertEqual(palette.color(QPalette.HighlightedText), QColor(248, 248, 242))
 
+    @patch('PyQt5.QtWidgets.QApplication.setStyle')
+    def test_style_created_once(self, mock_set_style):
+        theme_manager = ThemeManager("Light")
+        theme_manager.apply_theme("Nord")
+        theme_manager.apply_theme("Dracula")
+        self.assertEqual(mock_set_style.call_count, 1)
+
+    def test_palettes_are_precompiled(self):
+        palette = self.theme_manager.palettes["Nord"]
+        self.assertEqual(palette.color(QPalette.Window), QColor(46, 52, 64))
+        self.assertEqual(set(self.theme_manager.palettes), set(self.theme_manager.get_theme_names()))
+
+    def test_chart_colors_follow_theme(self):
+        self.theme_manager.apply_theme("Light")
+        self.assertEqual(self.theme_manager.chart_colors(),
+                         {'background': '#f0f0f0', 'foreground': '#000000'})
+        self.assertEqual(self.theme_manager.chart_colors("Dracula")['background'], '#282a36')
+
+    def test_user_theme_directory(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, 'custom.json'), 'w') as file:
+                json.dump({'name': 'Custom', 'order': 100, 'palette': {'Window': '#123456'}}, file)
+            from src.themes import THEME_DATA_DIR
+            theme_manager = ThemeManager("Custom", [THEME_DATA_DIR, temp_dir])
+        self.assertEqual(theme_manager.get_theme_names()[-1], 'Custom')
+        self.assertEqual(theme_manager.current_theme, 'Custom')
+        self.assertEqual(theme_manager.palettes['Custom'].color(QPalette.Window), QColor('#123456'))
+
+    def test_broken_user_themes_are_skipped(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = {
+                'bad_json.json': '{"name": ',
+                'no_name.json': json.dumps({'palette': {}}),
+                'bad_role.json': json.dumps({'name': 'Bad Role', 'palette': {'Nowhere': '#000000'}}),
+                'method_role.json': json.dumps({'name': 'Method Role', 'palette': {'setColor': '#000000'}}),
+                'no_palette.json': json.dumps({'name': 'No Palette'}),
+            }
+            for file_name, content in files.items():
+                with open(os.path.join(temp_dir, file_name), 'w') as file:
+                    file.write(content)
+            from src.themes import THEME_DATA_DIR
+            with self.assertLogs('src.themes', 'WARNING') as logs:
+                theme_manager = ThemeManager("Bad Role", [THEME_DATA_DIR, temp_dir])
+        self.assertEqual(len(logs.records), len(files))
+        self.assertEqual(theme_manager.get_theme_names(), self.theme_manager.get_theme_names())
+        self.assertEqual(theme_manager.current_theme, theme_manager.get_theme_names()[0])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
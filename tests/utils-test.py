@@ -17,8 +17,10 @@ from src.utils import (
     load_preferences,
     save_preferences,
     load_bookmarks,
-    save_bookmarks
+    save_bookmarks,
+    get_browsers_cached
 )
+import tempfile
 
 class TestUtils(unittest.TestCase):
 
@@ -104,5 +106,23 @@ class TestUtils(unittest.TestCase):
             call(']')
         ])
 
+    @patch('src.utils.detect_browsers', return_value={'default': 'Firefox', 'available': {'Firefox (Default)': ''}})
+    def test_get_browsers_cached_reuses_cache(self, mock_detect_browsers):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'browsers.json')
+            first = get_browsers_cached(path)
+            second = get_browsers_cached(path)
+        self.assertEqual(first, second)
+        mock_detect_browsers.assert_called_once()
+
+    @patch('src.utils.detect_browsers', return_value={'default': 'Firefox', 'available': {'Firefox (Default)': ''}})
+    def test_get_browsers_cached_invalidated_by_path_change(self, mock_detect_browsers):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'browsers.json')
+            get_browsers_cached(path)
+            with patch.dict(os.environ, {'PATH': temp_dir}):
+                get_browsers_cached(path)
+        self.assertEqual(mock_detect_browsers.call_count, 2)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
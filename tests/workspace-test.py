@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory of 'src' to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import subprocess
+from src.editor.workspace import WORKSPACE_PREFIX, Workspace, remove_stale_workspaces, workspace_root
+
+class TestWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.workspace = Workspace(self.root.name)
+
+    def tearDown(self):
+        self.workspace.close()
+        self.root.cleanup()
+
+    def test_reset_empties_streams_and_directory(self):
+        self.workspace.write_input("1 2\n")
+        self.workspace.stdout.write(b"output")
+        self.workspace.stderr.write(b"error")
+        # A test writes to the descriptors directly
+        self.workspace.stdout.flush()
+        self.workspace.stderr.flush()
+        os.makedirs(os.path.join(self.workspace.path, 'sub', 'dir'))
+        with open(os.path.join(self.workspace.path, 'out.txt'), 'w') as f:
+            f.write("left behind")
+        self.assertEqual(self.workspace.output_size(), 6)
+
+        self.workspace.reset()
+        self.assertEqual(sorted(os.listdir(self.workspace.path)), ['.stderr', '.stdin', '.stdout'])
+        self.assertEqual(self.workspace.output_size(), 0)
+        self.assertEqual(self.workspace.read_outputs(), ("", ""))
+        self.assertEqual(self.workspace.write_input("3\n").read(), b"3\n")
+
+    def test_read_outputs_limit(self):
+        self.workspace.stdout.write("héllo".encode('utf-8'))
+        self.assertEqual(self.workspace.read_outputs(2), ("h�", ""))
+
+    def test_close_removes_directory(self):
+        path = self.workspace.path
+        self.assertEqual(os.path.dirname(path), self.root.name)
+        self.workspace.close()
+        self.assertFalse(os.path.exists(path))
+        self.workspace = Workspace(self.root.name)
+
+    def test_remove_stale_workspaces(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        stale = os.path.join(self.root.name, f'{WORKSPACE_PREFIX}{process.pid}-abc')
+        os.makedirs(os.path.join(stale, 'sub'))
+        # Owned by a live process (this one's parent) or not a workspace at all
+        alive = os.path.join(self.root.name, f'{WORKSPACE_PREFIX}{os.getppid()}-abc')
+        other = os.path.join(self.root.name, 'other-123')
+        os.makedirs(alive)
+        os.makedirs(other)
+
+        remove_stale_workspaces(self.root.name)
+        self.assertFalse(os.path.exists(stale))
+        for path in (alive, other, self.workspace.path):
+            self.assertTrue(os.path.exists(path))
+
+    def test_root(self):
+        self.assertTrue(os.access(workspace_root(), os.W_OK))
+
+if __name__ == '__main__':
+    unittest.main()